@@ -6,17 +6,51 @@ This package contains the loader modules for the salt streams system
 from __future__ import absolute_import
 import logging
 import copy
+import os
 import re
+import time
 
 # Import Salt libs
 import salt.loader
 import salt.utils.event
 import salt.utils.minion
-from salt.ext.six.moves import map
+import salt.utils.process
+from salt.ext.six.moves import map, queue
 from salt.exceptions import CommandExecutionError
 
 log = logging.getLogger(__name__)
 
+# The beacons are reloaded on every refresh, they all share the same threads
+_POOLS = {}
+
+
+def _get_pool(num_threads):
+    '''
+    Return the pool of ``num_threads`` threads the beacons of this process
+    run on
+    '''
+    key = (os.getpid(), num_threads)
+    if key not in _POOLS:
+        _POOLS[key] = salt.utils.process.ThreadPool(num_threads=num_threads)
+    return _POOLS[key]
+
+
+# The beacons running on the pool, and their finished runs. Kept per process
+# next to the pools, so that the runs in flight when the beacons are reloaded
+# are not started again, and their events not lost
+_RUNS = {}
+
+
+def _get_runs():
+    '''
+    Return the dict of the beacons running on the pool of this process, and
+    the queue of their finished runs
+    '''
+    pid = os.getpid()
+    if pid not in _RUNS:
+        _RUNS[pid] = ({}, queue.Queue())
+    return _RUNS[pid]
+
 
 class Beacon(object):
     '''
@@ -27,6 +61,10 @@ class Beacon(object):
         self.functions = functions
         self.beacons = salt.loader.beacons(opts, functions)
         self.interval_map = dict()
+        self.pool = None
+        if opts.get('beacons_workers', 0) > 0:
+            self.pool = _get_pool(opts['beacons_workers'])
+        self.running, self.finished = _get_runs()
 
     def process(self, config, grains):
         '''
@@ -45,6 +83,7 @@ class Beacon(object):
         b_config = copy.deepcopy(config)
         if 'enabled' in b_config and not b_config['enabled']:
             return
+        running_jobs = None
         for mod in config:
             if mod == 'enabled':
                 continue
@@ -84,11 +123,20 @@ class Beacon(object):
                     if not self._process_interval(mod, interval):
                         log.trace('Skipping beacon %s. Interval not reached.', mod)
                         continue
+                timeout = self._determine_beacon_config(current_beacon_config, 'beacon_timeout')
+                if timeout:
+                    b_config = self._trim_config(b_config, mod, 'beacon_timeout')
+                else:
+                    timeout = self.opts.get('beacons_timeout', 0)
+                if mod in self.running:
+                    self._check_running(mod)
+                    continue
                 if self._determine_beacon_config(current_beacon_config, 'disable_during_state_run'):
                     log.trace('Evaluting if beacon %s should be skipped due to a state run.', mod)
                     b_config = self._trim_config(b_config, mod, 'disable_during_state_run')
                     is_running = False
-                    running_jobs = salt.utils.minion.running(self.opts)
+                    if running_jobs is None:
+                        running_jobs = salt.utils.minion.running(self.opts)
                     for job in running_jobs:
                         if re.match('state.*', job['fun']):
                             is_running = True
@@ -113,21 +161,84 @@ class Beacon(object):
                                  'not running.\n%s', mod, vcomment)
                         continue
 
+                if self.pool is not None:
+                    self.running[mod] = {'start': time.time(),
+                                         'timeout': timeout,
+                                         'warned': False}
+                    self.pool.fire_async(
+                        self._run_beacon,
+                        args=[mod, beacon_name, self.beacons[fun_str],
+                              b_config[mod], runonce])
+                    continue
+
                 # Fire the beacon!
                 raw = self.beacons[fun_str](b_config[mod])
-                for data in raw:
-                    tag = 'salt/beacon/{0}/{1}/'.format(self.opts['id'], mod)
-                    if 'tag' in data:
-                        tag += data.pop('tag')
-                    if 'id' not in data:
-                        data['id'] = self.opts['id']
-                    ret.append({'tag': tag,
-                                'data': data,
-                                'beacon_name': beacon_name})
+                ret.extend(self._format_events(mod, beacon_name, raw))
                 if runonce:
                     self.disable_beacon(mod)
             else:
                 log.warning('Unable to process beacon %s', mod)
+        if self.pool is not None:
+            ret.extend(self._collect())
+        return ret
+
+    def _format_events(self, mod, beacon_name, raw):
+        '''
+        Turn the data returned by a beacon into events
+        '''
+        ret = []
+        for data in raw:
+            tag = 'salt/beacon/{0}/{1}/'.format(self.opts['id'], mod)
+            if 'tag' in data:
+                tag += data.pop('tag')
+            if 'id' not in data:
+                data['id'] = self.opts['id']
+            ret.append({'tag': tag,
+                        'data': data,
+                        'beacon_name': beacon_name})
+        return ret
+
+    def _run_beacon(self, mod, beacon_name, func, config, runonce):
+        '''
+        Run a beacon on the pool
+        '''
+        events = []
+        try:
+            events = self._format_events(mod, beacon_name, func(config))
+        except Exception:
+            log.error('Beacon %s failed', mod, exc_info=True)
+        self.finished.put((mod, events, runonce))
+
+    def _check_running(self, mod):
+        '''
+        Skip a beacon which is still running from an earlier loop, warn once
+        it has been running for longer than its timeout
+        '''
+        running = self.running[mod]
+        duration = time.time() - running['start']
+        if running['timeout'] and duration > running['timeout']:
+            if not running['warned']:
+                log.warning('Beacon %s has been running for %d seconds, '
+                            'longer than its timeout of %s seconds',
+                            mod, duration, running['timeout'])
+                running['warned'] = True
+        else:
+            log.trace('Skipping beacon %s. Still running.', mod)
+
+    def _collect(self):
+        '''
+        Return the events of the beacons which finished running on the pool
+        '''
+        ret = []
+        while True:
+            try:
+                mod, events, runonce = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.running.pop(mod, None)
+            ret.extend(events)
+            if runonce:
+                self.disable_beacon(mod)
         return ret
 
     def _trim_config(self, b_config, mod, key):
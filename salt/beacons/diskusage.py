@@ -13,6 +13,7 @@ import logging
 import re
 
 import salt.utils.platform
+import salt.utils.sampling
 
 # Import Third Party Libs
 try:
@@ -85,7 +86,8 @@ def beacon(config):
     it will override the previously defined threshold.
 
     '''
-    parts = psutil.disk_partitions(all=True)
+    parts = salt.utils.sampling.sample(
+        __opts__, ('disk_partitions', True), psutil.disk_partitions, all=True)
     ret = []
     for mounts in config:
         mount = next(iter(mounts))
@@ -104,7 +106,8 @@ def beacon(config):
                 _mount = part.mountpoint
 
                 try:
-                    _current_usage = psutil.disk_usage(_mount)
+                    _current_usage = salt.utils.sampling.sample(
+                        __opts__, ('disk_usage', _mount), psutil.disk_usage, _mount)
                 except OSError:
                     log.warning('%s is not a valid mount point.', _mount)
                     continue
@@ -21,6 +21,7 @@ import fnmatch
 import logging
 import os
 import re
+import time
 
 # Import salt libs
 import salt.ext.six
@@ -82,6 +83,173 @@ def _get_notifier(config):
     return __context__['inotify.notifier']
 
 
+def _is_excluded(excludes, pathname):
+    '''
+    Return whether the path matches one of the excludes
+    '''
+    if not excludes or not isinstance(excludes, list):
+        return False
+    for exclude in excludes:
+        if isinstance(exclude, dict):
+            if list(exclude.values())[0].get('regex', False):
+                try:
+                    if re.search(list(exclude)[0], pathname):
+                        return True
+                except Exception:
+                    log.warning('Failed to compile regex: %s',
+                                list(exclude)[0])
+        elif '*' in exclude:
+            if fnmatch.fnmatch(pathname, exclude):
+                return True
+        else:
+            if pathname.startswith(exclude):
+                return True
+    return False
+
+
+def _get_root(files, path):
+    '''
+    Return the configured path the path belongs to
+    '''
+    while True:
+        if path in files:
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _count_watches(path, rec):
+    '''
+    Return the number of watches needed to watch the path
+    '''
+    if not rec or not os.path.isdir(path):
+        return 1
+    return sum(1 for _ in os.walk(path))
+
+
+def _scan(path, rec):
+    '''
+    Return the modification times of the path and of the files below it
+    '''
+    paths = [path]
+    if os.path.isdir(path):
+        if rec:
+            for root, dirs, files in os.walk(path):
+                paths.extend(os.path.join(root, name) for name in dirs + files)
+        else:
+            try:
+                paths.extend(os.path.join(path, name) for name in os.listdir(path))
+            except OSError:
+                pass
+    ret = {}
+    for name in paths:
+        try:
+            stat = os.stat(name)
+        except OSError:
+            continue
+        ret[name] = (stat.st_mtime, os.path.isdir(name))
+    return ret
+
+
+def _poll(path, mask):
+    '''
+    Compare the path with its last scan and return the changes as events
+    '''
+    polled = __context__['inotify.polled'][path]
+    old = polled['mtimes']
+    new = _scan(path, polled['rec'])
+    polled['mtimes'] = new
+    changes = []
+    for name in new:
+        if name not in old:
+            changes.append((name, 'IN_CREATE', new[name][1]))
+        elif new[name][0] != old[name][0]:
+            changes.append((name, 'IN_MODIFY', new[name][1]))
+    for name in old:
+        if name not in new:
+            changes.append((name, 'IN_DELETE', old[name][1]))
+    ret = []
+    for name, change, isdir in sorted(changes):
+        if not mask & MASKS[change[3:].lower()]:
+            continue
+        if _is_excluded(polled['exclude'], name):
+            continue
+        if name == path:
+            tag = path
+        else:
+            tag = os.path.dirname(name)
+        if isdir:
+            change += '|IN_ISDIR'
+        ret.append({'tag': tag, 'path': name, 'change': change})
+    return ret
+
+
+def _merge(_config, events):
+    '''
+    Hold the events for the coalescing and debouncing windows, and return the
+    events which are due
+    '''
+    window = _config.get('coalesce_window', 0)
+    pending = __context__.setdefault('inotify.pending', collections.OrderedDict())
+    now = time.time()
+    ret = []
+    for event in events:
+        root = _get_root(_config.get('files', {}), event['path'])
+        debounce = 0
+        if root is not None and isinstance(_config['files'][root], dict):
+            debounce = _config['files'][root].get('debounce', 0)
+        if debounce:
+            key = ('debounce', event['tag'])
+            if key not in pending:
+                pending[key] = {'event': {'tag': event['tag'],
+                                          'path': event['tag'],
+                                          'change': 'debounce',
+                                          'changes': [],
+                                          'count': 0},
+                                'first': now,
+                                'wait': debounce}
+            merged = pending[key]['event']
+            change = {'path': event['path'], 'change': event['change']}
+            if change not in merged['changes']:
+                merged['changes'].append(change)
+            merged['count'] += 1
+            # Wait for the directory to be quiet
+            pending[key]['first'] = now
+        elif window:
+            key = ('coalesce', event['path'], event['change'])
+            if key not in pending:
+                event['count'] = 0
+                pending[key] = {'event': event, 'first': now, 'wait': window}
+            pending[key]['event']['count'] += 1
+        else:
+            ret.append(event)
+    for key in list(pending):
+        if now - pending[key]['first'] >= pending[key]['wait']:
+            ret.append(pending.pop(key)['event'])
+    return ret
+
+
+def _limit(_config, events):
+    '''
+    Cap the number of events, the events over the cap are replaced with a
+    summary counting them per configured path
+    '''
+    max_events = _config.get('max_events', 0)
+    if not max_events or len(events) <= max_events:
+        return events
+    dropped = {}
+    for event in events[max_events:]:
+        root = _get_root(_config.get('files', {}), event['path']) or event['tag']
+        dropped[root] = dropped.get(root, 0) + event.get('count', 1)
+    log.info('Summarizing %s inotify events over max_events', len(events) - max_events)
+    summary = {'tag': 'summary',
+               'count': sum(dropped.values()),
+               'paths': dropped}
+    return events[:max_events] + [summary]
+
+
 def validate(config):
     '''
     Validate the beacon configuration
@@ -125,7 +293,8 @@ def validate(config):
                 else:
                     if not any(j in ['mask',
                                      'recurse',
-                                     'auto_add'] for j in _config['files'][path]):
+                                     'auto_add',
+                                     'debounce'] for j in _config['files'][path]):
                         return False, ('Configuration for inotify beacon must '
                                        'contain mask, recurse or auto_add items.')
 
@@ -139,6 +308,11 @@ def validate(config):
                             return False, ('Configuration for inotify beacon '
                                            'recurse must be boolean.')
 
+                    if 'debounce' in _config['files'][path]:
+                        if not isinstance(_config['files'][path]['debounce'], (int, float)):
+                            return False, ('Configuration for inotify beacon '
+                                           'debounce must be a number.')
+
                     if 'mask' in _config['files'][path]:
                         if not isinstance(_config['files'][path]['mask'], list):
                             return False, ('Configuration for inotify beacon '
@@ -147,6 +321,11 @@ def validate(config):
                             if mask not in VALID_MASK:
                                 return False, ('Configuration for inotify beacon '
                                                'invalid mask option {0}.'.format(mask))
+
+        for option in ('coalesce_window', 'max_events', 'max_watches'):
+            if option in _config and not isinstance(_config[option], (int, float)):
+                return False, ('Configuration for inotify beacon '
+                               '{0} must be a number.'.format(option))
     return True, 'Valid beacon configuration'
 
 
@@ -173,7 +352,11 @@ def beacon(config):
                     - /path/to/file/or/dir/exclude2
                     - /path/to/file/or/dir/regex[a-m]*$:
                         regex: True
+                  debounce: 10
             - coalesce: True
+            - coalesce_window: 5
+            - max_events: 100
+            - max_watches: 8192
 
     The mask list can contain the following events (the default mask is create,
     delete, and modify):
@@ -214,6 +397,34 @@ def beacon(config):
       This option is top-level (at the same level as the path) and therefore
       affects all paths that are being watched. This is due to this option
       being at the Notifier level in pyinotify.
+    debounce:
+      Send a single event per directory once no change happened in it for this
+      many seconds. The event has the directory as its path, ``debounce`` as
+      its change, the list of the distinct changes in ``changes`` and the
+      number of changes in ``count``.
+
+      .. versionadded:: Neon
+    coalesce_window:
+      Hold the events for this many seconds and send a single event for each
+      path and change seen in that window, with the number of occurrences in
+      ``count``. This option is top-level.
+
+      .. versionadded:: Neon
+    max_events:
+      Send at most this many events per beacon interval. The events over the
+      limit are dropped and counted per watched path in a single event tagged
+      ``summary``. This option is top-level.
+
+      .. versionadded:: Neon
+    max_watches:
+      The number of inotify watches the beacon may use. A path which would
+      need more watches, or which cannot be watched because the
+      ``fs.inotify.max_user_watches`` limit of the kernel was reached, is
+      scanned for modification times on every beacon interval instead, which
+      reports creations, deletions and modifications. This option is
+      top-level.
+
+      .. versionadded:: Neon
     '''
     _config = {}
     list(map(_config.update, config))
@@ -221,6 +432,7 @@ def beacon(config):
     ret = []
     notifier = _get_notifier(_config)
     wm = notifier._watch_manager
+    polled = __context__.setdefault('inotify.polled', {})
 
     # Read in existing events
     if notifier.check_events(1):
@@ -241,24 +453,8 @@ def beacon(config):
             for path in _config.get('files', {}):
                 excludes = _config['files'][path].get('exclude', '')
 
-            if excludes and isinstance(excludes, list):
-                for exclude in excludes:
-                    if isinstance(exclude, dict):
-                        if exclude.values()[0].get('regex', False):
-                            try:
-                                if re.search(list(exclude)[0], event.pathname):
-                                    _append = False
-                            except Exception:
-                                log.warning('Failed to compile regex: %s',
-                                            list(exclude)[0])
-                        else:
-                            exclude = list(exclude)[0]
-                    elif '*' in exclude:
-                        if fnmatch.fnmatch(event.pathname, exclude):
-                            _append = False
-                    else:
-                        if event.pathname.startswith(exclude):
-                            _append = False
+            if _is_excluded(excludes, event.pathname):
+                _append = False
 
             if _append:
                 sub = {'tag': event.path,
@@ -268,6 +464,15 @@ def beacon(config):
             else:
                 log.info('Excluding %s from event for %s', event.pathname, path)
 
+    # Scan the paths which could not be watched
+    for path in list(polled):
+        if path not in _config.get('files', {}):
+            del polled[path]
+            continue
+        ret.extend(_poll(path, polled[path]['mask']))
+
+    ret = _limit(_config, _merge(_config, ret))
+
     # Get paths currently being watched
     current = set()
     for wd in wm.watches:
@@ -295,7 +500,11 @@ def beacon(config):
             rec = False
             auto_add = False
 
-        if path in current:
+        if path in polled:
+            polled[path]['mask'] = mask
+            polled[path]['rec'] = rec
+            polled[path]['exclude'] = _config['files'][path].get('exclude', '')
+        elif path in current:
             for wd in wm.watches:
                 if path == wm.watches[wd].path:
                     update = False
@@ -317,7 +526,26 @@ def beacon(config):
                         excl.append(exclude)
                 excl = pyinotify.ExcludeFilter(excl)
 
-            wm.add_watch(path, mask, rec=rec, auto_add=auto_add, exclude_filter=excl)
+            max_watches = _config.get('max_watches', 0)
+            if max_watches and len(wm.watches) + _count_watches(path, rec) > max_watches:
+                log.warning('Watching %s would exceed max_watches, scanning '
+                            'its modification times instead', path)
+                wds = {}
+                failed = True
+            else:
+                wds = wm.add_watch(path, mask, rec=rec, auto_add=auto_add,
+                                   exclude_filter=excl)
+                failed = any(wd < 0 for wd in wds.values())
+                if failed:
+                    log.warning('Failed to watch %s, fs.inotify.max_user_watches '
+                                'may have been reached, scanning its '
+                                'modification times instead', path)
+            if failed:
+                wm.rm_watch([wd for wd in wds.values() if wd >= 0], quiet=True)
+                polled[path] = {'mask': mask,
+                                'rec': rec,
+                                'exclude': excludes,
+                                'mtimes': _scan(path, rec)}
 
     # Return event data
     return ret
@@ -327,3 +555,5 @@ def close(config):
     if 'inotify.notifier' in __context__:
         __context__['inotify.notifier'].stop()
         del __context__['inotify.notifier']
+    __context__.pop('inotify.pending', None)
+    __context__.pop('inotify.polled', None)
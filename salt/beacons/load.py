@@ -10,6 +10,7 @@ import os
 
 # Import Salt libs
 import salt.utils.platform
+import salt.utils.sampling
 from salt.ext.six.moves import map
 
 # Import Py3 compat
@@ -121,7 +122,7 @@ def beacon(config):
         _config['onchangeonly'] = False
 
     ret = []
-    avgs = os.getloadavg()
+    avgs = salt.utils.sampling.sample(__opts__, 'loadavg', os.getloadavg)
     avg_keys = ['1m', '5m', '15m']
     avg_dict = dict(zip(avg_keys, avgs))
 
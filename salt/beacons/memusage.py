@@ -13,6 +13,9 @@ import logging
 import re
 from salt.ext.six.moves import map
 
+# Import Salt libs
+import salt.utils.sampling
+
 # Import Third Party Libs
 try:
     import psutil
@@ -69,7 +72,8 @@ def beacon(config):
     _config = {}
     list(map(_config.update, config))
 
-    _current_usage = psutil.virtual_memory()
+    _current_usage = salt.utils.sampling.sample(
+        __opts__, 'virtual_memory', psutil.virtual_memory)
 
     current_usage = _current_usage.percent
     monitor_usage = _config['percent']
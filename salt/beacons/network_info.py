@@ -9,6 +9,9 @@ Beacon to monitor statistics from ethernet adapters
 from __future__ import absolute_import, unicode_literals
 import logging
 
+# Import Salt libs
+import salt.utils.sampling
+
 # Import third party libs
 # pylint: disable=import-error
 try:
@@ -133,7 +136,8 @@ def beacon(config):
 
     log.debug('psutil.net_io_counters %s', psutil.net_io_counters)
 
-    _stats = psutil.net_io_counters(pernic=True)
+    _stats = salt.utils.sampling.sample(
+        __opts__, ('net_io_counters', True), psutil.net_io_counters, pernic=True)
 
     log.debug('_stats %s', _stats)
     for interface in _config.get('interfaces', {}):
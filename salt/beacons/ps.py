@@ -7,17 +7,11 @@ Send events covering process status
 from __future__ import absolute_import, unicode_literals
 import logging
 
-# Import third party libs
-# pylint: disable=import-error
-try:
-    import salt.utils.psutil_compat as psutil
-    HAS_PSUTIL = True
-except ImportError:
-    HAS_PSUTIL = False
-
-from salt.ext.six.moves import map
+# Import Salt libs
+import salt.utils.sampling
 
-# pylint: enable=import-error
+# Import third party libs
+from salt.ext.six.moves import map  # pylint: disable=import-error
 
 log = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -25,7 +19,8 @@ __virtualname__ = 'ps'
 
 
 def __virtual__():
-    if not HAS_PSUTIL:
+    # The processes are listed by salt.utils.sampling
+    if not salt.utils.sampling.HAS_PSUTIL:
         return (False, 'cannot load ps beacon: psutil not available')
     return __virtualname__
 
@@ -68,11 +63,7 @@ def beacon(config):
     processes are running or stopped.
     '''
     ret = []
-    procs = []
-    for proc in psutil.process_iter():
-        _name = proc.name()
-        if _name not in procs:
-            procs.append(_name)
+    procs = salt.utils.sampling.process_names(__opts__)
 
     _config = {}
     list(map(_config.update, config))
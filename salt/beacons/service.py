@@ -11,6 +11,9 @@ import logging
 import time
 from salt.ext.six.moves import map
 
+# Import Salt libs
+import salt.utils.sampling
+
 log = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 LAST_STATUS = {}
@@ -111,7 +114,8 @@ def beacon(config):
 
         service_config = _config['services'][service]
 
-        ret_dict[service] = {'running': __salt__['service.status'](service)}
+        ret_dict[service] = {'running': salt.utils.sampling.sample(
+            __opts__, ('service.status', service), __salt__['service.status'], service)}
         ret_dict['service_name'] = service
         ret_dict['tag'] = service
         currtime = time.time()
@@ -155,6 +155,27 @@ class Cache(object):
         fun = '{0}.store'.format(self.driver)
         return self.modules[fun](bank, key, data, **self._kwargs)
 
+    def store_many(self, items):
+        '''
+        Store the data of many keys at once, using the ``store_many`` function
+        of the driver when it has one, and storing the keys one by one
+        otherwise.
+
+        .. versionadded:: Neon
+
+        :param items:
+            A dict mapping ``(bank, key)`` tuples to the data to store.
+
+        :raises SaltCacheError:
+            Raises an exception if cache driver detected an error accessing data
+            in the cache backend (auth, permissions, etc).
+        '''
+        fun = '{0}.store_many'.format(self.driver)
+        if fun in self.modules:
+            return self.modules[fun](items, **self._kwargs)
+        for (bank, key), data in six.iteritems(items):
+            self.store(bank, key, data)
+
     def fetch(self, bank, key):
         '''
         Fetch data using the specified module
@@ -179,6 +200,31 @@ class Cache(object):
         fun = '{0}.fetch'.format(self.driver)
         return self.modules[fun](bank, key, **self._kwargs)
 
+    def fetch_many(self, bank_keys):
+        '''
+        Fetch the data of many keys at once, using the ``fetch_many`` function
+        of the driver when it has one, and fetching the keys one by one
+        otherwise.
+
+        .. versionadded:: Neon
+
+        :param bank_keys:
+            An iterable of ``(bank, key)`` tuples.
+
+        :return:
+            A dict mapping each ``(bank, key)`` tuple to the data fetched from
+            the cache, which is an empty dict for the keys not found.
+
+        :raises SaltCacheError:
+            Raises an exception if cache driver detected an error accessing data
+            in the cache backend (auth, permissions, etc).
+        '''
+        bank_keys = list(bank_keys)
+        fun = '{0}.fetch_many'.format(self.driver)
+        if fun in self.modules:
+            return self.modules[fun](bank_keys, **self._kwargs)
+        return dict(((bank, key), self.fetch(bank, key)) for bank, key in bank_keys)
+
     def updated(self, bank, key):
         '''
         Get the last updated epoch for the specified key
@@ -243,6 +289,37 @@ class Cache(object):
         fun = '{0}.list'.format(self.driver)
         return self.modules[fun](bank, **self._kwargs)
 
+    def list_with_data(self, bank):
+        '''
+        Return the data of all the keys stored in the specified bank, using the
+        ``list_with_data`` function of the driver when it has one, and listing
+        and fetching the keys otherwise.
+
+        .. versionadded:: Neon
+
+        :param bank:
+            The name of the location inside the cache which will hold the key
+            and its associated data.
+
+        :return:
+            A dict mapping each key of the bank to its data. Sub-banks are not
+            included.
+
+        :raises SaltCacheError:
+            Raises an exception if cache driver detected an error accessing data
+            in the cache backend (auth, permissions, etc).
+        '''
+        fun = '{0}.list_with_data'.format(self.driver)
+        if fun in self.modules:
+            return self.modules[fun](bank, **self._kwargs)
+        fetched = self.fetch_many((bank, key) for key in self.list(bank))
+        ret = {}
+        for (_, key), data in six.iteritems(fetched):
+            # An empty dict is also what is fetched for a sub-bank
+            if data != {} or self.contains(bank, key):
+                ret[key] = data
+        return ret
+
     def contains(self, bank, key=None):
         '''
         Checks if the specified bank contains the specified key.
@@ -271,33 +348,58 @@ class Cache(object):
 
 class MemCache(Cache):
     '''
-    Short-lived in-memory cache store keeping values on time and/or size (count)
-    basis.
+    Short-lived in-memory cache store keeping values on time and/or size (count
+    and approximate bytes) basis, evicting the least recently used values first.
     '''
     # {<storage_id>: odict({<key>: [atime, data], ...}), ...}
     data = {}
+    # {<storage_id>: [<total bytes>, {<key>: <bytes>, ...}], ...}
+    sizes = {}
+    # {<top-level bank>: [<hits>, <misses>], ...}
+    stats = {}
 
     def __init__(self, opts, **kwargs):
         super(MemCache, self).__init__(opts, **kwargs)
         self.expire = opts.get('memcache_expire_seconds', 10)
         self.max = opts.get('memcache_max_items', 1024)
+        self.max_size = opts.get('memcache_max_size', 0)
         self.cleanup = opts.get('memcache_full_cleanup', False)
         self.debug = opts.get('memcache_debug', False)
+        # The stats are only sent with the master worker stats events
+        self.count_stats = opts.get('master_stats', False)
         if self.debug:
             self.call = 0
             self.hit = 0
         self._storage = None
+        self._sizes = None
 
     @classmethod
     def __cleanup(cls, expire):
         now = time.time()
-        for storage in six.itervalues(cls.data):
+        for storage_id, storage in six.iteritems(cls.data):
             for key, data in list(storage.items()):
                 if data[0] + expire < now:
                     del storage[key]
+                    sizes = cls.sizes.get(storage_id)
+                    if sizes is not None:
+                        sizes[0] -= sizes[1].pop(key, 0)
                 else:
                     break
 
+    @classmethod
+    def pop_stats(cls):
+        '''
+        Return the hits and misses of the in-memory caches of this process per
+        top-level bank since the last call, and reset them. They are only
+        counted when ``master_stats`` is enabled.
+
+        .. versionadded:: Neon
+        '''
+        ret = dict((bank, {'hits': hits, 'misses': misses})
+                   for bank, (hits, misses) in six.iteritems(cls.stats))
+        cls.stats.clear()
+        return ret
+
     def _get_storage_id(self):
         fun = '{0}.storage_id'.format(self.driver)
         if fun in self.modules:
@@ -311,47 +413,115 @@ class MemCache(Cache):
             storage_id = self._get_storage_id()
             if storage_id not in MemCache.data:
                 MemCache.data[storage_id] = OrderedDict()
+                MemCache.sizes[storage_id] = [0, {}]
             self._storage = MemCache.data[storage_id]
+            self._sizes = MemCache.sizes.setdefault(storage_id, [0, {}])
         return self._storage
 
-    def fetch(self, bank, key):
+    def _count(self, bank, hit):
+        if self.count_stats:
+            # Count the minions/<id> banks and the like together
+            counters = MemCache.stats.setdefault(bank.split('/', 1)[0], [0, 0])
+            counters[0 if hit else 1] += 1
         if self.debug:
             self.call += 1
-        now = time.time()
-        record = self.storage.pop((bank, key), None)
-        # Have a cached value for the key
-        if record is not None and record[0] + self.expire >= now:
-            if self.debug:
+            if hit:
                 self.hit += 1
                 log.debug(
                     'MemCache stats (call/hit/rate): %s/%s/%s',
                     self.call, self.hit, float(self.hit) / self.call
                 )
+
+    def _sizeof(self, data):
+        '''
+        Return the approximate size of the data in memory, that is the size of
+        its serialized form
+        '''
+        try:
+            return len(self.serial.dumps(data))
+        except Exception:
+            return 0
+
+    def _forget(self, bank_key):
+        self.storage.pop(bank_key, None)
+        self._sizes[0] -= self._sizes[1].pop(bank_key, 0)
+
+    def fetch(self, bank, key):
+        now = time.time()
+        record = self.storage.pop((bank, key), None)
+        # Have a cached value for the key
+        if record is not None and record[0] + self.expire >= now:
+            self._count(bank, True)
             # update atime and return
             record[0] = now
             self.storage[(bank, key)] = record
             return record[1]
 
         # Have no value for the key or value is expired
+        self._count(bank, False)
         data = super(MemCache, self).fetch(bank, key)
-        if len(self.storage) >= self.max:
-            if self.cleanup:
+        self._remember(bank, key, data, now)
+        return data
+
+    def fetch_many(self, bank_keys):
+        ret = {}
+        missing = []
+        now = time.time()
+        for bank, key in bank_keys:
+            record = self.storage.get((bank, key))
+            if record is not None and record[0] + self.expire >= now:
+                ret[(bank, key)] = self.fetch(bank, key)
+            else:
+                self._count(bank, False)
+                missing.append((bank, key))
+        if missing:
+            fetched = super(MemCache, self).fetch_many(missing)
+            for (bank, key), data in six.iteritems(fetched):
+                self._remember(bank, key, data, now)
+            ret.update(fetched)
+        return ret
+
+    def _remember(self, bank, key, data, now):
+        self._forget((bank, key))
+        size = 0
+        if self.max_size:
+            size = self._sizeof(data)
+            if size > self.max_size:
+                # Keeping it would evict everything else
+                return
+        cleaned = not self.cleanup
+        while self.storage and (len(self.storage) >= self.max or
+                                self.max_size and self._sizes[0] + size > self.max_size):
+            if not cleaned:
                 MemCache.__cleanup(self.expire)
-            if len(self.storage) >= self.max:
-                self.storage.popitem(last=False)
+                cleaned = True
+                continue
+            # Evict the least recently used value
+            self._forget(next(iter(self.storage)))
         self.storage[(bank, key)] = [now, data]
-        return data
+        if size:
+            self._sizes[1][(bank, key)] = size
+            self._sizes[0] += size
 
     def store(self, bank, key, data):
-        self.storage.pop((bank, key), None)
+        self._forget((bank, key))
         super(MemCache, self).store(bank, key, data)
-        if len(self.storage) >= self.max:
-            if self.cleanup:
-                MemCache.__cleanup(self.expire)
-            if len(self.storage) >= self.max:
-                self.storage.popitem(last=False)
-        self.storage[(bank, key)] = [time.time(), data]
+        self._remember(bank, key, data, time.time())
+
+    def store_many(self, items):
+        for bank_key in items:
+            self._forget(bank_key)
+        super(MemCache, self).store_many(items)
+        now = time.time()
+        for (bank, key), data in six.iteritems(items):
+            self._remember(bank, key, data, now)
 
     def flush(self, bank, key=None):
-        self.storage.pop((bank, key), None)
+        if key is None:
+            # The whole bank and its sub-banks are gone
+            prefix = bank + '/'
+            for bank_key in list(self.storage):
+                if bank_key[0] == bank or bank_key[0].startswith(prefix):
+                    self._forget(bank_key)
+        self._forget((bank, key))
         super(MemCache, self).flush(bank, key)
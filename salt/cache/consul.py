@@ -47,6 +47,7 @@ value to ``consul``:
 
 '''
 from __future__ import absolute_import, print_function, unicode_literals
+import base64
 import logging
 try:
     import consul
@@ -55,6 +56,8 @@ except ImportError:
     HAS_CONSUL = False
 
 from salt.exceptions import SaltCacheError
+from salt.ext import six
+from salt.ext.six.moves import range
 
 log = logging.getLogger(__name__)
 api = None
@@ -126,6 +129,89 @@ def fetch(bank, key):
         )
 
 
+def fetch_many(bank_keys):
+    '''
+    Fetch many key values, in transactions of up to 64 reads.
+    '''
+    if not hasattr(api, 'txn'):
+        # python-consul < 0.7.0
+        return dict(((bank, key), fetch(bank, key)) for bank, key in bank_keys)
+    ret = {}
+    c_keys = dict(('{0}/{1}'.format(bank, key), (bank, key)) for bank, key in bank_keys)
+    ordered = list(c_keys)
+    for idx in range(0, len(ordered), 64):
+        chunk = ordered[idx:idx + 64]
+        # A get fails the whole transaction when the key does not exist, a
+        # get-tree of the key does not
+        payload = [{'KV': {'Verb': 'get-tree', 'Key': c_key}} for c_key in chunk]
+        try:
+            result = api.txn.put(payload)
+        except Exception as exc:
+            raise SaltCacheError(
+                'There was an error reading the keys {0}: {1}'.format(
+                    chunk, exc
+                )
+            )
+        for item in result.get('Results') or []:
+            kv = item.get('KV') or {}
+            if kv.get('Key') in c_keys and kv.get('Value') is not None:
+                ret[c_keys[kv['Key']]] = __context__['serial'].loads(
+                    base64.b64decode(kv['Value']))
+    for bank_key in six.itervalues(c_keys):
+        ret.setdefault(bank_key, {})
+    return ret
+
+
+def store_many(items):
+    '''
+    Store many key values, in transactions of up to 64 writes.
+    '''
+    if not hasattr(api, 'txn'):
+        # python-consul < 0.7.0
+        for (bank, key), data in six.iteritems(items):
+            store(bank, key, data)
+        return
+    payload = []
+    for (bank, key), data in six.iteritems(items):
+        value = base64.b64encode(__context__['serial'].dumps(data))
+        payload.append({'KV': {'Verb': 'set',
+                               'Key': '{0}/{1}'.format(bank, key),
+                               'Value': value.decode('ascii')}})
+    for idx in range(0, len(payload), 64):
+        chunk = payload[idx:idx + 64]
+        try:
+            api.txn.put(chunk)
+        except Exception as exc:
+            raise SaltCacheError(
+                'There was an error writing the keys {0}: {1}'.format(
+                    [item['KV']['Key'] for item in chunk], exc
+                )
+            )
+
+
+def list_with_data(bank):
+    '''
+    Return the values of all the keys stored in the specified bank, with a
+    single recursive read.
+    '''
+    try:
+        _, values = api.kv.get(bank + '/', recurse=True)
+    except Exception as exc:
+        raise SaltCacheError(
+            'There was an error getting the key "{0}": {1}'.format(
+                bank, exc
+            )
+        )
+    ret = {}
+    for value in values or []:
+        key = value['Key'][len(bank) + 1:]
+        # Only the direct children of the bank, and not the sub-banks
+        if not key or '/' in key or value.get('Value') is None:
+            continue
+        ret[key] = __context__['serial'].loads(value['Value'])
+    return ret
+
+
 def flush(bank, key=None):
     '''
     Remove the key from the cache bank with all the key content.
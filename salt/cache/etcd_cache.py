@@ -207,6 +207,32 @@ def ls(bank):
         )
 
 
+def list_with_data(bank):
+    '''
+    Return the values of all the keys stored in the specified bank, with a
+    single recursive read. The sub-banks are left out.
+    '''
+    _init_client()
+    path = '{0}/{1}'.format(path_prefix, bank)
+    try:
+        result = client.read(path, recursive=True)
+    except etcd.EtcdKeyNotFound:
+        return {}
+    except Exception as exc:
+        raise SaltCacheError(
+            'There was an error getting the key "{0}": {1}'.format(
+                bank, exc
+            )
+        )
+    ret = {}
+    for child in result.leaves:
+        if child.dir or child.key.rsplit('/', 1)[0] != path:
+            continue
+        ret[child.key.rsplit('/', 1)[1]] = __context__['serial'].loads(
+            base64.b64decode(child.value))
+    return ret
+
+
 def contains(bank, key):
     '''
     Checks if the specified bank contains the specified key.
@@ -17,13 +17,23 @@ import os.path
 import errno
 import shutil
 import tempfile
+import threading
 
 from salt.exceptions import SaltCacheError
 import salt.utils.atomicfile
 import salt.utils.files
 
+# Import 3rd-party libs
+from salt.ext import six
+from salt.ext.six.moves import range
+
 log = logging.getLogger(__name__)
 
+# fetch_many reads the files on up to this many threads, giving each thread at
+# least _MIN_THREAD_KEYS files to read
+_MAX_READ_THREADS = 8
+_MIN_THREAD_KEYS = 16
+
 __func_alias__ = {'list_': 'list'}
 
 
@@ -100,6 +110,45 @@ def fetch(bank, key, cachedir):
         )
 
 
+def fetch_many(bank_keys, cachedir):
+    '''
+    Fetch information from many files, reading them on several threads when
+    there are enough of them.
+    '''
+    bank_keys = list(bank_keys)
+    workers = min(_MAX_READ_THREADS, len(bank_keys) // _MIN_THREAD_KEYS)
+    if workers < 2:
+        return dict(((bank, key), fetch(bank, key, cachedir))
+                    for bank, key in bank_keys)
+    ret = {}
+    errors = []
+
+    def _read(chunk):
+        try:
+            for bank, key in chunk:
+                ret[(bank, key)] = fetch(bank, key, cachedir)
+        except SaltCacheError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_read, args=(bank_keys[idx::workers],))
+               for idx in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return ret
+
+
+def store_many(items, cachedir):
+    '''
+    Store information in many files.
+    '''
+    for (bank, key), data in six.iteritems(items):
+        store(bank, key, data, cachedir)
+
+
 def updated(bank, key, cachedir):
     '''
     Return the epoch of the mtime for this cache file
@@ -169,6 +218,27 @@ def list_(bank, cachedir):
     return ret
 
 
+def list_with_data(bank, cachedir):
+    '''
+    Return the data of all the files stored in the specified bank.
+    '''
+    base = os.path.join(cachedir, os.path.normpath(bank))
+    if not os.path.isdir(base):
+        return {}
+    try:
+        items = os.listdir(base)
+    except OSError as exc:
+        raise SaltCacheError(
+            'There was an error accessing directory "{0}": {1}'.format(
+                base, exc
+            )
+        )
+    fetched = fetch_many(
+        [(bank, item[:-2]) for item in items if item.endswith('.p')],
+        cachedir)
+    return dict((key, data) for (_, key), data in six.iteritems(fetched))
+
+
 def contains(bank, key, cachedir):
     '''
     Checks if the specified bank contains the specified key.
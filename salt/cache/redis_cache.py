@@ -157,7 +157,8 @@ except ImportError:
     HAS_REDIS_CLUSTER = False
 
 # Import salt
-from salt.ext.six.moves import range
+from salt.ext import six
+from salt.ext.six.moves import range, zip
 from salt.exceptions import SaltCacheError
 
 # -----------------------------------------------------------------------------
@@ -376,6 +377,73 @@ def fetch(bank, key):
     return __context__['serial'].loads(redis_value)
 
 
+def fetch_many(bank_keys):
+    '''
+    Fetch the data of many keys from the Redis cache, in a single pipelined
+    request.
+    '''
+    redis_server = _get_redis_server()
+    redis_pipe = redis_server.pipeline()
+    for bank, key in bank_keys:
+        redis_pipe.get(_get_key_redis_key(bank, key))
+    try:
+        redis_values = redis_pipe.execute()
+    except (RedisConnectionError, RedisResponseError) as rerr:
+        mesg = 'Cannot fetch the Redis cache keys: {rerr}'.format(rerr=rerr)
+        log.error(mesg)
+        raise SaltCacheError(mesg)
+    ret = {}
+    for bank_key, redis_value in zip(bank_keys, redis_values):
+        if redis_value is None:
+            ret[bank_key] = {}
+        else:
+            ret[bank_key] = __context__['serial'].loads(redis_value)
+    return ret
+
+
+def store_many(items):
+    '''
+    Store the data of many keys in the Redis cache, in a single pipelined
+    request.
+    '''
+    redis_server = _get_redis_server()
+    redis_pipe = redis_server.pipeline()
+    banks = set()
+    try:
+        for (bank, key), data in six.iteritems(items):
+            if bank not in banks:
+                _build_bank_hier(bank, redis_pipe)
+                banks.add(bank)
+            redis_pipe.set(_get_key_redis_key(bank, key),
+                           __context__['serial'].dumps(data))
+            redis_pipe.sadd(_get_bank_keys_redis_key(bank), key)
+        redis_pipe.execute()
+    except (RedisConnectionError, RedisResponseError) as rerr:
+        mesg = 'Cannot set the Redis cache keys: {rerr}'.format(rerr=rerr)
+        log.error(mesg)
+        raise SaltCacheError(mesg)
+
+
+def list_with_data(bank):
+    '''
+    Return the data of all the keys stored in the specified bank, using one
+    request to list the keys and one pipelined request to fetch them.
+    '''
+    redis_server = _get_redis_server()
+    bank_keys_redis_key = _get_bank_keys_redis_key(bank)
+    try:
+        keys = redis_server.smembers(bank_keys_redis_key)
+    except (RedisConnectionError, RedisResponseError) as rerr:
+        mesg = 'Cannot list the Redis cache key {rkey}: {rerr}'.format(rkey=bank_keys_redis_key,
+                                                                       rerr=rerr)
+        log.error(mesg)
+        raise SaltCacheError(mesg)
+    if not keys:
+        return {}
+    fetched = fetch_many([(bank, key) for key in keys])
+    return dict((key, data) for (_, key), data in six.iteritems(fetched))
+
+
 def flush(bank, key=None):
     '''
     Remove the key from the cache bank with all the key content. If no key is specified, remove
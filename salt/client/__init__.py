@@ -37,6 +37,7 @@ import salt.utils.args
 import salt.utils.event
 import salt.utils.files
 import salt.utils.jid
+import salt.utils.job
 import salt.utils.minions
 import salt.utils.platform
 import salt.utils.stringutils
@@ -1087,6 +1088,8 @@ class LocalClient(object):
             timeout = self.opts['timeout']
         gather_job_timeout = int(kwargs.get('gather_job_timeout', self.opts['gather_job_timeout']))
         start = int(time.time())
+        # The job status table, when job_status_ttl is set
+        status_cache = None
 
         # timeouts per minion, id_ -> timeout time
         minion_timeouts = {}
@@ -1179,9 +1182,23 @@ class LocalClient(object):
             # if the jinfo has timed out and some minions are still running the job
             # re-do the ping
             if time.time() > timeout_at and minions_running:
-                # since this is a new ping, no one has responded yet
-                jinfo = self.gather_job_info(jid, list(minions - found), 'list', **kwargs)
                 minions_running = False
+                check_minions = minions - found
+                if self.opts.get('job_status_ttl', 0) > 0:
+                    # Only ask the minions which did not recently report
+                    # their running jobs
+                    if status_cache is None:
+                        status_cache = salt.cache.factory(self.opts)
+                    running, check_minions = salt.utils.job.check_running(
+                        self.opts, jid, check_minions, cache=status_cache)
+                    for id_ in running:
+                        minion_timeouts[id_] = time.time() + timeout
+                        minions_running = True
+                if check_minions:
+                    # since this is a new ping, no one has responded yet
+                    jinfo = self.gather_job_info(jid, list(check_minions), 'list', **kwargs)
+                else:
+                    jinfo = {}
                 # if we weren't assigned any jid that means the master thinks
                 # we have nothing to send
                 if 'jid' not in jinfo:
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+'''
+Run many jobs concurrently from a single master event subscription
+
+:py:class:`~salt.client.LocalClient` creates an event subscription and a
+polling loop for every job it waits on, and checks whether the minions are
+still running the job by publishing a ``saltutil.find_job`` per job. Services
+running hundreds of jobs at once (API servers, orchestration) therefore hold
+hundreds of subscriptions and flood the minions with ``find_job`` publishes.
+
+:py:class:`MultiplexedLocalClient` instead routes every ``salt/job/<jid>``
+event from one subscription to the job it belongs to, and checks liveness for
+all of the jobs which have timed out with a single ``saltutil.running``
+publish to the union of their pending minions.
+
+It is driven by a Tornado IOLoop, the same way the rest of the asynchronous
+client code is:
+
+.. code-block:: python
+
+    import tornado.gen
+    import tornado.ioloop
+    import salt.client.multiplex
+
+    @tornado.gen.coroutine
+    def main():
+        client = salt.client.multiplex.MultiplexedLocalClient(opts)
+        jid = yield client.run_job('*', 'test.sleep', [10])
+        returns = client.iter_returns(jid)
+        while True:
+            ret = yield returns.next()
+            if ret is None:
+                break
+            print(ret)
+        client.close()
+
+    tornado.ioloop.IOLoop.current().run_sync(main)
+
+.. versionadded:: Neon
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+import time
+
+# Import salt libs
+import salt.cache
+import salt.client
+import salt.utils.jid
+import salt.utils.job
+from salt.exceptions import SaltClientError
+
+# Import 3rd-party libs
+from salt.ext import six
+import tornado.concurrent
+import tornado.gen
+import tornado.ioloop
+import tornado.queues
+
+log = logging.getLogger(__name__)
+
+
+class JobReturns(object):
+    '''
+    Iterate over the returns of a single job as they arrive
+    '''
+    def __init__(self, queue):
+        self._queue = queue
+        self._done = False
+
+    @tornado.gen.coroutine
+    def next(self):
+        '''
+        Return the next minion return, or None when the job is complete
+        '''
+        if self._done:
+            raise tornado.gen.Return(None)
+        ret = yield self._queue.get()
+        if ret is None:
+            self._done = True
+        raise tornado.gen.Return(ret)
+
+
+class _Job(object):
+    '''
+    The state of a single in-flight job
+    '''
+    def __init__(self, jid, minions, timeout, expect_minions=False):
+        self.jid = jid
+        self.minions = set(minions)
+        self.found = set()
+        self.timeout = timeout
+        self.start = time.time()
+        self.timeout_at = self.start + timeout
+        self.expect_minions = expect_minions
+        self.returns = {}
+        self.queue = tornado.queues.Queue()
+        self.future = tornado.concurrent.Future()
+        # False until the publish tells which minions the job targets
+        self.published = True
+
+    @property
+    def pending(self):
+        return self.minions - self.found
+
+
+class MultiplexedLocalClient(object):
+    '''
+    Publish jobs through :py:class:`~salt.client.LocalClient` and wait on
+    their returns over a single shared event subscription
+
+    Once a job is complete its returns are kept until they are collected
+    through :py:meth:`get_returns` or :py:meth:`iter_returns`, or for the
+    job's timeout, whichever comes first.
+    '''
+    def __init__(self, opts, io_loop=None, local=None):
+        self.opts = opts
+        self.io_loop = io_loop or tornado.ioloop.IOLoop.current()
+        if local is None:
+            local = salt.client.LocalClient(mopts=opts, io_loop=self.io_loop)
+        self.local = local
+        self.event = self.local.event
+        self.gather_job_timeout = int(self.opts['gather_job_timeout'])
+        self.cache = None
+        # jid -> _Job
+        self.jobs = {}
+        # Jobs which are complete but whose returns have not been collected
+        self.finished = {}
+        # The liveness check in flight, if any
+        self.check = None
+        self._closing = False
+        self._check_handle = None
+        self.event.set_event_handler(self._handle_event)
+        self._schedule_check()
+
+    def close(self):
+        '''
+        Stop watching the event bus and fail every in-flight job
+        '''
+        if self._closing:
+            return
+        self._closing = True
+        if self._check_handle is not None:
+            self.io_loop.remove_timeout(self._check_handle)
+            self._check_handle = None
+        for job in list(six.itervalues(self.jobs)):
+            self._finish(job)
+        self.event.destroy()
+
+    @tornado.gen.coroutine
+    def run_job(self, tgt, fun, arg=(), tgt_type='glob', ret='', timeout=None,
+                jid='', kwarg=None, expect_minions=False, **kwargs):
+        '''
+        Publish a job and start tracking its returns
+
+        :returns: The job ID
+        '''
+        timeout = self.local._get_timeout(timeout)
+        # Track the job before publishing it, the returns of fast minions may
+        # arrive before the publish completes
+        jid = jid or salt.utils.jid.gen_jid(self.opts)
+        job = self.track(jid, (), timeout, expect_minions)
+        job.published = False
+        try:
+            pub_data = yield self.local.run_job_async(
+                tgt, fun, arg=arg, tgt_type=tgt_type, ret=ret, timeout=timeout,
+                jid=jid, kwarg=kwarg, listen=False, io_loop=self.io_loop, **kwargs)
+        except Exception:
+            self.jobs.pop(jid, None)
+            raise
+        if not pub_data:
+            self.jobs.pop(jid, None)
+            raise SaltClientError('Failed to publish {0} to {1}'.format(fun, tgt))
+        job.published = True
+        job.minions.update(pub_data['minions'])
+        job.timeout_at = time.time() + job.timeout
+        if jid in self.jobs and not job.pending:
+            self._finish(job)
+        raise tornado.gen.Return(jid)
+
+    def track(self, jid, minions, timeout=None, expect_minions=False):
+        '''
+        Start tracking the returns of an already published job
+        '''
+        if jid not in self.jobs:
+            self.jobs[jid] = _Job(
+                jid, minions, self.local._get_timeout(timeout), expect_minions)
+            log.debug('Tracking jid %s sent to %s', jid, minions)
+        return self.jobs[jid]
+
+    def _get_job(self, jid):
+        if jid in self.jobs:
+            return self.jobs[jid]
+        # The job is done, the caller is collecting its returns now
+        return self.finished.pop(jid)
+
+    def iter_returns(self, jid):
+        '''
+        Return a :py:class:`JobReturns` yielding the returns of the job in the
+        same format as :py:meth:`~salt.client.LocalClient.get_iter_returns`
+        '''
+        return JobReturns(self._get_job(jid).queue)
+
+    def get_returns(self, jid):
+        '''
+        Return a future which resolves to the returns of all the minions of
+        the job, keyed by minion ID, once the job is complete
+        '''
+        return self._get_job(jid).future
+
+    @staticmethod
+    def _jid_from_tag(tag):
+        parts = tag.split('/', 3)
+        if len(parts) < 3 or parts[0] != 'salt' or parts[1] != 'job':
+            return None
+        return parts[2]
+
+    def _handle_event(self, raw):
+        '''
+        Route a master event to the job, or the liveness check, it belongs to
+        '''
+        mtag, mdata = self.event.unpack_tag(raw)
+        jid = self._jid_from_tag(mtag)
+        if jid is None:
+            return
+        if self.check is not None and jid == self.check['jid']:
+            self._handle_check_return(self.event.serial.loads(mdata, encoding='utf-8'))
+            return
+        job = self.jobs.get(jid)
+        if job is None:
+            return
+        data = self.event.serial.loads(mdata, encoding='utf-8')
+        if 'minions' in data:
+            job.minions.update(data['minions'])
+            return
+        if 'return' not in data or 'id' not in data:
+            return
+        minion = data['id']
+        ret = {'ret': data['return']}
+        for key in ('out', 'retcode', 'jid'):
+            if key in data:
+                ret[key] = data[key]
+        job.found.add(minion)
+        job.returns[minion] = ret
+        job.queue.put_nowait({minion: ret})
+        log.debug('jid %s return from %s', jid, minion)
+        if job.published and not job.pending:
+            self._finish(job)
+
+    def _finish(self, job):
+        self.jobs.pop(job.jid, None)
+        job.timeout_at = time.time() + job.timeout
+        self.finished[job.jid] = job
+        if job.expect_minions:
+            for minion in job.pending:
+                job.returns[minion] = {'failed': True}
+                job.queue.put_nowait({minion: {'failed': True}})
+        job.queue.put_nowait(None)
+        if not job.future.done():
+            job.future.set_result(job.returns)
+
+    def _schedule_check(self):
+        if not self._closing:
+            self._check_handle = self.io_loop.call_later(1, self._check_jobs)
+
+    def _check_jobs(self):
+        '''
+        Publish a single liveness check for all of the timed out jobs, and
+        settle the jobs once the previous check has had its answers
+        '''
+        try:
+            now = time.time()
+            for jid, job in list(six.iteritems(self.finished)):
+                # Nobody collected the returns in time
+                if now >= job.timeout_at:
+                    del self.finished[jid]
+            if self.check is not None:
+                if now >= self.check['timeout_at']:
+                    self._settle_check()
+            if self.check is None:
+                timed_out = [job for job in six.itervalues(self.jobs)
+                             if job.published and now >= job.timeout_at
+                             and job.pending]
+                if timed_out:
+                    self.io_loop.spawn_callback(self._publish_check, timed_out)
+        except Exception:
+            log.error('Failed to check the running jobs', exc_info=True)
+        finally:
+            self._schedule_check()
+
+    @tornado.gen.coroutine
+    def _publish_check(self, jobs):
+        # The jid is known before publishing, the answers of fast minions may
+        # arrive before the publish completes
+        self.check = {
+            'jid': salt.utils.jid.gen_jid(self.opts),
+            'jobs': dict((job.jid, set()) for job in jobs),
+            'timeout_at': time.time() + self.gather_job_timeout,
+        }
+        minions = set()
+        for job in jobs:
+            pending = job.pending
+            if self.opts.get('job_status_ttl', 0) > 0:
+                # Minions which recently reported their running jobs do not
+                # need to be asked
+                if self.cache is None:
+                    self.cache = salt.cache.factory(self.opts)
+                alive, pending = salt.utils.job.check_running(
+                    self.opts, job.jid, pending, cache=self.cache,
+                    since=job.start)
+                self.check['jobs'][job.jid].update(alive)
+            minions.update(pending)
+        if not minions:
+            self.check['timeout_at'] = time.time()
+            return
+        log.debug('Checking whether jids %s are still running on %s',
+                  list(self.check['jobs']), sorted(minions))
+        try:
+            yield self.local.run_job_async(
+                list(minions), 'saltutil.running', tgt_type='list',
+                timeout=self.gather_job_timeout, jid=self.check['jid'],
+                listen=False, io_loop=self.io_loop)
+        except Exception as exc:
+            log.error('Failed to publish saltutil.running: %s', exc)
+
+    def _handle_check_return(self, data):
+        if 'return' not in data or 'id' not in data:
+            return
+        if not isinstance(data['return'], list):
+            return
+        running = set()
+        for proc in data['return']:
+            if isinstance(proc, dict) and 'jid' in proc:
+                running.add(proc['jid'])
+        for jid, alive in six.iteritems(self.check['jobs']):
+            if jid in running:
+                alive.add(data['id'])
+
+    def _settle_check(self):
+        '''
+        Extend the timeout of the jobs which are still running somewhere,
+        finish the others
+        '''
+        check, self.check = self.check, None
+        now = time.time()
+        for jid, alive in six.iteritems(check['jobs']):
+            job = self.jobs.get(jid)
+            if job is None:
+                continue
+            if alive & job.pending:
+                job.timeout_at = now + job.timeout
+            else:
+                log.debug('jid %s is no longer running on %s', jid, sorted(job.pending))
+                self._finish(job)
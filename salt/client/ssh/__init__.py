@@ -11,6 +11,7 @@ import logging
 import multiprocessing
 import subprocess
 import hashlib
+import io
 import tarfile
 import os
 import re
@@ -18,6 +19,7 @@ import sys
 import time
 import uuid
 import tempfile
+import threading
 import binascii
 import sys
 import datetime
@@ -43,18 +45,22 @@ import salt.utils.hashutils
 import salt.utils.json
 import salt.utils.network
 import salt.utils.path
+import salt.utils.roster_matcher
 import salt.utils.stringutils
 import salt.utils.thin
 import salt.utils.url
 import salt.utils.verify
 from salt.utils.platform import is_windows
-from salt.utils.process import MultiprocessingProcess
+from salt.utils.process import SignalHandlingMultiprocessingProcess
 import salt.roster
 from salt.template import compile_template
 
 # Import 3rd-party libs
 from salt.ext import six
-from salt.ext.six.moves import input  # pylint: disable=import-error,redefined-builtin
+from salt.ext.six.moves import input, queue, range  # pylint: disable=import-error,redefined-builtin
+import tornado.gen
+import tornado.ioloop
+import tornado.process
 try:
     import saltwinshell
     HAS_WINSHELL = True
@@ -62,6 +68,11 @@ except ImportError:
     HAS_WINSHELL = False
 from salt.utils.zeromq import zmq
 
+# The target arguments passed to salt.client.ssh.shell.Shell
+SHELL_ARGS = ('host', 'user', 'port', 'passwd', 'priv', 'priv_passwd',
+              'timeout', 'sudo', 'tty', 'identities_only', 'sudo_user',
+              'remote_port_forwards', 'ssh_options')
+
 # The directory where salt thin is deployed
 DEFAULT_THIN_DIR = '/var/tmp/.%%USER%%_%%FQDNUUID%%_salt'
 
@@ -334,9 +345,11 @@ class SSH(object):
         '''
         roster_file = salt.roster.get_roster_file(self.opts)
         if roster_file not in self.__parsed_rosters:
-            roster_data = compile_template(roster_file, salt.loader.render(self.opts, {}),
-                                           self.opts['renderer'], self.opts['renderer_blacklist'],
-                                           self.opts['renderer_whitelist'])
+            roster_data = salt.utils.roster_matcher.compile_roster(
+                self.opts, roster_file,
+                lambda source: compile_template(source, salt.loader.render(self.opts, {}),
+                                                self.opts['renderer'], self.opts['renderer_blacklist'],
+                                                self.opts['renderer_whitelist']))
             self.__parsed_rosters[roster_file] = roster_data
         return roster_file
 
@@ -505,6 +518,23 @@ class SSH(object):
             return {host: stderr}
         return {host: stdout}
 
+    @staticmethod
+    def _routine_ret(stdout, stderr, retcode):
+        '''
+        Return the data of a host return from the output of its command
+        '''
+        try:
+            data = salt.utils.json.find_json(stdout)
+            if len(data) < 2 and 'local' in data:
+                return data['local']
+        except Exception:
+            pass
+        return {
+            'stdout': stdout,
+            'stderr': stderr,
+            'retcode': retcode,
+        }
+
     def handle_routine(self, que, opts, host, target, mine=False):
         '''
         Run the routine in a "Thread", put a dict on the queue
@@ -522,53 +552,65 @@ class SSH(object):
         ret = {'id': single.id}
         stdout, stderr, retcode = single.run()
         # This job is done, yield
-        try:
-            data = salt.utils.json.find_json(stdout)
-            if len(data) < 2 and 'local' in data:
-                ret['ret'] = data['local']
-            else:
-                ret['ret'] = {
-                    'stdout': stdout,
-                    'stderr': stderr,
-                    'retcode': retcode,
-                }
-        except Exception:
-            ret['ret'] = {
-                'stdout': stdout,
-                'stderr': stderr,
-                'retcode': retcode,
-            }
+        ret['ret'] = self._routine_ret(stdout, stderr, retcode)
         que.put(ret)
 
+    def _prep_target(self, host):
+        '''
+        Apply the roster defaults to a target
+        '''
+        target = self.targets[host]
+        for default in self.defaults:
+            if default not in target:
+                target[default] = self.defaults[default]
+        if 'host' not in target:
+            target['host'] = host
+        return target
+
     def handle_ssh(self, mine=False):
         '''
         Spin up the needed threads or processes and execute the subsequent
         routines
         '''
+        if not self.targets:
+            log.error('No matching targets found in roster.')
+            return
+        hosts = list(self.targets)
+        if self.opts.get('raw_shell') and self.opts.get('ssh_raw_async'):
+            async_hosts = set(host for host in hosts
+                              if self._raw_async_capable(self._prep_target(host)))
+            if async_hosts:
+                for ret in self._handle_raw_async([host for host in hosts if host in async_hosts]):
+                    yield ret
+                hosts = [host for host in hosts if host not in async_hosts]
+        if hosts:
+            for ret in self._handle_routines(hosts, mine=mine):
+                yield ret
+
+    def _handle_routines(self, hosts, mine=False):
+        '''
+        Run the routines of the hosts in up to ``ssh_max_procs`` processes,
+        and yield their returns as they come in
+        '''
         que = multiprocessing.Queue()
+        max_procs = self.opts.get('ssh_max_procs', 25)
+        run_timeout = self.opts.get('ssh_run_timeout', 0)
         running = {}
-        target_iter = self.targets.__iter__()
-        returned = set()
-        rets = set()
+        finished = set()
+        target_iter = iter(hosts)
         init = False
         while True:
-            if not self.targets:
-                log.error('No matching targets found in roster.')
-                break
-            if len(running) < self.opts.get('ssh_max_procs', 25) and not init:
+            # Start routines while there are free slots, the routines which
+            # already returned do not hold one
+            while not init and len([host for host in running
+                                    if not running[host]['returned']]) < max_procs:
                 try:
                     host = next(target_iter)
                 except StopIteration:
                     init = True
-                    continue
-                for default in self.defaults:
-                    if default not in self.targets[host]:
-                        self.targets[host][default] = self.defaults[default]
-                if 'host' not in self.targets[host]:
-                    self.targets[host]['host'] = host
-                if self.targets[host].get('winrm') and not HAS_WINSHELL:
-                    returned.add(host)
-                    rets.add(host)
+                    break
+                target = self._prep_target(host)
+                if target.get('winrm') and not HAS_WINSHELL:
                     log_msg = 'Please contact sales@saltstack.com for access to the enterprise saltwinshell module.'
                     log.debug(log_msg)
                     no_ret = {'fun_args': [],
@@ -583,20 +625,31 @@ class SSH(object):
                         que,
                         self.opts,
                         host,
-                        self.targets[host],
+                        target,
                         mine,
                         )
-                routine = MultiprocessingProcess(
+                # Terminating it on timeout also terminates its ssh commands
+                routine = SignalHandlingMultiprocessingProcess(
                                 target=self.handle_routine,
                                 args=args)
                 routine.start()
-                running[host] = {'thread': routine}
-                continue
-            ret = {}
+                running[host] = {'thread': routine,
+                                 'returned': False,
+                                 'deadline': time.time() + run_timeout if run_timeout else None}
+            if not running:
+                break
+            # Wait for the next return, waking up regularly to reap the
+            # routines which died without returning, or ran out of time
+            wait = 1
+            deadlines = [running[host]['deadline'] for host in running
+                         if running[host]['deadline'] is not None]
+            if deadlines:
+                wait = max(0, min([wait, min(deadlines) - time.time()]))
             try:
-                ret = que.get(False)
-                if 'id' in ret:
-                    returned.add(ret['id'])
+                ret = que.get(timeout=wait)
+                if 'id' in ret and ret['id'] not in finished:
+                    if ret['id'] in running:
+                        running[ret['id']]['returned'] = True
                     yield {ret['id']: ret['ret']}
             except Exception:
                 # This bare exception is here to catch spurious exceptions
@@ -604,37 +657,153 @@ class SSH(object):
                 # worry about this bare exception, it is entirely here to
                 # control program flow.
                 pass
-            for host in running:
-                if not running[host]['thread'].is_alive():
-                    if host not in returned:
-                        # Try to get any returns that came through since we
-                        # last checked
-                        try:
-                            while True:
-                                ret = que.get(False)
-                                if 'id' in ret:
-                                    returned.add(ret['id'])
-                                    yield {ret['id']: ret['ret']}
-                        except Exception:
-                            pass
-
-                        if host not in returned:
-                            error = ('Target \'{0}\' did not return any data, '
-                                     'probably due to an error.').format(host)
-                            ret = {'id': host,
-                                   'ret': error}
-                            log.error(error)
-                            yield {ret['id']: ret['ret']}
-                    running[host]['thread'].join()
-                    rets.add(host)
-            for host in rets:
-                if host in running:
-                    running.pop(host)
-            if len(rets) >= len(self.targets):
+            now = time.time()
+            for host in list(running):
+                routine = running[host]['thread']
+                if routine.is_alive():
+                    if running[host]['returned']:
+                        continue
+                    deadline = running[host]['deadline']
+                    if deadline is None or now < deadline:
+                        continue
+                    routine.terminate()
+                    error = ('Target \'{0}\' did not return within {1} '
+                             'seconds.').format(host, run_timeout)
+                    log.error(error)
+                    yield {host: error}
+                elif not running[host]['returned']:
+                    # Try to get any returns that came through since we
+                    # last checked
+                    try:
+                        while True:
+                            ret = que.get(False)
+                            if 'id' in ret and ret['id'] not in finished:
+                                if ret['id'] in running:
+                                    running[ret['id']]['returned'] = True
+                                yield {ret['id']: ret['ret']}
+                    except Exception:
+                        pass
+
+                    if not running[host]['returned']:
+                        error = ('Target \'{0}\' did not return any data, '
+                                 'probably due to an error.').format(host)
+                        log.error(error)
+                        yield {host: error}
+                routine.join()
+                running.pop(host)
+                finished.add(host)
+
+    @staticmethod
+    def _raw_async_capable(target):
+        '''
+        Return whether the raw shell command can be run on the target without
+        answering prompts, and so without a terminal
+        '''
+        if target.get('tty') or target.get('winrm') or target.get('priv_passwd'):
+            return False
+        return not target.get('passwd') or bool(target.get('priv'))
+
+    def _handle_raw_async(self, hosts):
+        '''
+        Run the raw shell command on the hosts with non-blocking ssh
+        subprocesses driven by an IOLoop, instead of forking a process per
+        host, and yield their returns as they come in
+        '''
+        rets = queue.Queue()
+        cmd_str = ' '.join([_escape_arg(arg) for arg in self.opts['argv']])
+
+        def _run():
+            io_loop = tornado.ioloop.IOLoop()
+            try:
+                io_loop.run_sync(lambda: self._run_raw_async(hosts, cmd_str, rets))
+            except Exception as exc:
+                log.error('Failed to run the raw shell command: %s', exc, exc_info=True)
+            finally:
+                rets.put(None)
+                io_loop.close(all_fds=True)
+
+        thread = threading.Thread(target=_run)
+        thread.daemon = True
+        thread.start()
+        returned = set()
+        while True:
+            ret = rets.get()
+            if ret is None:
                 break
-            # Sleep when limit or all threads started
-            if len(running) >= self.opts.get('ssh_max_procs', 25) or len(self.targets) >= len(running):
-                time.sleep(0.1)
+            returned.update(ret)
+            yield ret
+        thread.join()
+        for host in hosts:
+            if host not in returned:
+                error = ('Target \'{0}\' did not return any data, '
+                         'probably due to an error.').format(host)
+                yield {host: error}
+
+    @tornado.gen.coroutine
+    def _run_raw_async(self, hosts, cmd_str, rets):
+        host_iter = iter(hosts)
+
+        @tornado.gen.coroutine
+        def _worker():
+            for host in host_iter:
+                try:
+                    ret = yield self._run_raw_host(host, cmd_str)
+                except Exception as exc:
+                    log.error('Failed to run the raw shell command on %s: %s',
+                              host, exc, exc_info=True)
+                    continue
+                rets.put({host: ret})
+
+        workers = min(self.opts.get('ssh_max_procs', 25), len(hosts))
+        yield [_worker() for _ in range(workers)]
+
+    @tornado.gen.coroutine
+    def _run_raw_host(self, host, cmd_str):
+        '''
+        Run the raw shell command on a host, return its return data
+        '''
+        target = self.targets[host]
+        args = dict((arg, target[arg]) for arg in SHELL_ARGS if arg in target)
+        args.setdefault('timeout', 30)
+        # There is no terminal and stdin is /dev/null, fail instead of waiting
+        # on a prompt which cannot be answered
+        args['ssh_options'] = list(args.get('ssh_options') or []) + ['BatchMode=yes']
+        shell = salt.client.ssh.shell.Shell(self.opts, **args)
+        cmd = shell._cmd_str(cmd_str)
+        logmsg = 'Executing command: {0}'.format(cmd)
+        if shell.passwd:
+            logmsg = logmsg.replace(shell.passwd, ('*' * 6))
+        log.debug(logmsg)
+        with salt.utils.files.fopen(os.devnull, 'rb') as devnull:
+            proc = tornado.process.Subprocess(
+                cmd,
+                shell=True,
+                stdin=devnull,
+                stdout=tornado.process.Subprocess.STREAM,
+                stderr=tornado.process.Subprocess.STREAM,
+            )
+        reads = tornado.gen.multi([proc.stdout.read_until_close(),
+                                   proc.stderr.read_until_close()])
+        run_timeout = self.opts.get('ssh_run_timeout', 0)
+        try:
+            if run_timeout:
+                stdout, stderr = yield tornado.gen.with_timeout(
+                    datetime.timedelta(seconds=run_timeout), reads)
+            else:
+                stdout, stderr = yield reads
+        except tornado.gen.TimeoutError:
+            proc.proc.kill()
+            proc.proc.wait()
+            error = ('Target \'{0}\' did not return within {1} '
+                     'seconds.').format(host, run_timeout)
+            log.error(error)
+            raise tornado.gen.Return(error)
+        while proc.proc.poll() is None:
+            yield tornado.gen.sleep(0.01)
+        raise tornado.gen.Return(self._routine_ret(
+            salt.utils.stringutils.to_unicode(stdout),
+            salt.utils.stringutils.to_unicode(stderr),
+            proc.proc.returncode))
 
     def run_iter(self, mine=False, jid=None):
         '''
@@ -946,13 +1115,10 @@ class Single(object):
         '''
         Properly escape argument to protect special characters from shell
         interpretation.  This avoids having to do tricky argument quoting.
-
-        Effectively just escape all characters in the argument that are not
-        alphanumeric!
         '''
         if self.winrm:
             return arg
-        return ''.join(['\\' + char if re.match(r'\W', char) else char for char in arg])
+        return _escape_arg(arg)
 
     def deploy(self):
         '''
@@ -965,13 +1131,17 @@ class Single(object):
         self.deploy_ext()
         return True
 
-    def deploy_ext(self):
+    def deploy_ext(self, manifest=None):
         '''
-        Deploy the ext_mods tarball
+        Deploy the ext_mods tarball, or only the modules which differ from the
+        ``manifest`` of the ones already deployed when the target sent it
         '''
         if self.mods.get('file'):
+            ext_path = self.mods['file']
+            if manifest is not None and 'files' in self.mods:
+                ext_path = ext_delta(self.mods, manifest, os.path.dirname(ext_path))
             self.shell.send(
-                self.mods['file'],
+                ext_path,
                 os.path.join(self.thin_dir, 'salt-ext_mods.tgz'),
             )
         return True
@@ -1373,7 +1543,13 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
                     while re.search(RSTR_RE, stderr):
                         stderr = re.split(RSTR_RE, stderr, 1)[1].strip()
             elif 'ext_mods' == shim_command:
-                self.deploy_ext()
+                manifest = None
+                try:
+                    manifest = salt.utils.json.loads(
+                        re.split(r'\r?\n', stdout, 2)[1].strip())
+                except (IndexError, ValueError):
+                    pass
+                self.deploy_ext(manifest if isinstance(manifest, dict) else None)
                 stdout, stderr, retcode = self.shim_cmd(cmd_str)
                 if not re.search(RSTR_RE, stdout) or not re.search(RSTR_RE, stderr):
                     # If RSTR is not seen in both stdout and stderr then there
@@ -1511,6 +1687,14 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
         return
 
 
+def _escape_arg(arg):
+    '''
+    Escape all the characters of the argument that are not alphanumeric, to
+    protect them from shell interpretation
+    '''
+    return ''.join(['\\' + char if re.match(r'\W', char) else char for char in arg])
+
+
 def lowstate_file_refs(chunks):
     '''
     Create a list of file ref objects to reconcile
@@ -1564,6 +1748,8 @@ def mod_data(fsclient):
             'returners',
             ]
     ret = {}
+    # The hash of each module, by path relative to the archive root
+    hashes = {}
     envs = fsclient.envs()
     ver_base = ''
     for env in envs:
@@ -1580,6 +1766,7 @@ def mod_data(fsclient):
                             continue
                         mods_data[os.path.basename(fn_)] = mod_path
                         chunk = salt.utils.hashutils.get_hash(mod_path)
+                        hashes['{0}/{1}'.format(ref, os.path.basename(fn_))] = chunk
                         ver_base += chunk
             if mods_data:
                 if ref in ret:
@@ -1596,10 +1783,17 @@ def mod_data(fsclient):
     ext_tar_path = os.path.join(
             fsclient.opts['cachedir'],
             'ext_mods.{0}.tgz'.format(ver))
+    files = {}
+    for ref in ret:
+        for fn_ in ret[ref]:
+            rel = '{0}/{1}'.format(ref, fn_)
+            files[rel] = [ret[ref][fn_], hashes[rel]]
     mods = {'version': ver,
-            'file': ext_tar_path}
+            'file': ext_tar_path,
+            'files': files}
     if os.path.isfile(ext_tar_path):
         return mods
+    _prune_ext_deltas(fsclient.opts['cachedir'], ver)
     tfp = tarfile.open(ext_tar_path, 'w:gz')
     verfile = os.path.join(fsclient.opts['cachedir'], 'ext_mods.ver')
     with salt.utils.files.fopen(verfile, 'w+') as fp_:
@@ -1612,6 +1806,72 @@ def mod_data(fsclient):
     return mods
 
 
+def _prune_ext_deltas(cachedir, ver):
+    '''
+    Remove the delta archives built by ext_delta for other versions of the
+    external modules than ``ver``
+    '''
+    try:
+        names = os.listdir(cachedir)
+    except OSError:
+        return
+    for name in names:
+        parts = name.split('.')
+        if len(parts) != 4 or parts[0] != 'ext_mods' or parts[3] != 'tgz' \
+                or parts[1] == ver:
+            continue
+        try:
+            os.remove(os.path.join(cachedir, name))
+        except OSError as exc:
+            log.debug('Unable to remove %s: %s', name, exc)
+
+
+def ext_delta(mods, manifest, cachedir):
+    '''
+    Return the path to an archive of the external modules which are missing
+    or differ from the ``manifest`` of the modules deployed on a target, which
+    also lists the deployed modules to remove.
+
+    The archives are named after their content, targets with the same modules
+    deployed share the same archive.
+    '''
+    files = mods.get('files', {})
+    changed = sorted(rel for rel in files if manifest.get(rel) != files[rel][1])
+    deleted = sorted(rel for rel in manifest if rel not in files)
+    digest = hashlib.sha1()
+    for rel in changed:
+        digest.update(salt.utils.stringutils.to_bytes('+{0}:{1}\n'.format(rel, files[rel][1])))
+    for rel in deleted:
+        digest.update(salt.utils.stringutils.to_bytes('-{0}\n'.format(rel)))
+    delta_path = os.path.join(
+            cachedir,
+            'ext_mods.{0}.{1}.tgz'.format(mods['version'], digest.hexdigest()))
+    if os.path.isfile(delta_path):
+        return delta_path
+
+    def _add_data(tfp, name, data):
+        data = salt.utils.stringutils.to_bytes(data)
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = time.time()
+        tfp.addfile(info, io.BytesIO(data))
+
+    fd_, tmp_path = tempfile.mkstemp(dir=cachedir, suffix='.tgz')
+    os.close(fd_)
+    tfp = tarfile.open(tmp_path, 'w:gz')
+    try:
+        _add_data(tfp, 'ext_version', mods['version'])
+        if deleted:
+            _add_data(tfp, 'ext_delete', '\n'.join(deleted) + '\n')
+        for rel in changed:
+            tfp.add(files[rel][0], rel)
+    finally:
+        tfp.close()
+    # Another routine may have built the same archive meanwhile
+    salt.utils.atomicfile.atomic_rename(tmp_path, delta_path)
+    return delta_path
+
+
 def ssh_version():
     '''
     Returns the version of the installed ssh command
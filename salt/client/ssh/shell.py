@@ -8,6 +8,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 import re
 import os
 import sys
+import errno
 import time
 import logging
 import subprocess
@@ -157,9 +158,8 @@ class Shell(object):
         '''
         Return options to pass to ssh
         '''
-        # TODO ControlMaster does not work without ControlPath
-        # user could take advantage of it if they set ControlPath in their
-        # ssh config.  Also, ControlPersist not widely available.
+        # ControlMaster does not work without ControlPath, which is set when
+        # ssh_persist is enabled, or by the user in their ssh config.
         options = ['ControlMaster=auto',
                    'StrictHostKeyChecking=no',
                    ]
@@ -193,6 +193,40 @@ class Shell(object):
             ret.append('-o {0} '.format(option))
         return ''.join(ret)
 
+    def _persist_opts(self):
+        '''
+        Return options to keep a master connection to the host open, and
+        share it between all the ssh and scp calls made to the host, for
+        ``ssh_persist_ttl`` seconds after the last of them
+        '''
+        if not self.opts.get('ssh_persist'):
+            return ''
+        ssh_version = self.opts.get('_ssh_version', (0,))
+        if ssh_version < (5, 6):
+            log.debug('ssh_persist requires ControlPersist, available from '
+                      'OpenSSH 5.6')
+            return ''
+        control_dir = os.path.join(self.opts['cachedir'], 'ssh_control')
+        if not os.path.isdir(control_dir):
+            try:
+                os.makedirs(control_dir, 0o700)
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    log.error('Unable to create %s: %s', control_dir, exc)
+                    return ''
+        if ssh_version >= (6, 7):
+            # A hash of the connection, keeping the socket path short
+            control_path = os.path.join(control_dir, '%C')
+        else:
+            control_path = os.path.join(control_dir, '%r@%h:%p')
+        options = ['ControlMaster=auto',
+                   'ControlPath={0}'.format(control_path),
+                   'ControlPersist={0}'.format(int(self.opts.get('ssh_persist_ttl', 60)))]
+        ret = []
+        for option in options:
+            ret.append('-o {0} '.format(option))
+        return ''.join(ret)
+
     def _ssh_opts(self):
         return ' '.join(['-o {0}'.format(opt)
                           for opt in self.ssh_options])
@@ -256,6 +290,9 @@ class Shell(object):
             command.append('-t -t')
         if self.passwd or self.priv:
             command.append(self.priv and self._key_opts() or self._passwd_opts())
+        persist_opts = self._persist_opts()
+        if persist_opts:
+            command.append(persist_opts)
         if ssh != 'scp' and self.remote_port_forwards:
             command.append(' '.join(['-R {0}'.format(item)
                                       for item in self.remote_port_forwards.split(',')]))
@@ -10,6 +10,7 @@ separate file, for convenience of development.
 from __future__ import absolute_import, print_function
 
 import hashlib
+import json
 import tarfile
 import shutil
 import sys
@@ -172,19 +173,11 @@ def unpack_thin(thin_path):
     reset_time(OPTIONS.saltdir)
 
 
-def need_ext():
-    '''
-    Signal that external modules need to be deployed.
+def get_modcache():
     '''
-    sys.stdout.write("{0}\next_mods\n".format(OPTIONS.delimiter))
-    sys.exit(EX_MOD_DEPLOY)
-
-
-def unpack_ext(ext_path):
+    Return the directory the external modules are unpacked in.
     '''
-    Unpack the external modules.
-    '''
-    modcache = os.path.join(
+    return os.path.join(
             OPTIONS.saltdir,
             'running_data',
             'var',
@@ -192,12 +185,60 @@ def unpack_ext(ext_path):
             'salt',
             'minion',
             'extmods')
+
+
+def ext_manifest():
+    '''
+    Return the hashes of the deployed external modules, by path relative to
+    the module cache.
+    '''
+    modcache = get_modcache()
+    manifest = {}
+    for root, _, files in os.walk(modcache):
+        for fn_ in files:
+            if not fn_.endswith(('.py', '.so', '.pyx')):
+                continue
+            path = os.path.join(root, fn_)
+            rel = os.path.relpath(path, modcache).replace(os.sep, '/')
+            manifest[rel] = get_hash(path, 'sha256')
+    return manifest
+
+
+def need_ext():
+    '''
+    Signal that external modules need to be deployed, along with the hashes of
+    the ones already deployed so that only the changed ones are sent.
+    '''
+    sys.stdout.write("{0}\next_mods\n{1}\n".format(OPTIONS.delimiter,
+                                                 json.dumps(ext_manifest())))
+    sys.exit(EX_MOD_DEPLOY)
+
+
+def unpack_ext(ext_path):
+    '''
+    Unpack the external modules, and remove the ones listed in the
+    ``ext_delete`` file of the archive.
+    '''
+    modcache = get_modcache()
     tfile = tarfile.TarFile.gzopen(ext_path)
     old_umask = os.umask(0o077)  # pylint: disable=blacklisted-function
     tfile.extractall(path=modcache)
     tfile.close()
     os.umask(old_umask)  # pylint: disable=blacklisted-function
     os.unlink(ext_path)
+    delete_path = os.path.join(modcache, 'ext_delete')
+    if os.path.isfile(delete_path):
+        with open(delete_path, 'r') as dfp:
+            for rel in dfp.read().splitlines():
+                path = os.path.normpath(os.path.join(modcache, rel))
+                if not rel or not path.startswith(modcache + os.sep):
+                    continue
+                # Also remove the byte-compiled files, which would be
+                # imported in place of the removed module
+                for fn_ in (path, path + 'c', path + 'o'):
+                    if os.path.isfile(fn_):
+                        os.unlink(fn_)
+        os.unlink(delete_path)
     ver_path = os.path.join(modcache, 'ext_version')
     ver_dst = os.path.join(OPTIONS.saltdir, 'ext_version')
     shutil.move(ver_path, ver_dst)
@@ -4,16 +4,20 @@ Create ssh executor system
 '''
 from __future__ import absolute_import, print_function
 # Import python libs
+import gzip
+import hashlib
 import logging
 import os
 import tarfile
 import tempfile
+import time
 import shutil
 from contextlib import closing
 
 # Import salt libs
 import salt.client.ssh.shell
 import salt.client.ssh
+import salt.utils.atomicfile
 import salt.utils.files
 import salt.utils.json
 import salt.utils.path
@@ -31,6 +35,9 @@ from salt.ext import six
 
 log = logging.getLogger(__name__)
 
+# The segments being written by _file_refs_segment
+_SEGMENT_TMP_PREFIX = '.trans_tar-'
+
 
 class SSHState(salt.state.State):
     '''
@@ -167,16 +174,20 @@ def salt_refs(data, ret=None):
     return ret
 
 
-def prep_trans_tar(file_client, chunks, file_refs, pillar=None, id_=None, roster_grains=None):
+def _trans_tar_cachedir(id_):
+    if id_ is None:
+        id_ = ''
+    try:
+        return os.path.join('salt-ssh', id_).rstrip(os.sep)
+    except AttributeError:
+        # Minion ID should always be a str, but don't let an int break this
+        return os.path.join('salt-ssh', six.text_type(id_)).rstrip(os.sep)
+
+
+def _cache_file_refs(file_client, file_refs, gendir, cachedir):
     '''
-    Generate the execution package from the saltenv file refs and a low state
-    data structure
+    Copy the files referenced in file_refs, per saltenv, into gendir
     '''
-    gendir = tempfile.mkdtemp()
-    trans_tar = salt.utils.files.mkstemp()
-    lowfn = os.path.join(gendir, 'lowstate.json')
-    pillarfn = os.path.join(gendir, 'pillar.json')
-    roster_grainsfn = os.path.join(gendir, 'roster_grains.json')
     sync_refs = [
             [salt.utils.url.create('_modules')],
             [salt.utils.url.create('_states')],
@@ -186,23 +197,6 @@ def prep_trans_tar(file_client, chunks, file_refs, pillar=None, id_=None, roster
             [salt.utils.url.create('_output')],
             [salt.utils.url.create('_utils')],
             ]
-    with salt.utils.files.fopen(lowfn, 'w+') as fp_:
-        salt.utils.json.dump(chunks, fp_)
-    if pillar:
-        with salt.utils.files.fopen(pillarfn, 'w+') as fp_:
-            salt.utils.json.dump(pillar, fp_)
-    if roster_grains:
-        with salt.utils.files.fopen(roster_grainsfn, 'w+') as fp_:
-            salt.utils.json.dump(roster_grains, fp_)
-
-    if id_ is None:
-        id_ = ''
-    try:
-        cachedir = os.path.join('salt-ssh', id_).rstrip(os.sep)
-    except AttributeError:
-        # Minion ID should always be a str, but don't let an int break this
-        cachedir = os.path.join('salt-ssh', six.text_type(id_)).rstrip(os.sep)
-
     for saltenv in file_refs:
         # Location where files in this saltenv will be cached
         cache_dest_root = os.path.join(cachedir, 'files', saltenv)
@@ -242,18 +236,113 @@ def prep_trans_tar(file_client, chunks, file_refs, pillar=None, id_=None, roster
                             os.makedirs(tgt_dir)
                         shutil.copy(filename, tgt)
                     continue
+
+
+def _add_tree(tfp, gendir):
+    '''
+    Add every file under gendir to the tarball, relative to gendir
+    '''
+    for root, dirs, files in salt.utils.path.os_walk(gendir):
+        for name in files:
+            full = os.path.join(root, name)
+            tfp.add(full, arcname=full[len(gendir):].lstrip(os.sep))
+
+
+def _file_refs_segment(file_client, file_refs, ttl):
+    '''
+    Return a gzipped tar segment holding the files referenced in file_refs,
+    without the end of archive marker, opened for reading.
+
+    Segments are shared by every target whose states reference the same
+    files, and rebuilt once they are older than ``ttl`` seconds. The segment
+    is opened here, so that another target purging it once it expires
+    cannot remove it before it is read.
+    '''
+    key = hashlib.sha256(salt.utils.stringutils.to_bytes(
+        salt.utils.json.dumps(file_refs, sort_keys=True))).hexdigest()
+    segdir = os.path.join(file_client.opts['cachedir'], 'salt-ssh', 'trans_tar')
+    segment = os.path.join(segdir, '{0}.tgz'.format(key))
+    now = time.time()
     try:
-        # cwd may not exist if it was removed but salt was run from it
-        cwd = os.getcwd()
-    except OSError:
-        cwd = None
-    os.chdir(gendir)
-    with closing(tarfile.open(trans_tar, 'w:gz')) as tfp:
-        for root, dirs, files in salt.utils.path.os_walk(gendir):
-            for name in files:
-                full = os.path.join(root, name)
-                tfp.add(full[len(gendir):].lstrip(os.sep))
-    if cwd:
-        os.chdir(cwd)
+        if now - os.path.getmtime(segment) < ttl:
+            return salt.utils.files.fopen(segment, 'rb')
+    except (IOError, OSError):
+        # Not built yet, or purged by another target since
+        pass
+    if not os.path.isdir(segdir):
+        try:
+            os.makedirs(segdir)
+        except OSError:
+            # Another target created it
+            pass
+    else:
+        # Drop the expired segments, and those left half written
+        for fn_ in os.listdir(segdir):
+            if not fn_.endswith('.tgz') and not fn_.startswith(_SEGMENT_TMP_PREFIX):
+                continue
+            path = os.path.join(segdir, fn_)
+            try:
+                if now - os.path.getmtime(path) >= ttl:
+                    os.remove(path)
+            except OSError:
+                pass
+    gendir = tempfile.mkdtemp()
+    fd_, tmp = tempfile.mkstemp(prefix=_SEGMENT_TMP_PREFIX, dir=segdir)
+    try:
+        with os.fdopen(fd_, 'wb') as fp_:
+            _cache_file_refs(
+                file_client, file_refs, gendir, os.path.join('salt-ssh', 'trans_tar', key))
+            with closing(gzip.GzipFile(fileobj=fp_, mode='wb')) as gzp:
+                # The tarball is not closed, the members of each target follow
+                # the segment's before the end of archive marker
+                _add_tree(tarfile.open(fileobj=gzp, mode='w'), gendir)
+        salt.utils.atomicfile.atomic_rename(tmp, segment)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    finally:
+        shutil.rmtree(gendir)
+    return salt.utils.files.fopen(segment, 'rb')
+
+
+def prep_trans_tar(file_client, chunks, file_refs, pillar=None, id_=None, roster_grains=None):
+    '''
+    Generate the execution package from the saltenv file refs and a low state
+    data structure
+
+    When ``ssh_trans_tar_ttl`` is set, the referenced files come from a
+    segment shared by every target referencing the same files, and only the
+    lowstate, pillar and roster grains are packed for this target.
+    '''
+    gendir = tempfile.mkdtemp()
+    trans_tar = salt.utils.files.mkstemp()
+    lowfn = os.path.join(gendir, 'lowstate.json')
+    pillarfn = os.path.join(gendir, 'pillar.json')
+    roster_grainsfn = os.path.join(gendir, 'roster_grains.json')
+    with salt.utils.files.fopen(lowfn, 'w+') as fp_:
+        salt.utils.json.dump(chunks, fp_)
+    if pillar:
+        with salt.utils.files.fopen(pillarfn, 'w+') as fp_:
+            salt.utils.json.dump(pillar, fp_)
+    if roster_grains:
+        with salt.utils.files.fopen(roster_grainsfn, 'w+') as fp_:
+            salt.utils.json.dump(roster_grains, fp_)
+
+    ttl = file_client.opts.get('ssh_trans_tar_ttl', 0)
+    if ttl > 0:
+        # gzip members can be concatenated, the target reads one tarball
+        with salt.utils.files.fopen(trans_tar, 'wb') as fp_:
+            with _file_refs_segment(file_client, file_refs, ttl) as seg:
+                shutil.copyfileobj(seg, fp_)
+            with closing(gzip.GzipFile(fileobj=fp_, mode='wb')) as gzp:
+                with closing(tarfile.open(fileobj=gzp, mode='w')) as tfp:
+                    _add_tree(tfp, gendir)
+    else:
+        _cache_file_refs(file_client, file_refs, gendir, _trans_tar_cachedir(id_))
+        with closing(tarfile.open(trans_tar, 'w:gz')) as tfp:
+            _add_tree(tfp, gendir)
     shutil.rmtree(gendir)
     return trans_tar
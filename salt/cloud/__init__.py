@@ -15,10 +15,12 @@ import logging
 import traceback
 import multiprocessing
 import sys
+from collections import OrderedDict
 from itertools import groupby
 
 # Import salt.cloud libs
 from salt.exceptions import (
+    SaltCacheError,
     SaltCloudNotFound,
     SaltCloudException,
     SaltCloudSystemExit,
@@ -26,6 +28,7 @@ from salt.exceptions import (
 )
 
 # Import salt libs
+import salt.cache
 import salt.config
 import salt.client
 import salt.loader
@@ -56,6 +59,42 @@ from salt.ext.six.moves import input  # pylint: disable=import-error,redefined-b
 # Get logging started
 log = logging.getLogger(__name__)
 
+# The bank of the cloud cache holding the provider queries which are reused
+# for query_cache_ttl seconds, keyed by '<alias>:<function>'. It is shared by
+# all the salt-cloud processes and read on every lookup, so that the queries
+# dropped after VMs were created or destroyed are not used by any process.
+QUERY_BANK = 'cloud/queries'
+
+
+def _query_cache_ttl(opts, alias, driver):
+    '''
+    Return the query_cache_ttl of the provider, which defaults to the global
+    one
+    '''
+    details = opts.get('providers', {}).get(alias, {}).get(driver, {})
+    return details.get('query_cache_ttl', opts.get('query_cache_ttl', 0))
+
+
+def _query_cache_enabled(opts):
+    if opts.get('query_cache_ttl', 0) > 0:
+        return True
+    for drivers in six.itervalues(opts.get('providers', {})):
+        for details in six.itervalues(drivers):
+            if details.get('query_cache_ttl', 0) > 0:
+                return True
+    return False
+
+
+def clear_query_cache(opts):
+    '''
+    Forget the cached provider queries, after VMs were created or destroyed
+    '''
+    if _query_cache_enabled(opts):
+        try:
+            salt.cache.Cache(opts).flush(QUERY_BANK)
+        except SaltCacheError as exc:
+            log.error('Failed to flush the cloud query cache: %s', exc)
+
 
 def communicator(func):
     '''Warning, this is a picklable decorator !'''
@@ -294,6 +333,22 @@ class CloudClient(object):
         mapper.opts['selected_query_option'] = 'list_nodes'
         return mapper.map_providers_parallel(query_type)
 
+    def refresh_query_cache(self, query_type=None):
+        '''
+        Query the providers whose queries are cached, see
+        ``query_cache_ttl``, and cache the results. By default the queries
+        used to map, destroy and action VMs are refreshed.
+        '''
+        opts = self._opts_defaults()
+        if not _query_cache_enabled(opts):
+            return {}
+        mapper = salt.cloud.Map(opts)
+        if query_type is None:
+            query_type = 'list_nodes'
+        else:
+            mapper.opts['selected_query_option'] = query_type
+        return mapper.map_providers_parallel(query_type, refresh=True)
+
     def full_query(self, query_type='list_nodes_full'):
         '''
         Query all instance information
@@ -523,6 +578,7 @@ class Cloud(object):
         self.clouds = salt.loader.clouds(self.opts)
         self.__filter_non_working_providers()
         self.__cached_provider_queries = {}
+        self.query_cache = None
 
     def get_configured_providers(self):
         '''
@@ -657,12 +713,40 @@ class Cloud(object):
         self.__cached_provider_queries[query] = pmap
         return pmap
 
-    def map_providers_parallel(self, query='list_nodes', cached=False):
+    def _get_query_cache(self):
+        if self.query_cache is None:
+            self.query_cache = salt.cache.Cache(self.opts)
+        return self.query_cache
+
+    def _fetch_query(self, key, ttl, now):
+        '''
+        Return the nodes of a cached provider query, or None when it has not
+        been cached in the last ttl seconds
+        '''
+        try:
+            data = self._get_query_cache().fetch(QUERY_BANK, key)
+        except SaltCacheError as exc:
+            log.debug('Failed to fetch the cached query %s: %s', key, exc)
+            return None
+        if data and now - data['time'] < ttl:
+            return data['nodes']
+        return None
+
+    def _store_query(self, key, nodes, now):
+        try:
+            self._get_query_cache().store(QUERY_BANK, key, {'time': now, 'nodes': nodes})
+        except SaltCacheError as exc:
+            log.debug('Failed to cache the query %s: %s', key, exc)
+
+    def map_providers_parallel(self, query='list_nodes', cached=False, refresh=False):
         '''
         Return a mapping of what named VMs are running on what VM providers
         based on what providers are defined in the configuration and VMs
 
         Same as map_providers but query in parallel.
+
+        The providers queried in the last ``query_cache_ttl`` seconds are not
+        queried again, unless ``refresh`` is True.
         '''
         if cached is True and query in self.__cached_provider_queries:
             return self.__cached_provider_queries[query]
@@ -702,12 +786,35 @@ class Cloud(object):
         if not multiprocessing_data:
             return output
 
-        data_count = len(multiprocessing_data)
-        pool = multiprocessing.Pool(data_count < 10 and data_count or 10,
-                                    init_pool_worker)
-        parallel_pmap = enter_mainloop(_run_parallel_map_providers_query,
-                                       multiprocessing_data,
-                                       pool=pool)
+        parallel_pmap = []
+        to_query = []
+        now = time.time()
+        for data in multiprocessing_data:
+            data['ttl'] = _query_cache_ttl(self.opts, data['alias'], data['driver'])
+            nodes = None
+            if data['ttl'] > 0 and not refresh:
+                nodes = self._fetch_query(
+                    '{0}:{1}'.format(data['alias'], data['fun']), data['ttl'], now)
+            if nodes is None:
+                to_query.append(data)
+            else:
+                parallel_pmap.append((data['alias'], data['driver'], nodes))
+        multiprocessing_data = to_query
+
+        if multiprocessing_data:
+            data_count = len(multiprocessing_data)
+            pool = multiprocessing.Pool(data_count < 10 and data_count or 10,
+                                        init_pool_worker)
+            queried = enter_mainloop(_run_parallel_map_providers_query,
+                                     multiprocessing_data,
+                                     pool=pool)
+            now = time.time()
+            for data, (alias, driver, details) in zip(multiprocessing_data, queried):
+                # Failed queries return an empty tuple, they are not cached
+                if data['ttl'] > 0 and not isinstance(details, tuple):
+                    self._store_query('{0}:{1}'.format(alias, data['fun']), details, now)
+            parallel_pmap.extend(queried)
+
         for alias, driver, details in parallel_pmap:
             if not details:
                 # There's no providers details?! Skip it!
@@ -1158,6 +1265,7 @@ class Cloud(object):
         elif not processed:
             raise SaltCloudSystemExit('No machines were destroyed!')
 
+        clear_query_cache(self.opts)
         return processed
 
     def reboot(self, names):
@@ -1289,6 +1397,7 @@ class Cloud(object):
                 __active_provider_name__=':'.join([alias, driver])
             ):
                 output = self.clouds[func](vm_)
+            clear_query_cache(self.opts)
             if output is not False and 'sync_after_install' in self.opts:
                 if self.opts['sync_after_install'] not in (
                         'all', 'modules', 'states', 'grains'):
@@ -1542,6 +1651,9 @@ class Cloud(object):
                             )
                         names.remove(vm_name)
 
+        # The action may have changed the state of the VMs
+        clear_query_cache(self.opts)
+
         # Set the return information for the VMs listed in the invalid_functions dict.
         missing_vms = set()
         if invalid_functions:
@@ -2300,14 +2412,14 @@ class Map(Cloud):
             else:
                 pool_size = len(parallel_data)
             log.info('Cloud pool size: {0}'.format(pool_size))
-            output_multip = enter_mainloop(
-                _create_multiprocessing, parallel_data, pool_size=pool_size)
+            output_multip = self._create_parallel(parallel_data, dmap, pool_size)
             # We have deployed in parallel, now do start action in
             # correct order based on dependencies.
             if self.opts['start_action']:
                 actionlist = []
                 grp = -1
-                for key, val in groupby(six.itervalues(dmap['create']), lambda x: x['level']):
+                levels = sorted(six.itervalues(dmap['create']), key=lambda x: x['level'])
+                for key, val in groupby(levels, lambda x: x['level']):
                     actionlist.append([])
                     grp += 1
                     for item in val:
@@ -2334,6 +2446,74 @@ class Map(Cloud):
 
         return output
 
+    def _create_parallel(self, parallel_data, dmap, pool_size):
+        '''
+        Create the VMs in a pool of processes, each VM is started as soon as
+        the VMs it requires are created rather than once their whole
+        dependency level is
+
+        Returns the list of ``{name: output}`` in the order the VMs were
+        created.
+        '''
+        by_name = dict((data['name'], data) for data in parallel_data)
+        # name -> the VMs of this run it is waiting on
+        waiting = {}
+        # name -> the VMs waiting on it
+        dependents = {}
+        for name in by_name:
+            requires = dmap['create'][name].get('requires') or ()
+            waiting[name] = set(requires).intersection(by_name)
+            for required in waiting[name]:
+                dependents.setdefault(required, []).append(name)
+
+        pool = multiprocessing.Pool(pool_size, init_pool_worker)
+        # name -> the AsyncResult of its creation, in the order they started
+        pending = OrderedDict()
+
+        def start(name):
+            log.debug('Starting the creation of \'%s\'', name)
+            pending[name] = pool.apply_async(_create_parallel_worker, (by_name[name],))
+
+        output = []
+        # A worker killed by the system never returns its result
+        timeout = self.opts.get('parallel_create_timeout', 0)
+        deadline = time.time() + timeout
+        try:
+            for data in parallel_data:
+                if not waiting[data['name']]:
+                    start(data['name'])
+            while pending:
+                done = [name for name, result in six.iteritems(pending) if result.ready()]
+                if not done:
+                    if timeout and time.time() >= deadline:
+                        raise SaltCloudSystemExit(
+                            'The creation of {0} did not finish within {1} '
+                            'seconds'.format(', '.join(pending), timeout))
+                    next(six.itervalues(pending)).wait(1)
+                    continue
+                for name in done:
+                    try:
+                        name, ret, error = pending.pop(name).get()
+                    except Exception as exc:
+                        # The worker could not send back its result
+                        raise SaltCloudSystemExit(
+                            'Failed to create \'{0}\': {1}'.format(name, exc))
+                    if error is not None:
+                        raise SaltCloudSystemExit('Exception caught\n{0}'.format(error))
+                    output.append({name: ret})
+                    for dependent in dependents.get(name, ()):
+                        waiting[dependent].discard(name)
+                        if not waiting[dependent]:
+                            start(dependent)
+        except BaseException:
+            pool.terminate()
+            pool.join()
+            raise
+        pool.close()
+        pool.join()
+        clear_query_cache(self.opts)
+        return output
+
 
 def init_pool_worker():
     '''
@@ -2375,6 +2555,21 @@ def create_multiprocessing(parallel_data, queue=None):
     }
 
 
+def _create_parallel_worker(parallel_data):
+    '''
+    Create a VM for Map._create_parallel, returns the name of the VM, the
+    output of the creation and the error which should abort the map, if any
+    '''
+    try:
+        output = create_multiprocessing(parallel_data)
+    except Exception as exc:
+        msg = 'Caught Exception, terminating workers\nTRACE: {0}\n{1}\n'.format(
+            exc, traceback.format_exc())
+        log.error(msg)
+        return parallel_data['name'], None, msg
+    return parallel_data['name'], output[parallel_data['name']], None
+
+
 def destroy_multiprocessing(parallel_data, queue=None):
     '''
     This function will be called from another process when running a map in
@@ -550,6 +550,20 @@ VALID_OPTS = {
     # returner specified by 'event_return'
     'event_return_queue': int,
 
+    # The number of seconds an event may sit in the event_return queue before the queue is
+    # flushed regardless of its size. 0 disables time based flushes.
+    'event_return_queue_max_seconds': int,
+
+    # The number of batches which may wait on each event returner before event_return_full_policy
+    # kicks in. 0 means no limit.
+    'event_return_worker_hwm': int,
+
+    # What to do when an event returner falls behind: 'block' or 'drop'
+    'event_return_full_policy': six.string_types,
+
+    # Fire a salt/event_return/stats event every this many seconds. 0 disables the stats event.
+    'event_return_stats_interval': int,
+
     # Only forward events to an event returner if it matches one of the tags in this list
     'event_return_whitelist': list,
 
@@ -861,6 +875,10 @@ VALID_OPTS = {
     # The queue size for workers in the reactor
     'reactor_worker_hwm': int,
 
+    # Cache the renders of the reactor SLS files marked as not depending on the
+    # event data
+    'reactor_render_cache': bool,
+
     # Defines engines. See https://docs.saltstack.com/en/latest/topics/engines/
     'engines': list,
 
@@ -926,6 +944,40 @@ VALID_OPTS = {
     # The number of minutes between the minion refreshing its cache of grains
     'grains_refresh_every': int,
 
+    # The number of threads to run the grains functions on, 0 runs them one
+    # after the other
+    'grains_parallel': int,
+
+    # The number of seconds after which a grains function running in parallel
+    # is given up on
+    'grains_func_timeout': int,
+
+    # A dict of grains function globs and the number of seconds their results
+    # are cached for, across minion restarts
+    'grains_func_cache': dict,
+
+    # Keep the time each grains function took, for grains.timings
+    'grains_timings': bool,
+
+    # Send the master only the grains which changed since the last pillar
+    # request
+    'grains_delta_sync': bool,
+
+    # The number of threads the fqdns grain resolves addresses on
+    'fqdns_workers': int,
+
+    # The number of seconds after which the fqdns grain gives up resolving
+    'fqdns_timeout': int,
+
+    # The number of seconds the fqdns grain caches the names of addresses for
+    'fqdns_cache_ttl': int,
+
+    # The number of seconds the fqdns grain caches addresses without a name for
+    'fqdns_negative_cache_ttl': int,
+
+    # Interface globs whose addresses the fqdns grain does not resolve
+    'fqdns_exclude_interfaces': list,
+
     # Use lspci to gather system data for grains on a minion
     'enable_lspci': bool,
 
@@ -939,6 +991,16 @@ VALID_OPTS = {
     # Set Jinja environment options for sls templates
     'jinja_sls_env': dict,
 
+    # Reuse the compiled Jinja templates in the later renders of a process
+    'jinja_template_cache': bool,
+
+    # Keep the compiled Jinja templates in the cachedir, to be reused across
+    # processes and restarts
+    'jinja_bytecode_cache': bool,
+
+    # Load YAML templates with salt.utils.yamlloader.SaltYamlFastLoader
+    'yaml_fast_loader': bool,
+
     # If this is set to True leading spaces and tabs are stripped from the start
     # of a line to a block.
     'jinja_lstrip_blocks': bool,
@@ -967,6 +1029,10 @@ VALID_OPTS = {
     # The number of seconds to wait when the client is requesting information about running jobs
     'gather_job_timeout': int,
 
+    # Trust the running jobs minions reported within this many seconds, instead of publishing
+    # saltutil.find_job to check whether a job is still running. 0 disables the job status table.
+    'job_status_ttl': int,
+
     # The number of seconds to wait before timing out an authentication request
     'auth_timeout': int,
 
@@ -1007,6 +1073,17 @@ VALID_OPTS = {
     'ssh_scan_ports': six.string_types,
     'ssh_scan_timeout': float,
     'ssh_identities_only': bool,
+    'ssh_persist': bool,
+    'ssh_run_timeout': int,
+    'ssh_raw_async': bool,
+
+    # The time in seconds the files packed for salt-ssh state runs are shared
+    # between the targets referencing the same files, 0 disables sharing
+    'ssh_trans_tar_ttl': int,
+
+    # Cache the compiled roster until its source file changes
+    'roster_cache': bool,
+    'ssh_persist_ttl': int,
     'ssh_log_file': six.string_types,
     'ssh_config_file': six.string_types,
     'ssh_merge_pillar': bool,
@@ -1019,6 +1096,10 @@ VALID_OPTS = {
     # primarily as a mitigation technique against minion disconnects.
     'ping_interval': int,
 
+    # Instructs the minion to report its running jobs to its master(s) every n seconds, see
+    # job_status_ttl
+    'job_status_interval': int,
+
     # Instructs the salt CLI to print a summary of a minion responses before returning
     'cli_summary': bool,
 
@@ -1098,6 +1179,8 @@ VALID_OPTS = {
     'memcache_expire_seconds': int,
     # Set a memcache limit in items (bank + key) per cache storage (driver + driver_opts).
     'memcache_max_items': int,
+    # Set a memcache limit in approximate bytes per cache storage, 0 disables it.
+    'memcache_max_size': int,
     # Each time a cache storage got full cleanup all the expired items not just the oldest one.
     'memcache_full_cleanup': bool,
     # Enable collecting the memcache stats and log it on `debug` log level.
@@ -1130,6 +1213,17 @@ VALID_OPTS = {
     # to the master is attempted.
     'beacons_before_connect': bool,
 
+    # The number of threads the beacons run on, 0 runs them in the main loop
+    'beacons_workers': int,
+
+    # The number of seconds after which a beacon still running on the
+    # beacons_workers threads is reported
+    'beacons_timeout': int,
+
+    # The number of seconds the system statistics sampled for the beacons and
+    # the ps and status modules are shared for, 0 samples them on every call
+    'system_sample_period': int,
+
     # Controls whether the scheduler is set up before a connection
     # to the master is attempted.
     'scheduler_before_connect': bool,
@@ -1237,6 +1331,16 @@ DEFAULT_MINION_OPTS = {
     'grains_cache': False,
     'grains_cache_expiration': 300,
     'grains_deep_merge': False,
+    'grains_parallel': 0,
+    'grains_func_timeout': 0,
+    'grains_func_cache': {},
+    'grains_timings': False,
+    'grains_delta_sync': False,
+    'fqdns_workers': 8,
+    'fqdns_timeout': 0,
+    'fqdns_cache_ttl': 0,
+    'fqdns_negative_cache_ttl': 0,
+    'fqdns_exclude_interfaces': [],
     'conf_file': os.path.join(salt.syspaths.CONFIG_DIR, 'minion'),
     'sock_dir': os.path.join(salt.syspaths.SOCK_DIR, 'minion'),
     'sock_pool_size': 1,
@@ -1244,6 +1348,9 @@ DEFAULT_MINION_OPTS = {
     'renderer': 'jinja|yaml',
     'renderer_whitelist': [],
     'renderer_blacklist': [],
+    'jinja_template_cache': False,
+    'jinja_bytecode_cache': False,
+    'yaml_fast_loader': False,
     'random_startup_delay': 0,
     'failhard': False,
     'autoload_dynamic_modules': True,
@@ -1442,6 +1549,7 @@ DEFAULT_MINION_OPTS = {
     'reactor_refresh_interval': 60,
     'reactor_worker_threads': 10,
     'reactor_worker_hwm': 10000,
+    'reactor_render_cache': False,
     'engines': [],
     'tcp_keepalive': True,
     'tcp_keepalive_idle': 300,
@@ -1463,6 +1571,7 @@ DEFAULT_MINION_OPTS = {
     'cluster_mode': False,
     'restart_on_error': False,
     'ping_interval': 0,
+    'job_status_interval': 0,
     'username': None,
     'password': None,
     'zmq_filtering': False,
@@ -1485,6 +1594,9 @@ DEFAULT_MINION_OPTS = {
     'ssl': None,
     'multifunc_ordered': False,
     'beacons_before_connect': False,
+    'beacons_workers': 0,
+    'beacons_timeout': 0,
+    'system_sample_period': 0,
     'scheduler_before_connect': False,
     'cache': 'localfs',
     'salt_cp_chunk_size': 65536,
@@ -1715,9 +1827,14 @@ DEFAULT_MASTER_OPTS = {
     'reactor_refresh_interval': 60,
     'reactor_worker_threads': 10,
     'reactor_worker_hwm': 10000,
+    'reactor_render_cache': False,
     'engines': [],
     'event_return': '',
     'event_return_queue': 0,
+    'event_return_queue_max_seconds': 0,
+    'event_return_worker_hwm': 0,
+    'event_return_full_policy': 'block',
+    'event_return_stats_interval': 0,
     'event_return_whitelist': [],
     'event_return_blacklist': [],
     'event_match_type': 'startswith',
@@ -1761,6 +1878,9 @@ DEFAULT_MASTER_OPTS = {
     'syndic_wait': 5,
     'jinja_env': {},
     'jinja_sls_env': {},
+    'jinja_template_cache': False,
+    'jinja_bytecode_cache': False,
+    'yaml_fast_loader': False,
     'jinja_lstrip_blocks': False,
     'jinja_trim_blocks': False,
     'tcp_keepalive': True,
@@ -1771,6 +1891,7 @@ DEFAULT_MASTER_OPTS = {
     'keysize': 2048,
     'transport': 'zeromq',
     'gather_job_timeout': 10,
+    'job_status_ttl': 0,
     'syndic_event_forward_timeout': 0.5,
     'syndic_jid_forward_cache_hwm': 100,
     'regen_thin': False,
@@ -1784,6 +1905,12 @@ DEFAULT_MASTER_OPTS = {
     'ssh_scan_ports': '22',
     'ssh_scan_timeout': 0.01,
     'ssh_identities_only': False,
+    'ssh_persist': False,
+    'ssh_run_timeout': 0,
+    'ssh_raw_async': False,
+    'ssh_trans_tar_ttl': 0,
+    'roster_cache': False,
+    'ssh_persist_ttl': 60,
     'ssh_log_file': os.path.join(salt.syspaths.LOGS_DIR, 'ssh'),
     'ssh_config_file': os.path.join(salt.syspaths.HOME_DIR, '.ssh', 'config'),
     'cluster_mode': False,
@@ -1809,6 +1936,7 @@ DEFAULT_MASTER_OPTS = {
     'cache': 'localfs',
     'memcache_expire_seconds': 0,
     'memcache_max_items': 1024,
+    'memcache_max_size': 0,
     'memcache_full_cleanup': False,
     'memcache_debug': False,
     'thin_extra_mods': '',
@@ -1872,6 +2000,8 @@ DEFAULT_CLOUD_OPTS = {
     'script': 'bootstrap-salt',
     'start_action': None,
     'enable_hard_maps': False,
+    'query_cache_ttl': 0,
+    'parallel_create_timeout': 3600,
     'delete_sshkeys': False,
     # Custom deploy scripts
     'deploy_scripts_search_path': 'cloud.deploy.d',
@@ -606,12 +606,8 @@ class RemoteFuncs(object):
                 greedy=False
                 )
         minions = _res['minions']
-        for minion in minions:
-            fdata = self.cache.fetch('minions/{0}'.format(minion), 'mine')
-
-            if not isinstance(fdata, dict):
-                continue
-
+        mine_data = salt.utils.minions.fetch_mine(self.cache, minions, functions_allowed)
+        for minion, fdata in six.iteritems(mine_data):
             if not _ret_dict and functions_allowed and functions_allowed[0] in fdata:
                 ret[minion] = fdata.get(functions_allowed[0])
             elif _ret_dict:
@@ -629,13 +625,20 @@ class RemoteFuncs(object):
                 return False
         if self.opts.get('minion_data_cache', False) or self.opts.get('enforce_mine_cache', False):
             cbank = 'minions/{0}'.format(load['id'])
-            ckey = 'mine'
-            if not load.get('clear', False):
-                data = self.cache.fetch(cbank, ckey)
+            mbank = salt.utils.minions.mine_bank(load['id'])
+            if load.get('clear', False):
+                self.cache.flush(mbank)
+                self.cache.flush(cbank, 'mine')
+            elif self.cache.contains(cbank, 'mine'):
+                # Move the mine stored before per-function storage
+                data = self.cache.fetch(cbank, 'mine')
                 if isinstance(data, dict):
-                    data.update(load['data'])
-                    load['data'] = data
-            self.cache.store(cbank, ckey, load['data'])
+                    for fun in data:
+                        if fun not in load['data']:
+                            self.cache.store(mbank, fun, data[fun])
+                self.cache.flush(cbank, 'mine')
+            for fun in load['data']:
+                self.cache.store(mbank, fun, load['data'][fun])
         return True
 
     def _mine_delete(self, load):
@@ -648,12 +651,14 @@ class RemoteFuncs(object):
             cbank = 'minions/{0}'.format(load['id'])
             ckey = 'mine'
             try:
-                data = self.cache.fetch(cbank, ckey)
-                if not isinstance(data, dict):
-                    return False
-                if load['fun'] in data:
-                    del data[load['fun']]
-                    self.cache.store(cbank, ckey, data)
+                self.cache.flush(salt.utils.minions.mine_bank(load['id']), load['fun'])
+                if self.cache.contains(cbank, ckey):
+                    data = self.cache.fetch(cbank, ckey)
+                    if not isinstance(data, dict):
+                        return False
+                    if load['fun'] in data:
+                        del data[load['fun']]
+                        self.cache.store(cbank, ckey, data)
             except OSError:
                 return False
         return True
@@ -665,7 +670,8 @@ class RemoteFuncs(object):
         if not skip_verify and 'id' not in load:
             return False
         if self.opts.get('minion_data_cache', False) or self.opts.get('enforce_mine_cache', False):
-            return self.cache.flush('minions/{0}'.format(load['id']), 'mine')
+            flushed = self.cache.flush(salt.utils.minions.mine_bank(load['id']))
+            return self.cache.flush('minions/{0}'.format(load['id']), 'mine') or flushed
         return True
 
     def _file_recv(self, load):
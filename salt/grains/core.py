@@ -16,9 +16,12 @@ import os
 import socket
 import sys
 import re
+import time
+import fnmatch
 import platform
 import logging
 import locale
+import threading
 import uuid
 import zlib
 from errno import EACCES, EPERM
@@ -55,7 +58,9 @@ else:
 # Import salt libs
 import salt.exceptions
 import salt.log
+import salt.payload
 import salt.utils.args
+import salt.utils.data
 import salt.utils.dns
 import salt.utils.files
 import salt.utils.network
@@ -65,7 +70,7 @@ import salt.utils.platform
 import salt.utils.stringutils
 import salt.utils.versions
 from salt.ext import six
-from salt.ext.six.moves import range
+from salt.ext.six.moves import queue, range
 
 if salt.utils.platform.is_windows():
     import salt.utils.win_osinfo
@@ -2164,10 +2169,113 @@ def append_domain():
     return grain
 
 
+def _reverse_resolve(ip):
+    '''
+    Return the FQDN of an address, or None, and whether the answer can be
+    cached
+    '''
+    err_message = 'Exception during resolving address: %s'
+    try:
+        return socket.getfqdn(socket.gethostbyaddr(ip)[0]), True
+    except socket.herror as err:
+        if err.errno == 0:
+            # No FQDN for this IP address, so we don't need to know this all the time.
+            log.debug("Unable to resolve address %s: %s", ip, err)
+        else:
+            log.error(err_message, err)
+        # Only an address known to have no name (HOST_NOT_FOUND) can be
+        # cached, other errors such as TRY_AGAIN are transient
+        return None, err.errno in (0, 1)
+    except (socket.error, socket.gaierror, socket.timeout) as err:
+        log.error(err_message, err)
+    return None, False
+
+
+def _reverse_resolve_all(addresses, workers, timeout):
+    '''
+    Reverse resolve the addresses on ``workers`` threads, giving up on the
+    addresses not resolved within ``timeout`` seconds. Returns a dict of
+    the resolved addresses and their ``(fqdn, cacheable)`` answers.
+    '''
+    if workers < 2 or len(addresses) < 2:
+        return dict((ip, _reverse_resolve(ip)) for ip in addresses)
+
+    todo = queue.Queue()
+    done = queue.Queue()
+    for ip in addresses:
+        todo.put(ip)
+
+    def _worker():
+        while True:
+            try:
+                ip = todo.get_nowait()
+            except queue.Empty:
+                return
+            done.put((ip, _reverse_resolve(ip)))
+
+    for _ in range(min(workers, len(addresses))):
+        thread = threading.Thread(target=_worker, name='fqdns-resolver')
+        thread.daemon = True
+        thread.start()
+
+    deadline = time.time() + timeout if timeout else None
+    ret = {}
+    while len(ret) < len(addresses):
+        wait = None
+        if deadline is not None:
+            wait = deadline - time.time()
+            if wait <= 0:
+                break
+        try:
+            ip, answer = done.get(timeout=wait)
+        except queue.Empty:
+            break
+        ret[ip] = answer
+    if len(ret) < len(addresses):
+        log.warning('Gave up resolving %s after %s seconds',
+                    ', '.join(sorted(set(addresses) - set(ret))), timeout)
+    return ret
+
+
+def _read_fqdns_cache(cfn):
+    '''
+    Return the reverse DNS answers cached by the fqdns grain
+    '''
+    if not os.path.isfile(cfn):
+        return {}
+    try:
+        serial = salt.payload.Serial(__opts__)
+        with salt.utils.files.fopen(cfn, 'rb') as fp_:
+            cache = salt.utils.data.decode(serial.load(fp_))
+    except Exception as exc:
+        log.debug('Unable to read fqdns cache %s: %s', cfn, exc)
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_fqdns_cache(cfn, cache):
+    '''
+    Store the reverse DNS answers of the fqdns grain
+    '''
+    try:
+        serial = salt.payload.Serial(__opts__)
+        with salt.utils.files.set_umask(0o077):
+            with salt.utils.files.fopen(cfn, 'w+b') as fp_:
+                serial.dump(cache, fp_)
+    except Exception as exc:
+        log.debug('Unable to write fqdns cache %s: %s', cfn, exc)
+
+
 def fqdns():
     '''
     Return all known FQDNs for the system by enumerating all interfaces and
     then trying to reverse resolve them (excluding 'lo' interface).
+
+    The addresses are resolved concurrently on ``fqdns_workers`` threads,
+    within ``fqdns_timeout`` seconds. Answers are cached in the minion
+    cachedir for ``fqdns_cache_ttl`` seconds, or ``fqdns_negative_cache_ttl``
+    seconds for addresses without a name. The addresses of the interfaces
+    matching the ``fqdns_exclude_interfaces`` globs are not resolved.
     '''
     # Provides:
     # fqdns
@@ -2175,22 +2283,53 @@ def fqdns():
     grains = {}
     fqdns = set()
 
+    interface_data = _INTERFACES
+    exclude = __opts__.get('fqdns_exclude_interfaces') or []
+    if exclude:
+        interface_data = dict(
+            (name, data) for name, data in six.iteritems(_get_interfaces())
+            if not any(fnmatch.fnmatch(name, glob) for glob in exclude))
+
     addresses = salt.utils.network.ip_addrs(include_loopback=False,
-                                            interface_data=_INTERFACES)
+                                            interface_data=interface_data)
     addresses.extend(salt.utils.network.ip_addrs6(include_loopback=False,
-                                                  interface_data=_INTERFACES))
-    err_message = 'Exception during resolving address: %s'
+                                                  interface_data=interface_data))
+
+    cache_ttl = __opts__.get('fqdns_cache_ttl', 0)
+    negative_cache_ttl = __opts__.get('fqdns_negative_cache_ttl', 0)
+    cfn = None
+    cache = {}
+    if (cache_ttl or negative_cache_ttl) and __opts__.get('cachedir'):
+        cfn = os.path.join(__opts__['cachedir'], 'fqdns.cache.p')
+        cache = _read_fqdns_cache(cfn)
+
+    now = time.time()
+    answers = {}
+    unresolved = []
     for ip in addresses:
-        try:
-            fqdns.add(socket.getfqdn(socket.gethostbyaddr(ip)[0]))
-        except socket.herror as err:
-            if err.errno == 0:
-                # No FQDN for this IP address, so we don't need to know this all the time.
-                log.debug("Unable to resolve address %s: %s", ip, err)
-            else:
-                log.error(err_message, err)
-        except (socket.error, socket.gaierror, socket.timeout) as err:
-            log.error(err_message, err)
+        entry = cache.get(ip)
+        if entry is not None:
+            ttl = cache_ttl if entry['fqdn'] else negative_cache_ttl
+            if now - entry['time'] < ttl:
+                answers[ip] = entry['fqdn']
+                continue
+        unresolved.append(ip)
+
+    resolved = _reverse_resolve_all(unresolved,
+                                    __opts__.get('fqdns_workers', 8),
+                                    __opts__.get('fqdns_timeout', 0))
+    for ip, (fqdn, cacheable) in six.iteritems(resolved):
+        answers[ip] = fqdn
+        if cacheable:
+            cache[ip] = {'fqdn': fqdn, 'time': now}
+
+    for fqdn in six.itervalues(answers):
+        if fqdn:
+            fqdns.add(fqdn)
+
+    if cfn is not None and resolved:
+        # Only keep the addresses the host still has
+        _write_fqdns_cache(cfn, dict((ip, cache[ip]) for ip in addresses if ip in cache))
 
     grains['fqdns'] = sorted(list(fqdns))
     return grains
@@ -10,7 +10,9 @@ from __future__ import absolute_import, print_function, unicode_literals
 import os
 import re
 import sys
+import copy
 import time
+import fnmatch
 import logging
 import inspect
 import tempfile
@@ -24,6 +26,7 @@ from zipimport import zipimporter
 import salt.config
 import salt.defaults.events
 import salt.defaults.exitcodes
+import salt.payload
 import salt.syspaths
 import salt.utils.args
 import salt.utils.context
@@ -42,7 +45,7 @@ from salt.utils.decorators import Depends
 
 # Import 3rd-party libs
 from salt.ext import six
-from salt.ext.six.moves import reload_module
+from salt.ext.six.moves import queue, reload_module
 
 if sys.version_info[:2] >= (3, 5):
     import importlib.machinery  # pylint: disable=no-name-in-module,import-error
@@ -702,6 +705,174 @@ def _load_cached_grains(opts, cfn):
         return None
 
 
+class _GrainsFuncCache(object):
+    '''
+    The results of the grains functions matched by ``grains_func_cache``,
+    and, with ``grains_timings`` set, the time each grains function took the
+    last time it ran. Both are kept in the minion cachedir so that they
+    survive restarts.
+    '''
+    def __init__(self, opts):
+        self.opts = opts
+        self.ttls = opts.get('grains_func_cache') or {}
+        self.enabled = bool(self.ttls) or opts.get('grains_timings', False)
+        self.path = os.path.join(opts['cachedir'], 'grains.funcs.p')
+        self.data = {'funcs': {}, 'timings': {}}
+        if self.ttls and os.path.isfile(self.path):
+            try:
+                serial = salt.payload.Serial(opts)
+                with salt.utils.files.fopen(self.path, 'rb') as fp_:
+                    data = salt.utils.data.decode(serial.load(fp_), preserve_tuples=True)
+                if isinstance(data, dict):
+                    self.data.update(data)
+            except Exception as exc:
+                log.debug('Unable to read grains functions cache %s: %s', self.path, exc)
+
+    def _ttl(self, key):
+        for glob, ttl in six.iteritems(self.ttls):
+            if fnmatch.fnmatch(key, glob):
+                return ttl
+        return 0
+
+    def get(self, key):
+        '''
+        Return the cached result of a grains function, or None if it has
+        to be called
+        '''
+        ttl = self._ttl(key)
+        entry = self.data['funcs'].get(key)
+        if ttl > 0 and entry and time.time() - entry['time'] < ttl:
+            log.trace('Using cached %s grain', key)
+            return copy.deepcopy(entry['ret'])
+        return None
+
+    def add(self, key, ret, duration):
+        '''
+        Record the time a grains function took, and cache its result if
+        it is configured to be
+        '''
+        self.data['timings'][key] = duration
+        log.debug('Grains function %s took %.3f seconds', key, duration)
+        if isinstance(ret, dict) and ret and self._ttl(key) > 0:
+            self.data['funcs'][key] = {'time': time.time(),
+                                       'ret': copy.deepcopy(ret)}
+
+    def write(self):
+        if not self.enabled or not os.path.isdir(self.opts['cachedir']):
+            return
+        with salt.utils.files.set_umask(0o077):
+            try:
+                serial = salt.payload.Serial(self.opts)
+                with salt.utils.files.fopen(self.path, 'w+b') as fp_:
+                    serial.dump(self.data, fp_)
+            except Exception as exc:
+                log.debug('Unable to write grains functions cache %s: %s', self.path, exc)
+
+
+class _GrainsCall(threading.Thread):
+    '''
+    Call a grains function on its own thread
+    '''
+    def __init__(self, key, func, kwargs, done):
+        super(_GrainsCall, self).__init__(name='grains-{0}'.format(key))
+        self.daemon = True
+        self.key = key
+        self.func = func
+        self.kwargs = kwargs
+        self.done = done
+        self.ret = None
+        self.exc_info = None
+        self.started = None
+
+    def start(self):
+        self.started = time.time()
+        super(_GrainsCall, self).start()
+
+    def run(self):
+        try:
+            self.ret = self.func(**self.kwargs)
+        except Exception:
+            self.exc_info = sys.exc_info()
+        self.done.put(self)
+
+
+def _call_grains_funcs(opts, calls, func_cache):
+    '''
+    Call grains functions, passed as ``(key, func, kwargs)``, and yield
+    ``(key, ret, exc_info)`` for each of them in the order they were passed.
+
+    With ``grains_parallel`` set, the functions run concurrently on that many
+    threads, and the functions still running after ``grains_func_timeout``
+    seconds are given up on. Otherwise each function is only called once the
+    result of the previous one has been consumed.
+    '''
+    workers = int(opts.get('grains_parallel') or 0)
+    timeout = opts.get('grains_func_timeout') or 0
+
+    if workers < 1:
+        for key, func, kwargs in calls:
+            ret = func_cache.get(key)
+            if ret is not None:
+                yield key, ret, None
+                continue
+            log.trace('Loading %s grain', key)
+            start = time.time()
+            exc_info = None
+            try:
+                ret = func(**kwargs)
+            except Exception:
+                exc_info = sys.exc_info()
+            func_cache.add(key, ret, time.time() - start)
+            yield key, ret, exc_info
+        return
+
+    done = queue.Queue()
+    pending = []
+    cached = {}
+    for key, func, kwargs in reversed(calls):
+        ret = func_cache.get(key)
+        if ret is not None:
+            cached[key] = ret
+        else:
+            pending.append(_GrainsCall(key, func, kwargs, done))
+    running = set()
+    finished = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            call = pending.pop()
+            log.trace('Loading %s grain', call.key)
+            call.start()
+            running.add(call)
+        wait = None
+        if timeout:
+            wait = max(0, min(call.started for call in running) + timeout - time.time())
+        try:
+            call = done.get(timeout=wait)
+        except queue.Empty:
+            call = None
+        now = time.time()
+        if call in running:
+            running.remove(call)
+            finished[call.key] = call
+            func_cache.add(call.key, call.ret, now - call.started)
+        if timeout:
+            for call in list(running):
+                if now - call.started >= timeout:
+                    log.warning(
+                        'Grains function %s did not return within %s '
+                        'seconds, skipping it', call.key, timeout
+                    )
+                    running.remove(call)
+                    func_cache.add(call.key, None, now - call.started)
+
+    for key, func, kwargs in calls:
+        if key in finished:
+            yield key, finished[key].ret, finished[key].exc_info
+        else:
+            # Cached, or timed out
+            yield key, cached.get(key), None
+
+
 def grains(opts, force_refresh=False, proxy=None):
     '''
     Return the functions for the dynamic grains and the values for the static
@@ -766,14 +937,11 @@ def grains(opts, force_refresh=False, proxy=None):
     funcs = grain_funcs(opts, proxy=proxy)
     if force_refresh:  # if we refresh, lets reload grain modules
         funcs.clear()
-    # Run core grains
-    for key in funcs:
-        if not key.startswith('core.'):
-            continue
-        log.trace('Loading %s grain', key)
-        ret = funcs[key]()
+    func_cache = _GrainsFuncCache(opts)
+
+    def _merge(ret):
         if not isinstance(ret, dict):
-            continue
+            return
         if blist:
             for key in list(ret):
                 for block in blist:
@@ -781,54 +949,61 @@ def grains(opts, force_refresh=False, proxy=None):
                         del ret[key]
                         log.trace('Filtering %s grain', key)
             if not ret:
-                continue
+                return
         if grains_deep_merge:
             salt.utils.dictupdate.update(grains_data, ret)
         else:
             grains_data.update(ret)
 
+    # Run core grains
+    calls = []
+    for key in funcs:
+        if not key.startswith('core.'):
+            continue
+        calls.append((key, funcs[key], {}))
+    for key, ret, exc_info in _call_grains_funcs(opts, calls, func_cache):
+        if exc_info is not None:
+            six.reraise(*exc_info)
+        _merge(ret)
+
     # Run the rest of the grains
+    calls = []
     for key in funcs:
         if key.startswith('core.') or key == '_errors':
             continue
+        # Grains are loaded too early to take advantage of the injected
+        # __proxy__ variable.  Pass an instance of that LazyLoader
+        # here instead to grains functions if the grains functions take
+        # one parameter.  Then the grains can have access to the
+        # proxymodule for retrieving information from the connected
+        # device.
         try:
-            # Grains are loaded too early to take advantage of the injected
-            # __proxy__ variable.  Pass an instance of that LazyLoader
-            # here instead to grains functions if the grains functions take
-            # one parameter.  Then the grains can have access to the
-            # proxymodule for retrieving information from the connected
-            # device.
-            log.trace('Loading %s grain', key)
             parameters = salt.utils.args.get_function_argspec(funcs[key]).args
-            kwargs = {}
-            if 'proxy' in parameters:
-                kwargs['proxy'] = proxy
-            if 'grains' in parameters:
-                kwargs['grains'] = grains_data
-            ret = funcs[key](**kwargs)
         except Exception:
-            if salt.utils.platform.is_proxy():
-                log.info('The following CRITICAL message may not be an error; the proxy may not be completely established yet.')
             log.critical(
                 'Failed to load grains defined in grain file %s in '
                 'function %s, error:\n', key, funcs[key],
                 exc_info=True
             )
             continue
-        if not isinstance(ret, dict):
+        kwargs = {}
+        if 'proxy' in parameters:
+            kwargs['proxy'] = proxy
+        if 'grains' in parameters:
+            kwargs['grains'] = grains_data
+        calls.append((key, funcs[key], kwargs))
+    for key, ret, exc_info in _call_grains_funcs(opts, calls, func_cache):
+        if exc_info is not None:
+            if salt.utils.platform.is_proxy():
+                log.info('The following CRITICAL message may not be an error; the proxy may not be completely established yet.')
+            log.critical(
+                'Failed to load grains defined in grain file %s in '
+                'function %s, error:\n', key, funcs[key],
+                exc_info=exc_info
+            )
             continue
-        if blist:
-            for key in list(ret):
-                for block in blist:
-                    if salt.utils.stringutils.expr_match(key, block):
-                        del ret[key]
-                        log.trace('Filtering %s grain', key)
-            if not ret:
-                continue
-        if grains_deep_merge:
-            salt.utils.dictupdate.update(grains_data, ret)
-        else:
-            grains_data.update(ret)
+        _merge(ret)
+    func_cache.write()
 
     if opts.get('proxy_merge_grains_in_module', True) and proxy:
         try:
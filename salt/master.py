@@ -17,6 +17,7 @@ import signal
 import stat
 import logging
 import collections
+import hashlib
 import multiprocessing
 import threading
 import salt.serializers.msgpack
@@ -30,6 +31,7 @@ from salt.utils.zeromq import zmq, ZMQDefaultLoop, install_zmq, ZMQ_VERSION_INFO
 import tornado.gen  # pylint: disable=F0401
 
 # Import salt libs
+import salt.cache
 import salt.crypt
 import salt.client
 import salt.client.ssh.client
@@ -1066,7 +1068,13 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
         end_time = time.time()
         if end_time - self.stat_clock > self.opts['master_stats_event_iter']:
             # Fire the event with the stats and wipe the tracker
-            self.aes_funcs.event.fire_event({'time': end_time - self.stat_clock, 'worker': self.name, 'stats': stats}, tagify(self.name, 'stats'))
+            self.aes_funcs.event.fire_event({'time': end_time - self.stat_clock,
+                                             'worker': self.name,
+                                             'stats': stats,
+                                             'pillar': dict(self.aes_funcs.pillar_stats),
+                                             'memcache': salt.cache.MemCache.pop_stats()},
+                                            tagify(self.name, 'stats'))
+            self.aes_funcs.pillar_stats.clear()
             self.stats = collections.defaultdict(lambda: {'mean': 0, 'latency': 0, 'runs': 0})
             self.stat_clock = end_time
 
@@ -1155,6 +1163,8 @@ class AESFuncs(object):
         self.event = salt.utils.event.get_master_event(self.opts, self.opts['sock_dir'], listen=False)
         self.serial = salt.payload.Serial(opts)
         self.ckminions = salt.utils.minions.CkMinions(opts)
+        # Counters of the minion data cache work avoided by grains deltas
+        self.pillar_stats = collections.Counter()
         # Make a client
         self.local = salt.client.get_local_client(self.opts['conf_file'])
         # Create the master minion to access the external job cache
@@ -1516,10 +1526,27 @@ class AESFuncs(object):
         :rtype: dict
         :return: The pillar data for the minion
         '''
-        if any(key not in load for key in ('id', 'grains')):
+        if 'id' not in load:
             return False
         if not salt.utils.verify.valid_id(self.opts, load['id']):
             return False
+        cached = None
+        if 'grains_delta' in load and 'grains' not in load:
+            if not self.opts.get('minion_data_cache', False):
+                log.debug('Cannot apply the grains delta of %s without the '
+                          'minion data cache, asking for the whole grains',
+                          load['id'])
+                return salt.pillar.GRAINS_RESYNC
+            cached = self.masterapi.cache.fetch('minions/{0}'.format(load['id']), 'data')
+            grains = self._apply_grains_delta(cached, load['grains_delta'])
+            if grains is None:
+                log.debug('Cannot apply the grains delta of %s, asking for '
+                          'the whole grains', load['id'])
+                return salt.pillar.GRAINS_RESYNC
+            load['grains'] = grains
+            load['grains_version'] = load['grains_delta']['version']
+        if 'grains' not in load:
+            return False
         load['grains']['id'] = load['id']
 
         pillar = salt.pillar.get_pillar(
@@ -1534,14 +1561,61 @@ class AESFuncs(object):
         data = pillar.compile_pillar()
         self.fs_.update_opts()
         if self.opts.get('minion_data_cache', False):
-            self.masterapi.cache.store('minions/{0}'.format(load['id']),
-                                       'data',
-                                       {'grains': load['grains'],
-                                        'pillar': data})
+            if 'grains_version' in load:
+                self._store_minion_data(load, data, cached)
+            else:
+                self.masterapi.cache.store('minions/{0}'.format(load['id']),
+                                           'data',
+                                           {'grains': load['grains'],
+                                            'pillar': data})
             if self.opts.get('minion_data_cache_events') is True:
                 self.event.fire_event({'Minion data cache refresh': load['id']}, tagify(load['id'], 'refresh', 'minion'))
+            if 'grains_version' in load:
+                # Tell the minion it can send grains deltas
+                data = dict(data)
+                data[salt.pillar.GRAINS_DELTA_ACCEPTED] = True
         return data
 
+    def _apply_grains_delta(self, cached, delta):
+        '''
+        Return the grains of the minion with the delta applied to the cached
+        grains, or None if the cached grains are not the ones the delta was
+        made against
+        '''
+        if not isinstance(cached, dict) or not isinstance(delta, dict):
+            return None
+        if cached.get('grains_version') is None or cached.get('grains_version') != delta.get('base'):
+            return None
+        grains = dict(cached.get('grains') or {})
+        for key in delta.get('removed', []):
+            grains.pop(key, None)
+        grains.update(delta.get('changed', {}))
+        saved = delta.get('size', 0) - len(self.serial.dumps(delta))
+        if saved > 0:
+            self.pillar_stats['grains_bytes_saved'] += saved
+        return grains
+
+    def _store_minion_data(self, load, pillar, cached=None):
+        '''
+        Store the grains and pillar of a minion sending grains versions in the
+        minion data cache, unless they did not change
+        '''
+        bank = 'minions/{0}'.format(load['id'])
+        pillar_digest = hashlib.sha256(self.serial.dumps(pillar)).hexdigest()
+        if cached is None:
+            cached = self.masterapi.cache.fetch(bank, 'data')
+        if isinstance(cached, dict) \
+                and cached.get('grains_version') == load['grains_version'] \
+                and cached.get('pillar_digest') == pillar_digest:
+            self.pillar_stats['cache_writes_skipped'] += 1
+            return
+        self.masterapi.cache.store(bank,
+                                   'data',
+                                   {'grains': load['grains'],
+                                    'pillar': pillar,
+                                    'grains_version': load['grains_version'],
+                                    'pillar_digest': pillar_digest})
+
     def _minion_event(self, load):
         '''
         Receive an event from the minion and fire it on the master event
@@ -1567,6 +1641,15 @@ class AESFuncs(object):
                 'Received minion error from [%s]: %s',
                 id_, load['data']['message']
             )
+        elif load.get('tag', '') == salt.utils.event.tagify([id_, 'jobs'], 'minion'):
+            try:
+                salt.utils.job.store_running(
+                    self.opts,
+                    id_,
+                    load.get('data', {}).get('jobs', []),
+                    cache=self.masterapi.cache)
+            except salt.exceptions.SaltCacheError as exc:
+                log.error('Could not store the running jobs of %s: %s', id_, exc)
 
         for event in load.get('events', []):
             event_data = event.get('data', {})
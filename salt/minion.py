@@ -2850,6 +2850,21 @@ class Minion(MinionBase):
             self.periodic_callbacks['ping'] = tornado.ioloop.PeriodicCallback(ping_master, ping_interval * 1000)
             self.periodic_callbacks['ping'].start()
 
+        # report the running jobs so that the master does not need to ask
+        job_status_interval = self.opts.get('job_status_interval', 0)
+        if job_status_interval > 0 and self.connected:
+            def report_running_jobs():
+                try:
+                    self._fire_master(
+                        {'jobs': salt.utils.minion.running(self.opts)},
+                        tagify([self.opts['id'], 'jobs'], 'minion'),
+                        sync=False)
+                except Exception:
+                    log.warning('Attempt to report running jobs to master failed.', exc_on_loglevel=logging.DEBUG)
+            self.periodic_callbacks['job_status'] = tornado.ioloop.PeriodicCallback(
+                report_running_jobs, job_status_interval * 1000)
+            self.periodic_callbacks['job_status'].start()
+
         # add handler to subscriber
         if hasattr(self, 'pub_channel') and self.pub_channel is not None:
             self.pub_channel.on_recv(self._handle_payload)
@@ -22,6 +22,7 @@ from functools import reduce  # pylint: disable=redefined-builtin
 
 # Import Salt libs
 from salt.ext import six
+import salt.payload
 import salt.utils.compat
 import salt.utils.data
 import salt.utils.files
@@ -805,5 +806,30 @@ def equals(key, value):
     return six.text_type(value) == six.text_type(get(key))
 
 
+def timings():
+    '''
+    .. versionadded:: Neon
+
+    Return the number of seconds each grains function took to run when the
+    grains were last collected, if :conf_minion:`grains_timings` or
+    :conf_minion:`grains_func_cache` is set. Grains returned from the
+    :conf_minion:`grains_func_cache` keep the time of their last run.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' grains.timings
+    '''
+    cfn = os.path.join(__opts__['cachedir'], 'grains.funcs.p')
+    if not os.path.isfile(cfn):
+        return {}
+    serial = salt.payload.Serial(__opts__)
+    with salt.utils.files.fopen(cfn, 'rb') as fp_:
+        data = salt.utils.data.decode(serial.load(fp_))
+    return dict((key, round(duration, 3))
+                for key, duration in six.iteritems(data.get('timings', {})))
+
+
 # Provide a jinja function call compatible get aliased as fetch
 fetch = get
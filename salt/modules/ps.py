@@ -18,6 +18,7 @@ from salt.exceptions import SaltInvocationError, CommandExecutionError
 
 # Import third party libs
 import salt.utils.decorators.path
+import salt.utils.sampling
 from salt.ext import six
 # pylint: disable=import-error
 try:
@@ -187,7 +188,7 @@ def get_pid_list():
 
         salt '*' ps.get_pid_list
     '''
-    return psutil.pids()
+    return list(salt.utils.sampling.sample(__opts__, 'pids', psutil.pids))
 
 
 def proc_info(pid, attrs=None):
@@ -431,7 +432,8 @@ def virtual_memory():
     if psutil.version_info < (0, 6, 0):
         msg = 'virtual_memory is only available in psutil 0.6.0 or greater'
         raise CommandExecutionError(msg)
-    return dict(psutil.virtual_memory()._asdict())
+    return dict(salt.utils.sampling.sample(
+        __opts__, 'virtual_memory', psutil.virtual_memory)._asdict())
 
 
 def swap_memory():
@@ -453,7 +455,8 @@ def swap_memory():
     if psutil.version_info < (0, 6, 0):
         msg = 'swap_memory is only available in psutil 0.6.0 or greater'
         raise CommandExecutionError(msg)
-    return dict(psutil.swap_memory()._asdict())
+    return dict(salt.utils.sampling.sample(
+        __opts__, 'swap_memory', psutil.swap_memory)._asdict())
 
 
 def disk_partitions(all=False):
@@ -471,8 +474,9 @@ def disk_partitions(all=False):
 
         salt '*' ps.disk_partitions
     '''
-    result = [dict(partition._asdict()) for partition in
-              psutil.disk_partitions(all)]
+    parts = salt.utils.sampling.sample(
+        __opts__, ('disk_partitions', bool(all)), psutil.disk_partitions, all)
+    result = [dict(partition._asdict()) for partition in parts]
     return result
 
 
@@ -487,7 +491,8 @@ def disk_usage(path):
 
         salt '*' ps.disk_usage /home
     '''
-    return dict(psutil.disk_usage(path)._asdict())
+    return dict(salt.utils.sampling.sample(
+        __opts__, ('disk_usage', path), psutil.disk_usage, path)._asdict())
 
 
 def disk_partition_usage(all=False):
@@ -594,9 +599,11 @@ def network_io_counters(interface=None):
         salt '*' ps.network_io_counters interface=eth0
     '''
     if not interface:
-        return dict(psutil.net_io_counters()._asdict())
+        return dict(salt.utils.sampling.sample(
+            __opts__, ('net_io_counters', False), psutil.net_io_counters)._asdict())
     else:
-        stats = psutil.net_io_counters(pernic=True)
+        stats = salt.utils.sampling.sample(
+            __opts__, ('net_io_counters', True), psutil.net_io_counters, pernic=True)
         if interface in stats:
             return dict(stats[interface]._asdict())
         else:
@@ -28,6 +28,7 @@ import salt.utils.files
 import salt.utils.network
 import salt.utils.path
 import salt.utils.platform
+import salt.utils.sampling
 import salt.utils.stringutils
 from salt.ext.six.moves import zip
 from salt.exceptions import CommandExecutionError
@@ -284,7 +285,7 @@ def loadavg():
         return _aix_loadavg()
 
     try:
-        load_avg = os.getloadavg()
+        load_avg = salt.utils.sampling.sample(__opts__, 'loadavg', os.getloadavg)
     except AttributeError:
         # Some UNIX-based operating systems do not have os.getloadavg()
         raise salt.exceptions.CommandExecutionError('status.loadavag is not available on your platform')
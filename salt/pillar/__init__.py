@@ -7,11 +7,13 @@ Render the pillar data
 from __future__ import absolute_import, print_function, unicode_literals
 import copy
 import fnmatch
+import hashlib
 import os
 import collections
 import logging
 import tornado.gen
 import sys
+import time
 import traceback
 import inspect
 
@@ -20,12 +22,14 @@ import salt.loader
 import salt.fileclient
 import salt.minion
 import salt.crypt
+import salt.payload
 import salt.transport
 import salt.utils.args
 import salt.utils.cache
 import salt.utils.crypt
 import salt.utils.data
 import salt.utils.dictupdate
+import salt.utils.stringutils
 import salt.utils.url
 from salt.exceptions import SaltClientError
 from salt.template import compile_template
@@ -41,6 +45,17 @@ from salt.ext import six
 
 log = logging.getLogger(__name__)
 
+# Returned by the master instead of the pillar when it cannot apply a grains
+# delta, the minion then sends its whole grains
+GRAINS_RESYNC = 'grains_resync'
+
+# Added by the master to the pillar it returns to a minion sending grains
+# versions, when it accepts grains deltas from the minion
+GRAINS_DELTA_ACCEPTED = '__grains_delta_accepted__'
+
+# (master URI, minion ID) -> the digests of the grains the master last received
+_GRAINS_SENT = {}
+
 
 def get_pillar(opts, grains, minion_id, saltenv=None, ext=None, funcs=None,
                pillar_override=None, pillarenv=None, extra_minion_data=None):
@@ -130,6 +145,74 @@ class RemotePillarMixin(object):
         log.trace('ext_pillar_extra_data = %s', extra_data)
         return extra_data
 
+    def _add_grains(self, load):
+        '''
+        Add the grains to the pillar request. With ``grains_delta_sync`` only
+        the grains which changed since the last request are sent.
+
+        Return the state to pass to :py:meth:`_grains_sent` once the master
+        answered.
+        '''
+        if not self.opts.get('grains_delta_sync', False):
+            load['grains'] = self.grains
+            return None
+        serial = salt.payload.Serial(self.opts)
+        digests = {}
+        size = 0
+        for key, value in six.iteritems(self.grains):
+            packed = serial.dumps(value)
+            size += len(packed)
+            digests[key] = hashlib.sha256(packed).hexdigest()
+        version = hashlib.sha256(salt.utils.stringutils.to_bytes(''.join(
+            '{0}:{1}'.format(key, digests[key]) for key in sorted(digests)))).hexdigest()
+        sent_key = (self.opts.get('master_uri'), self.minion_id)
+        sent = _GRAINS_SENT.get(sent_key)
+        if sent is None:
+            load['grains'] = self.grains
+            load['grains_version'] = version
+        else:
+            load['grains_delta'] = {
+                'base': sent['version'],
+                'version': version,
+                'changed': dict((key, self.grains[key]) for key in digests
+                                if sent['digests'].get(key) != digests[key]),
+                'removed': [key for key in sent['digests'] if key not in digests],
+                'size': size,
+            }
+        return sent_key, digests, version
+
+    def _resend_grains(self, load, ret_pillar):
+        '''
+        Return whether the grains delta was not applied by the master, in
+        which case the load is changed to carry the whole grains
+        '''
+        if 'grains_delta' not in load:
+            return False
+        if isinstance(ret_pillar, dict) and ret_pillar.get(GRAINS_DELTA_ACCEPTED):
+            return False
+        if ret_pillar == GRAINS_RESYNC:
+            log.debug('The master asked for the whole grains')
+        else:
+            log.info('The master did not apply the grains delta, sending the '
+                     'whole grains')
+        load['grains_version'] = load.pop('grains_delta')['version']
+        load['grains'] = self.grains
+        return True
+
+    @staticmethod
+    def _grains_sent(state, ret_pillar):
+        '''
+        Remember the grains the master received, when it accepts grains
+        deltas
+        '''
+        if state is None:
+            return
+        sent_key, digests, version = state
+        if isinstance(ret_pillar, dict) and ret_pillar.pop(GRAINS_DELTA_ACCEPTED, False):
+            _GRAINS_SENT[sent_key] = {'digests': digests, 'version': version}
+        else:
+            _GRAINS_SENT.pop(sent_key, None)
+
 
 class AsyncRemotePillar(RemotePillarMixin):
     '''
@@ -164,7 +247,6 @@ class AsyncRemotePillar(RemotePillarMixin):
         Return a future which will contain the pillar data from the master
         '''
         load = {'id': self.minion_id,
-                'grains': self.grains,
                 'saltenv': self.opts['saltenv'],
                 'pillarenv': self.opts['pillarenv'],
                 'pillar_override': self.pillar_override,
@@ -173,14 +255,21 @@ class AsyncRemotePillar(RemotePillarMixin):
                 'cmd': '_pillar'}
         if self.ext:
             load['ext'] = self.ext
+        state = self._add_grains(load)
         try:
             ret_pillar = yield self.channel.crypted_transfer_decode_dictentry(
                 load,
                 dictkey='pillar',
             )
+            if self._resend_grains(load, ret_pillar):
+                ret_pillar = yield self.channel.crypted_transfer_decode_dictentry(
+                    load,
+                    dictkey='pillar',
+                )
         except Exception:
             log.exception('Exception getting pillar:')
             raise SaltClientError('Exception getting pillar.')
+        self._grains_sent(state, ret_pillar)
 
         if not isinstance(ret_pillar, dict):
             msg = ('Got a bad pillar from master, type {0}, expecting dict: '
@@ -223,7 +312,6 @@ class RemotePillar(RemotePillarMixin):
         Return the pillar data from the master
         '''
         load = {'id': self.minion_id,
-                'grains': self.grains,
                 'saltenv': self.opts['saltenv'],
                 'pillarenv': self.opts['pillarenv'],
                 'pillar_override': self.pillar_override,
@@ -232,9 +320,15 @@ class RemotePillar(RemotePillarMixin):
                 'cmd': '_pillar'}
         if self.ext:
             load['ext'] = self.ext
+        state = self._add_grains(load)
         ret_pillar = self.channel.crypted_transfer_decode_dictentry(load,
                                                                     dictkey='pillar',
                                                                     )
+        if self._resend_grains(load, ret_pillar):
+            ret_pillar = self.channel.crypted_transfer_decode_dictentry(load,
+                                                                        dictkey='pillar',
+                                                                        )
+        self._grains_sent(state, ret_pillar)
 
         if not isinstance(ret_pillar, dict):
             log.error(
@@ -394,6 +488,8 @@ class Pillar(object):
 
         self.ext_pillars = salt.loader.pillars(ext_pillar_opts, self.functions)
         self.ignored_pillars = {}
+        # Seconds spent merging pillar data in the current compilation
+        self.merge_time = 0
         self.pillar_override = pillar_override or {}
         if not isinstance(self.pillar_override, dict):
             self.pillar_override = {}
@@ -584,6 +680,26 @@ class Pillar(object):
 
         return tops, errors
 
+    def _merge(self, obj_a, obj_b, share=True):
+        '''
+        Merge obj_b into obj_a with the pillar merging options, and account
+        for the time it took
+
+        The data merged while compiling the pillar belongs to the
+        compilation, so by default the result shares the unchanged parts of
+        obj_a instead of deep copying it.
+        '''
+        start = time.time()
+        ret = merge(
+            obj_a,
+            obj_b,
+            self.merge_strategy,
+            self.opts.get('renderer', 'yaml'),
+            self.opts.get('pillar_merge_lists', False),
+            share=share)
+        self.merge_time += time.time() - start
+        return ret
+
     def merge_tops(self, tops):
         '''
         Cleanly merge the top files
@@ -794,12 +910,7 @@ class Pillar(object):
                                     if not self.opts.get('pillar_includes_override_sls', False):
                                         include_states.append(nstate)
                                     else:
-                                        state = merge(
-                                            state,
-                                            nstate,
-                                            self.merge_strategy,
-                                            self.opts.get('renderer', 'yaml'),
-                                            self.opts.get('pillar_merge_lists', False))
+                                        state = self._merge(state, nstate)
                                 if err:
                                     errors += err
 
@@ -813,12 +924,7 @@ class Pillar(object):
                                 if state is None:
                                     state = s
                                 else:
-                                    state = merge(
-                                        state,
-                                        s,
-                                        self.merge_strategy,
-                                        self.opts.get('renderer', 'yaml'),
-                                        self.opts.get('pillar_merge_lists', False))
+                                    state = self._merge(state, s)
         return state, mods, errors
 
     def render_pillar(self, matches, errors=None):
@@ -863,12 +969,13 @@ class Pillar(object):
                             ', '.join(["'{0}'".format(e) for e in errors])
                         )
                         continue
-                    pillar = merge(
-                        pillar,
-                        pstate,
-                        self.merge_strategy,
-                        self.opts.get('renderer', 'yaml'),
-                        self.opts.get('pillar_merge_lists', False))
+                    start = self.merge_time
+                    pillar = self._merge(pillar, pstate)
+                    log.profile(
+                        'Time (in seconds) to merge pillar sls \'%s\': %s',
+                        sls,
+                        self.merge_time - start
+                    )
 
         return pillar, errors
 
@@ -942,12 +1049,7 @@ class Pillar(object):
         ext = None
         # Bring in CLI pillar data
         if self.pillar_override:
-            pillar = merge(
-                pillar,
-                self.pillar_override,
-                self.merge_strategy,
-                self.opts.get('renderer', 'yaml'),
-                self.opts.get('pillar_merge_lists', False))
+            pillar = self._merge(pillar, self.pillar_override)
 
         for run in self.opts['ext_pillar']:
             if not isinstance(run, dict):
@@ -979,12 +1081,7 @@ class Pillar(object):
                         key, ''.join(traceback.format_tb(sys.exc_info()[2]))
                     )
             if ext:
-                pillar = merge(
-                    pillar,
-                    ext,
-                    self.merge_strategy,
-                    self.opts.get('renderer', 'yaml'),
-                    self.opts.get('pillar_merge_lists', False))
+                pillar = self._merge(pillar, ext)
                 ext = None
         return pillar, errors
 
@@ -992,6 +1089,7 @@ class Pillar(object):
         '''
         Render the pillar data and return
         '''
+        self.merge_time = 0
         top, top_errors = self.get_top()
         if ext:
             if self.opts.get('ext_pillar_first', False):
@@ -999,12 +1097,7 @@ class Pillar(object):
                 self.rend = salt.loader.render(self.opts, self.functions)
                 matches = self.top_matches(top)
                 pillar, errors = self.render_pillar(matches, errors=errors)
-                pillar = merge(
-                    self.opts['pillar'],
-                    pillar,
-                    self.merge_strategy,
-                    self.opts.get('renderer', 'yaml'),
-                    self.opts.get('pillar_merge_lists', False))
+                pillar = self._merge(self.opts['pillar'], pillar, share=False)
             else:
                 matches = self.top_matches(top)
                 pillar, errors = self.render_pillar(matches)
@@ -1020,24 +1113,20 @@ class Pillar(object):
             mopts['saltversion'] = __version__
             pillar['master'] = mopts
         if 'pillar' in self.opts and self.opts.get('ssh_merge_pillar', False):
-            pillar = merge(
-                self.opts['pillar'],
-                pillar,
-                self.merge_strategy,
-                self.opts.get('renderer', 'yaml'),
-                self.opts.get('pillar_merge_lists', False))
+            pillar = self._merge(self.opts['pillar'], pillar, share=False)
         if errors:
             for error in errors:
                 log.critical('Pillar render error: %s', error)
             pillar['_errors'] = errors
 
         if self.pillar_override:
-            pillar = merge(
-                pillar,
-                self.pillar_override,
-                self.merge_strategy,
-                self.opts.get('renderer', 'yaml'),
-                self.opts.get('pillar_merge_lists', False))
+            pillar = self._merge(pillar, self.pillar_override)
+
+        log.profile(
+            'Time (in seconds) spent merging the pillar of \'%s\': %s',
+            self.minion_id,
+            self.merge_time
+        )
 
         decrypt_errors = self.decrypt_pillar(pillar)
         if decrypt_errors:
@@ -3,6 +3,12 @@
 YAML Renderer for Salt
 
 For YAML usage information see :ref:`Understanding YAML <yaml>`.
+
+.. versionadded:: Neon
+
+    Large SLS and pillar files load several times faster when the
+    ``yaml_fast_loader`` option is set to ``True`` in the master and minion
+    configuration. The rendered data is the same.
 '''
 
 from __future__ import absolute_import, print_function, unicode_literals
@@ -16,7 +22,7 @@ from yaml.constructor import ConstructorError
 
 # Import salt libs
 import salt.utils.url
-from salt.utils.yamlloader import SaltYamlSafeLoader, load
+from salt.utils.yamlloader import SaltYamlFastLoader, SaltYamlSafeLoader, load
 from salt.utils.odict import OrderedDict
 from salt.exceptions import SaltRenderError
 from salt.ext import six
@@ -34,8 +40,13 @@ def get_yaml_loader(argline):
     '''
     Return the ordered dict yaml loader
     '''
+    if __opts__.get('yaml_fast_loader', False):
+        loader = SaltYamlFastLoader
+    else:
+        loader = SaltYamlSafeLoader
+
     def yaml_loader(*args):
-        return SaltYamlSafeLoader(*args, dictclass=OrderedDict)
+        return loader(*args, dictclass=OrderedDict)
     return yaml_loader
 
 
@@ -91,9 +91,11 @@ Any of the [groups] or direct hostnames will return.  The 'all' is special, and
 from __future__ import absolute_import, print_function, unicode_literals
 import copy
 import fnmatch
+import os
 
 # Import Salt libs
 import salt.utils.path
+import salt.utils.roster_matcher
 from salt.roster import get_roster_file
 
 CONVERSION = {
@@ -117,8 +119,21 @@ def targets(tgt, tgt_type='glob', **kwargs):
     Return the targets from the ansible inventory_file
     Default: /etc/salt/roster
     '''
-    inventory = __runner__['salt.cmd']('cmd.run', 'ansible-inventory -i {0} --list'.format(get_roster_file(__opts__)))
-    __context__['inventory'] = __utils__['json.loads'](__utils__['stringutils.to_str'](inventory))
+    def _compile(source):
+        inventory = __runner__['salt.cmd']('cmd.run', 'ansible-inventory -i {0} --list'.format(source))
+        return __utils__['json.loads'](__utils__['stringutils.to_str'](inventory))
+
+    roster_file = get_roster_file(__opts__)
+    if os.access(roster_file, os.X_OK):
+        # Dynamic inventory scripts are run every time
+        __context__['inventory'] = _compile(roster_file)
+    else:
+        # ansible-inventory also reads the variables next to the inventory
+        inventory_dir = os.path.dirname(roster_file)
+        __context__['inventory'] = salt.utils.roster_matcher.compile_roster(
+            __opts__, roster_file, _compile,
+            depends=[os.path.join(inventory_dir, 'group_vars'),
+                     os.path.join(inventory_dir, 'host_vars')])
 
     if tgt_type == 'glob':
         hosts = [host for host in _get_hosts_from_group('all') if fnmatch.fnmatch(host, tgt)]
@@ -136,7 +151,7 @@ def _get_hosts_from_group(group):
 
 
 def _get_hostvars(host):
-    hostvars = __context__['inventory']['_meta'].get('hostvars', {}).get(host, {})
+    hostvars = copy.deepcopy(__context__['inventory']['_meta'].get('hostvars', {}).get(host, {}))
     ret = copy.deepcopy(__opts__.get('roster_defaults', {}))
     for value in CONVERSION:
         if value in hostvars:
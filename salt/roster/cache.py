@@ -179,7 +179,7 @@ def _load_minion(minion_id, cache):
         6: sorted([ipaddress.IPv6Address(addr) for addr in grains.get('ipv6', [])])
     }
 
-    mine = cache.fetch('minions/{0}'.format(minion_id), 'mine')
+    mine = salt.utils.minions.fetch_mine(cache, [minion_id]).get(minion_id, {})
 
     return grains, pillar, addrs, mine
 
@@ -7,6 +7,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 # Import Salt libs
 import salt.loader
 import salt.config
+import salt.utils.roster_matcher
 from salt.ext import six
 from salt.template import compile_template
 from salt.roster import get_roster_file
@@ -22,15 +23,20 @@ def targets(tgt, tgt_type='glob', **kwargs):
     '''
     template = get_roster_file(__opts__)
 
-    rend = salt.loader.render(__opts__, {})
-    raw = compile_template(template,
-                           rend,
-                           __opts__['renderer'],
-                           __opts__['renderer_blacklist'],
-                           __opts__['renderer_whitelist'],
-                           mask_value='passw*',
-                           **kwargs)
-    conditioned_raw = {}
-    for minion in raw:
-        conditioned_raw[six.text_type(minion)] = salt.config.apply_sdb(raw[minion])
-    return __utils__['roster_matcher.targets'](conditioned_raw, tgt, tgt_type, 'ipv4')
+    def _compile(source):
+        rend = salt.loader.render(__opts__, {})
+        raw = compile_template(source,
+                               rend,
+                               __opts__['renderer'],
+                               __opts__['renderer_blacklist'],
+                               __opts__['renderer_whitelist'],
+                               mask_value='passw*',
+                               **kwargs)
+        return dict((six.text_type(minion), raw[minion]) for minion in raw)
+
+    raw = salt.utils.roster_matcher.compile_roster(__opts__, template, _compile)
+    matched = __utils__['roster_matcher.targets'](raw, tgt, tgt_type, 'ipv4')
+    # Only the matched targets need their sdb values fetched
+    for minion in matched:
+        matched[minion] = salt.config.apply_sdb(matched[minion])
+    return matched
@@ -11,11 +11,13 @@ from __future__ import absolute_import, print_function, unicode_literals
 # Import python libs
 import os
 import collections
+import copy
 import fnmatch
 import re
 
 # Import Salt libs
 import salt.utils.files
+import salt.utils.roster_matcher
 import salt.utils.stringutils
 from salt.ext import six
 
@@ -99,9 +101,12 @@ def targets(tgt, tgt_type='glob', **kwargs):
     Return the targets from the flat yaml file, checks opts for location but
     defaults to /etc/salt/roster
     '''
+    def _compile(source):
+        with salt.utils.files.fopen(source, 'r') as fp:
+            return parse_ssh_config([line.rstrip() for line in fp])
+
     ssh_config_file = _get_ssh_config_file(__opts__)
-    with salt.utils.files.fopen(ssh_config_file, 'r') as fp:
-        all_minions = parse_ssh_config([line.rstrip() for line in fp])
+    all_minions = salt.utils.roster_matcher.compile_roster(__opts__, ssh_config_file, _compile)
     rmatcher = RosterMatcher(all_minions, tgt, tgt_type)
     matched = rmatcher.targets()
     return matched
@@ -130,11 +135,10 @@ class RosterMatcher(object):
         Return minions that match via glob
         '''
         minions = {}
-        for minion in self.raw:
-            if fnmatch.fnmatch(minion, self.tgt):
-                data = self.get_data(minion)
-                if data:
-                    minions[minion] = data
+        for minion in self.raw.glob(self.tgt):
+            data = self.get_data(minion)
+            if data:
+                minions[minion] = data
         return minions
 
     def get_data(self, minion):
@@ -144,5 +148,6 @@ class RosterMatcher(object):
         if isinstance(self.raw[minion], six.string_types):
             return {'host': self.raw[minion]}
         if isinstance(self.raw[minion], dict):
-            return self.raw[minion]
+            # Do not let the caller change the cached roster
+            return copy.deepcopy(self.raw[minion])
         return False
@@ -85,6 +85,27 @@ def select_query(query_type='list_nodes_select'):
     return info
 
 
+def refresh_query_cache(query_type=None):
+    '''
+    Query the providers which have a ``query_cache_ttl`` and cache their
+    nodes, so that the salt-cloud commands run until the cache expires do not
+    have to. Schedule this on the master, more often than the
+    ``query_cache_ttl``, to keep the cache warm.
+
+    .. versionadded:: Neon
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run cloud.refresh_query_cache
+        salt-run cloud.refresh_query_cache query_type=list_nodes_full
+    '''
+    client = _get_client()
+    info = client.refresh_query_cache(query_type)
+    return info
+
+
 def profile(prof=None, instances=None, opts=None, **kwargs):
     '''
     Create a cloud vm with the given profile and instances, instances can be a
@@ -10,11 +10,14 @@ import logging
 import os
 
 # Import salt libs
+import salt.cache
 import salt.client
 import salt.payload
 import salt.utils.args
 import salt.utils.files
 import salt.utils.jid
+import salt.utils.job
+import salt.utils.minions
 import salt.minion
 import salt.returners
 
@@ -41,14 +44,36 @@ def active(display_progress=False):
     .. code-block:: bash
 
         salt-run jobs.active
+
+    .. versionchanged:: Neon
+        When :conf_master:`job_status_ttl` is set, the running jobs recently
+        reported by the minions are used, and only the other minions are
+        asked for their running jobs.
     '''
     ret = {}
-    client = salt.client.get_local_client(__opts__['conf_file'])
-    try:
-        active_ = client.cmd('*', 'saltutil.running', timeout=__opts__['timeout'])
-    except SaltClientError as client_error:
-        print(client_error)
-        return ret
+    active_ = {}
+    tgt, tgt_type = '*', 'glob'
+    if __opts__.get('job_status_ttl', 0) > 0:
+        cache = salt.cache.factory(__opts__)
+        unknown = []
+        ckminions = salt.utils.minions.CkMinions(__opts__)
+        for minion in ckminions.check_minions('*')['minions']:
+            jobs = salt.utils.job.get_running(__opts__, minion, cache=cache)
+            if jobs is None:
+                unknown.append(minion)
+            else:
+                active_[minion] = jobs
+        tgt, tgt_type = unknown, 'list'
+
+    if tgt:
+        client = salt.client.get_local_client(__opts__['conf_file'])
+        try:
+            active_.update(client.cmd(tgt, 'saltutil.running',
+                                      tgt_type=tgt_type,
+                                      timeout=__opts__['timeout']))
+        except SaltClientError as client_error:
+            print(client_error)
+            return ret
 
     if display_progress:
         __jid_event__.fire_event({
@@ -64,7 +89,7 @@ def active(display_progress=False):
                 ret[job['jid']] = _format_jid_instance(job['jid'], job)
                 ret[job['jid']].update({'Running': [{minion: job.get('pid', None)}], 'Returned': []})
             else:
-                ret[job['jid']]['Running'].append({minion: job['pid']})
+                ret[job['jid']]['Running'].append({minion: job.get('pid', None)})
 
     mminion = salt.minion.MasterMinion(__opts__)
     for jid in ret:
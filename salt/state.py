@@ -746,7 +746,8 @@ class State(object):
                     self._pillar_override,
                     self.opts.get('pillar_source_merging_strategy', 'smart'),
                     self.opts.get('renderer', 'yaml'),
-                    self.opts.get('pillar_merge_lists', False))
+                    self.opts.get('pillar_merge_lists', False),
+                    share=True)
         log.debug('Finished gathering pillar data for state run')
         self.state_con = context or {}
         self.load_modules()
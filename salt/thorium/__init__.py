@@ -21,6 +21,7 @@ import salt.cache
 import salt.state
 import salt.loader
 import salt.payload
+import salt.utils.minions
 from salt.exceptions import SaltRenderError
 
 # Import 3rd-party libs
@@ -77,8 +78,9 @@ class ThorState(salt.state.HighState):
                 minions = self.cache.list('minions')
                 if not minions:
                     return cache
+                cached = salt.utils.minions.fetch_minion_data(self.cache, minions)
                 for minion in minions:
-                    total = self.cache.fetch('minions/{0}'.format(minion), 'data')
+                    total = cached.get(minion) or {}
 
                     if 'pillar' in total:
                         if self.pillar_keys:
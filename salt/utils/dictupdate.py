@@ -77,6 +77,44 @@ def update(dest, upd, recursive_update=True, merge_lists=False):
         return dest
 
 
+def update_shared(dest, upd, merge_lists=False):
+    '''
+    Return the result of merging upd recursively into dest, like
+    ``update(copy.deepcopy(dest), upd)``, without modifying either of them
+
+    Only the dicts of dest along the keys of upd are copied, and shallowly;
+    the merged data shares everything else with dest and upd. Merging many
+    dicts one after the other into a growing result therefore does not copy
+    the whole result each time.
+
+    The merged data must not be modified in place when dest is still in
+    use.
+
+    .. versionadded:: Neon
+    '''
+    if (not isinstance(dest, Mapping)) \
+            or (not isinstance(upd, Mapping)):
+        raise TypeError('Cannot update using non-dict types in dictupdate.update_shared()')
+    ret = copy.copy(dest)
+    for key in upd:
+        val = upd[key]
+        try:
+            dest_subkey = dest.get(key, None)
+        except AttributeError:
+            dest_subkey = None
+        if isinstance(dest_subkey, Mapping) \
+                and isinstance(val, Mapping):
+            ret[key] = update_shared(dest_subkey, val, merge_lists=merge_lists)
+        elif merge_lists and isinstance(dest_subkey, list) \
+                and isinstance(val, list):
+            merged = list(dest_subkey)
+            merged.extend([x for x in val if x not in merged])
+            ret[key] = merged
+        else:
+            ret[key] = val
+    return ret
+
+
 def merge_list(obj_a, obj_b):
     ret = {}
     for key, val in six.iteritems(obj_a):
@@ -87,7 +125,9 @@ def merge_list(obj_a, obj_b):
     return ret
 
 
-def merge_recurse(obj_a, obj_b, merge_lists=False):
+def merge_recurse(obj_a, obj_b, merge_lists=False, share=False):
+    if share:
+        return update_shared(obj_a, obj_b, merge_lists=merge_lists)
     copied = copy.deepcopy(obj_a)
     return update(copied, obj_b, merge_lists=merge_lists)
 
@@ -97,14 +137,29 @@ def merge_aggregate(obj_a, obj_b):
     return _yamlex_merge_recursive(obj_a, obj_b, level=1)
 
 
-def merge_overwrite(obj_a, obj_b, merge_lists=False):
+def merge_overwrite(obj_a, obj_b, merge_lists=False, share=False):
     for obj in obj_b:
         if obj in obj_a:
             obj_a[obj] = obj_b[obj]
-    return merge_recurse(obj_a, obj_b, merge_lists=merge_lists)
+    return merge_recurse(obj_a, obj_b, merge_lists=merge_lists, share=share)
 
 
-def merge(obj_a, obj_b, strategy='smart', renderer='yaml', merge_lists=False):
+def merge(obj_a, obj_b, strategy='smart', renderer='yaml', merge_lists=False,
+          share=False):
+    '''
+    Merge obj_b into obj_a following the merging strategy, and return the
+    result
+
+    If share=True, the ``recurse`` and ``overwrite`` strategies do not deep
+    copy obj_a, the result shares the parts which obj_b does not change with
+    obj_a (see :py:func:`update_shared`). Use it when obj_a is not modified
+    in place later on, or is not used anymore, for instance when merging
+    many dicts into an accumulated result. The ``aggregate`` strategy always
+    shares the unchanged parts.
+
+    .. versionchanged:: Neon
+        The share argument was added
+    '''
     if strategy == 'smart':
         if renderer.split('|')[-1] == 'yamlex' or renderer.startswith('yamlex_'):
             strategy = 'aggregate'
@@ -114,21 +169,21 @@ def merge(obj_a, obj_b, strategy='smart', renderer='yaml', merge_lists=False):
     if strategy == 'list':
         merged = merge_list(obj_a, obj_b)
     elif strategy == 'recurse':
-        merged = merge_recurse(obj_a, obj_b, merge_lists)
+        merged = merge_recurse(obj_a, obj_b, merge_lists, share=share)
     elif strategy == 'aggregate':
         #: level = 1 merge at least root data
         merged = merge_aggregate(obj_a, obj_b)
     elif strategy == 'overwrite':
-        merged = merge_overwrite(obj_a, obj_b, merge_lists)
+        merged = merge_overwrite(obj_a, obj_b, merge_lists, share=share)
     elif strategy == 'none':
         # If we do not want to merge, there is only one pillar passed, so we can safely use the default recurse,
         # we just do not want to log an error
-        merged = merge_recurse(obj_a, obj_b)
+        merged = merge_recurse(obj_a, obj_b, share=share)
     else:
         log.warning(
             'Unknown merging strategy \'%s\', fallback to recurse',
             strategy
         )
-        merged = merge_recurse(obj_a, obj_b)
+        merged = merge_recurse(obj_a, obj_b, share=share)
 
     return merged
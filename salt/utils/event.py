@@ -54,6 +54,8 @@ from __future__ import absolute_import, unicode_literals, print_function
 
 # Import python libs
 import os
+import re
+import copy
 import time
 import fnmatch
 import hashlib
@@ -447,18 +449,32 @@ class SaltEvent(object):
             self.cpush = True
         return self.cpush
 
+    @classmethod
+    def unpack_tag(cls, raw):
+        '''
+        Split the tag from a raw event without deserializing the payload.
+
+        Returns a tuple of the tag and the still-packed event data. On Python 3
+        the data is a ``memoryview`` over ``raw`` so that events which are
+        going to be discarded never get copied or decoded.
+        '''
+        if six.PY2:
+            mtag, sep, mdata = raw.partition(TAGEND)  # split tag from data
+            return mtag, mdata
+        tagend = salt.utils.stringutils.to_bytes(TAGEND)
+        idx = raw.find(tagend)
+        if idx == -1:
+            return salt.utils.stringutils.to_str(raw), memoryview(b'')
+        mtag = salt.utils.stringutils.to_str(raw[:idx])
+        return mtag, memoryview(raw)[idx + len(tagend):]
+
     @classmethod
     def unpack(cls, raw, serial=None):
         if serial is None:
             serial = salt.payload.Serial({'serial': 'msgpack'})
 
-        if six.PY2:
-            mtag, sep, mdata = raw.partition(TAGEND)  # split tag from data
-            data = serial.loads(mdata, encoding='utf-8')
-        else:
-            mtag, sep, mdata = raw.partition(salt.utils.stringutils.to_bytes(TAGEND))  # split tag from data
-            mtag = salt.utils.stringutils.to_str(mtag)
-            data = serial.loads(mdata, encoding='utf-8')
+        mtag, mdata = cls.unpack_tag(raw)
+        data = serial.loads(mdata, encoding='utf-8')
         return mtag, data
 
     def _get_match_func(self, match_type=None):
@@ -563,8 +579,9 @@ class SaltEvent(object):
                 raw = self.subscriber.read_sync(timeout=wait)
                 if raw is None:
                     break
-                mtag, data = self.unpack(raw, self.serial)
-                ret = {'data': data, 'tag': mtag}
+                # Only the tag is needed to decide what to do with the event,
+                # defer deserializing the payload until we know we keep it.
+                mtag, mdata = self.unpack_tag(raw)
             except KeyboardInterrupt:
                 return {'tag': 'salt/event/exit', 'data': {}}
             except tornado.iostream.StreamClosedError:
@@ -575,15 +592,17 @@ class SaltEvent(object):
             except RuntimeError:
                 return None
 
-            if not match_func(ret['tag'], tag):
+            if not match_func(mtag, tag):
                 # tag not match
-                if any(pmatch_func(ret['tag'], ptag) for ptag, pmatch_func in self.pending_tags):
+                if any(pmatch_func(mtag, ptag) for ptag, pmatch_func in self.pending_tags):
+                    ret = {'data': self.serial.loads(mdata, encoding='utf-8'), 'tag': mtag}
                     log.trace('get_event() caching unwanted event = %s', ret)
                     self.pending_events.append(ret)
                 if wait:  # only update the wait timeout if we had one
                     wait = timeout_at - time.time()
                 continue
 
+            ret = {'data': self.serial.loads(mdata, encoding='utf-8'), 'tag': mtag}
             log.trace('get_event() received = %s', ret)
             return ret
         log.trace('_get_event() waited %s seconds and received nothing', wait)
@@ -1203,11 +1222,21 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
 
         self.opts = opts
         self.event_return_queue = self.opts['event_return_queue']
+        self.event_return_queue_max_seconds = self.opts.get('event_return_queue_max_seconds', 0)
+        self.event_return_worker_hwm = self.opts.get('event_return_worker_hwm', 0)
+        self.event_return_full_policy = self.opts.get('event_return_full_policy', 'block')
+        self.event_return_stats_interval = self.opts.get('event_return_stats_interval', 0)
         local_minion_opts = self.opts.copy()
         local_minion_opts['file_client'] = 'local'
         self.minion = salt.minion.MasterMinion(local_minion_opts)
         self.event_queue = []
+        self.event_queue_time = time.time()
+        self.stats_time = time.time()
         self.stop = False
+        self.pools = {}
+        self.stats = {}
+        self._whitelist = self._compile_filter(self.opts['event_return_whitelist'])
+        self._blacklist = self._compile_filter(self.opts['event_return_blacklist'])
 
     # __setstate__ and __getstate__ are only used on Windows.
     # We do this so that __init__ will be invoked on Windows in the child
@@ -1229,43 +1258,135 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
 
     def _handle_signals(self, signum, sigframe):
         # Flush and terminate
+        self._wait_for_flush()
         if self.event_queue:
-            self.flush_events()
+            self.flush_events(sync=True)
         self.stop = True
         super(EventReturn, self)._handle_signals(signum, sigframe)
 
-    def flush_events(self):
+    @staticmethod
+    def _compile_filter(patterns):
+        '''
+        Compile a list of glob patterns into a single regular expression so
+        that each event tag only needs to be matched once per list.
+        '''
+        if not patterns:
+            return None
+        return re.compile('|'.join(
+            '(?:{0})'.format(fnmatch.translate(pattern)) for pattern in patterns))
+
+    def _returners(self):
         if isinstance(self.opts['event_return'], list):
-            # Multiple event returners
-            for r in self.opts['event_return']:
-                log.debug('Calling event returner {0}, one of many.'.format(r))
-                event_return = '{0}.event_return'.format(r)
-                self._flush_event_single(event_return)
-        else:
-            # Only a single event returner
-            log.debug('Calling event returner {0}, only one '
-                      'configured.'.format(self.opts['event_return']))
-            event_return = '{0}.event_return'.format(
-                self.opts['event_return']
-                )
-            self._flush_event_single(event_return)
+            return ['{0}.event_return'.format(r) for r in self.opts['event_return']]
+        return ['{0}.event_return'.format(self.opts['event_return'])]
+
+    def _get_pool(self, event_return):
+        '''
+        Return the flush pool for the given returner. Each returner gets a
+        single worker thread so that batches reach it in order, while a slow
+        returner does not hold up the others or the event loop.
+        '''
+        if event_return not in self.pools:
+            self.pools[event_return] = salt.utils.process.ThreadPool(
+                1, queue_size=self.event_return_worker_hwm)
+        return self.pools[event_return]
+
+    def _get_stats(self, event_return):
+        return self.stats.setdefault(event_return, {
+            'flushed': 0,
+            'dropped': 0,
+            'errors': 0,
+            'batches_queued': 0,
+            'batches_done': 0,
+            'last_flush_time': None,
+            'last_flush_latency': None,
+        })
+
+    def flush_events(self, sync=False):
+        '''
+        Hand the queued events over to every configured event returner.
+
+        By default the batch is handed to the per-returner flush pool, when
+        ``sync`` is True the returners are called directly instead.
+        '''
+        events = list(self.event_queue)
+        for event_return in self._returners():
+            log.debug('Calling event returner %s', event_return)
+            stats = self._get_stats(event_return)
+            if sync:
+                self._flush_event_single(event_return, events)
+                continue
+            stats['batches_queued'] += 1
+            while not self._get_pool(event_return).fire_async(
+                    self._flush_event_single,
+                    args=(event_return, events),
+                    kwargs={'sync': False}):
+                if self.event_return_full_policy == 'drop':
+                    stats['batches_queued'] -= 1
+                    stats['dropped'] += len(events)
+                    log.warning(
+                        'Event returner %s is falling behind, dropping %s '
+                        'event(s). Consider tuning event_return_worker_hwm '
+                        'and/or event_return_queue.', event_return, len(events))
+                    break
+                # Backpressure: wait for the returner to catch up
+                time.sleep(0.1)
         del self.event_queue[:]
+        self.event_queue_time = time.time()
 
-    def _flush_event_single(self, event_return):
+    def _flush_event_single(self, event_return, events=None, sync=True):
+        if events is None:
+            events = self.event_queue
+        stats = self._get_stats(event_return)
+        start = time.time()
         if event_return in self.minion.returners:
             try:
-                self.minion.returners[event_return](self.event_queue)
+                self.minion.returners[event_return](events)
+                stats['flushed'] += len(events)
             except Exception as exc:
+                stats['errors'] += 1
                 log.error('Could not store events - returner \'{0}\' raised '
                           'exception: {1}'.format(event_return, exc))
                 # don't waste processing power unnecessarily on converting a
                 # potentially huge dataset to a string
                 if log.level <= logging.DEBUG:
                     log.debug('Event data that caused an exception: {0}'.format(
-                        self.event_queue))
+                        events))
         else:
             log.error('Could not store return for event(s) - returner '
                       '\'%s\' not found.', event_return)
+        stats['last_flush_time'] = time.time()
+        stats['last_flush_latency'] = stats['last_flush_time'] - start
+        if not sync:
+            stats['batches_done'] += 1
+        log.trace('Event returner %s flushed %s event(s) in %s seconds',
+                  event_return, len(events), stats['last_flush_latency'])
+
+    def _wait_for_flush(self, timeout=10):
+        '''
+        Give the flush pools up to ``timeout`` seconds to hand the batches
+        they hold to the returners
+        '''
+        timeout_at = time.time() + timeout
+        while time.time() < timeout_at:
+            if all(stats['batches_queued'] <= stats['batches_done']
+                   for stats in six.itervalues(self.stats)):
+                return True
+            time.sleep(0.1)
+        log.warning('Timed out waiting for event returners to flush their queues')
+        return False
+
+    def _fire_stats(self):
+        '''
+        Fire the event returner statistics onto the event bus
+        '''
+        returners = copy.deepcopy(self.stats)
+        for stats in six.itervalues(returners):
+            stats['pending'] = stats['batches_queued'] - stats['batches_done']
+        data = {'queue_depth': len(self.event_queue),
+                'returners': returners}
+        self.event.fire_event(data, 'salt/event_return/stats')
+        self.stats_time = time.time()
 
     def run(self):
         '''
@@ -1273,21 +1394,35 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
         '''
         salt.utils.process.appendproctitle(self.__class__.__name__)
         self.event = get_event('master', opts=self.opts, listen=True)
-        events = self.event.iter_events(full=True)
+        # Wake up at least once per time based flush so that a quiet event
+        # bus still gets its queue flushed.
+        wait = self.event_return_queue_max_seconds or 5
         self.event.fire_event({}, 'salt/event_listen/start')
         try:
-            for event in events:
-                if event['tag'] == 'salt/event/exit':
-                    self.stop = True
-                if self._filter(event):
-                    self.event_queue.append(event)
-                if len(self.event_queue) >= self.event_return_queue:
+            while True:
+                event = self.event.get_event(wait=wait, full=True)
+                if event is not None:
+                    if event['tag'] == 'salt/event/exit':
+                        self.stop = True
+                    if self._filter(event):
+                        self.event_queue.append(event)
+                too_long_in_queue = False
+                if self.event_return_queue_max_seconds > 0 and self.event_queue:
+                    if time.time() - self.event_queue_time >= self.event_return_queue_max_seconds:
+                        too_long_in_queue = True
+                if too_long_in_queue or len(self.event_queue) >= max(self.event_return_queue, 1):
                     self.flush_events()
+                elif not self.event_queue:
+                    self.event_queue_time = time.time()
+                if self.event_return_stats_interval > 0:
+                    if time.time() - self.stats_time >= self.event_return_stats_interval:
+                        self._fire_stats()
                 if self.stop:
                     break
         finally:  # flush all we have at this moment
+            self._wait_for_flush()
             if self.event_queue:
-                self.flush_events()
+                self.flush_events(sync=True)
 
     def _filter(self, event):
         '''
@@ -1296,19 +1431,11 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
         Returns True if event should be stored, else False
         '''
         tag = event['tag']
-        if self.opts['event_return_whitelist']:
-            ret = False
-        else:
-            ret = True
-        for whitelist_match in self.opts['event_return_whitelist']:
-            if fnmatch.fnmatch(tag, whitelist_match):
-                ret = True
-                break
-        for blacklist_match in self.opts['event_return_blacklist']:
-            if fnmatch.fnmatch(tag, blacklist_match):
-                ret = False
-                break
-        return ret
+        if self._whitelist is not None and not self._whitelist.match(tag):
+            return False
+        if self._blacklist is not None and self._blacklist.match(tag):
+            return False
+        return True
 
 
 class StateFire(object):
@@ -5,12 +5,18 @@ Functions for interacting with the job cache
 
 # Import Python libs
 from __future__ import absolute_import, unicode_literals
+import calendar
+import datetime
 import logging
+import time
 
 # Import Salt libs
+import salt.cache
+import salt.exceptions
 import salt.minion
 import salt.utils.jid
 import salt.utils.event
+import salt.utils.stringutils
 import salt.utils.verify
 
 log = logging.getLogger(__name__)
@@ -136,6 +142,91 @@ def store_minions(opts, jid, minions, mminion=None, syndic_id=None):
         )
 
 
+# The keys of a running job kept in the job status table
+JOB_STATUS_KEYS = ('jid', 'fun', 'arg', 'tgt', 'tgt_type', 'user', 'pid', 'metadata')
+
+
+def store_running(opts, minion_id, jobs, cache=None):
+    '''
+    Store the jobs a minion reported as running in the job status table
+    '''
+    if cache is None:
+        cache = salt.cache.factory(opts)
+    jobs = [dict((key, job[key]) for key in JOB_STATUS_KEYS if key in job)
+            for job in jobs if isinstance(job, dict) and 'jid' in job]
+    cache.store('minions/{0}'.format(minion_id),
+                'running',
+                {'time': time.time(), 'jobs': jobs})
+
+
+def get_running(opts, minion_id, cache=None, since=None):
+    '''
+    Return the jobs a minion last reported as running, or None when the
+    minion did not report within ``job_status_ttl`` seconds, or did not
+    report after ``since``
+    '''
+    ttl = opts.get('job_status_ttl', 0)
+    if not ttl:
+        return None
+    if cache is None:
+        cache = salt.cache.factory(opts)
+    try:
+        data = cache.fetch('minions/{0}'.format(minion_id), 'running')
+    except salt.exceptions.SaltCacheError:
+        return None
+    if not data or time.time() - data.get('time', 0) > ttl:
+        return None
+    if since is not None and data.get('time', 0) <= since:
+        return None
+    return data.get('jobs', [])
+
+
+def _jid_time(jid, utc=False):
+    '''
+    Return the time the jid was generated at, as a timestamp, or None
+    '''
+    try:
+        jid_dt = datetime.datetime.strptime(
+            salt.utils.stringutils.to_str(jid)[:20], '%Y%m%d%H%M%S%f')
+    except (TypeError, ValueError):
+        return None
+    if utc:
+        stamp = calendar.timegm(jid_dt.timetuple())
+    else:
+        stamp = time.mktime(jid_dt.timetuple())
+    return stamp + jid_dt.microsecond / 1e6
+
+
+def check_running(opts, jid, minions, cache=None, since=None):
+    '''
+    Check which of the given minions are running the job, using the job
+    status table
+
+    Only the reports received after ``since``, by default the time the jid
+    was generated at, are trusted. A report which does not list the job does
+    not tell the job is not running: the minion may have sent it before it
+    received the job.
+
+    Returns a tuple of the set of minions known to be running the job and the
+    set of the other minions, whose status is unknown.
+    '''
+    running = set()
+    unknown = set()
+    if since is None:
+        since = _jid_time(jid, utc=opts.get('utc_jid', False))
+        if since is None:
+            return running, set(minions)
+    if cache is None:
+        cache = salt.cache.factory(opts)
+    for minion in minions:
+        jobs = get_running(opts, minion, cache=cache, since=since)
+        if jobs is not None and any(job.get('jid') == jid for job in jobs):
+            running.add(minion)
+        else:
+            unknown.add(minion)
+    return running, unknown
+
+
 def get_retcode(ret):
     '''
     Determine a retcode for a given return
@@ -201,12 +201,9 @@ class MasterPillarUtil(object):
             return mine_data
         if not minion_ids:
             minion_ids = self.cache.list('minions')
-        for minion_id in minion_ids:
-            if not salt.utils.verify.valid_id(self.opts, minion_id):
-                continue
-            mdata = self.cache.fetch('minions/{0}'.format(minion_id), 'mine')
-            if isinstance(mdata, dict):
-                mine_data[minion_id] = mdata
+        minion_ids = [minion_id for minion_id in minion_ids
+                      if salt.utils.verify.valid_id(self.opts, minion_id)]
+        mine_data.update(salt.utils.minions.fetch_mine(self.cache, minion_ids))
         return mine_data
 
     def _get_cached_minion_data(self, *minion_ids):
@@ -220,10 +217,12 @@ class MasterPillarUtil(object):
             return grains, pillars
         if not minion_ids:
             minion_ids = self.cache.list('minions')
+        minion_ids = [minion_id for minion_id in minion_ids
+                      if salt.utils.verify.valid_id(self.opts, minion_id)]
+        fetched = self.cache.fetch_many(('minions/{0}'.format(minion_id), 'data')
+                                        for minion_id in minion_ids)
         for minion_id in minion_ids:
-            if not salt.utils.verify.valid_id(self.opts, minion_id):
-                continue
-            mdata = self.cache.fetch('minions/{0}'.format(minion_id), 'data')
+            mdata = fetched[('minions/{0}'.format(minion_id), 'data')]
             if not isinstance(mdata, dict):
                 log.warning(
                     'cache.fetch should always return a dict. ReturnedType: %s, MinionId: %s',
@@ -464,10 +463,12 @@ class MasterPillarUtil(object):
                 elif clear_grains and minion_pillar:
                     self.cache.store(bank, 'data', {'pillar': minion_pillar})
                 if clear_mine:
-                    # Delete the whole mine file
+                    # Delete the whole mine
+                    self.cache.flush(salt.utils.minions.mine_bank(minion_id))
                     self.cache.flush(bank, 'mine')
                 elif clear_mine_func is not None:
-                    # Delete a specific function from the mine file
+                    # Delete a specific function from the mine
+                    self.cache.flush(salt.utils.minions.mine_bank(minion_id), clear_mine_func)
                     mine_data = self.cache.fetch(bank, 'mine')
                     if isinstance(mine_data, dict):
                         if mine_data.pop(clear_mine_func, False):
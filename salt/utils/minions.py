@@ -296,10 +296,11 @@ class CkMinions(object):
                 return {'minions': minions,
                         'missing': []}
             minions = set(minions)
+            if greedy:
+                cminions = [id_ for id_ in cminions if id_ in minions]
+            cached = fetch_minion_data(self.cache, cminions)
             for id_ in cminions:
-                if greedy and id_ not in minions:
-                    continue
-                mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
+                mdata = cached.get(id_)
                 if mdata is None:
                     if not greedy:
                         minions.remove(id_)
@@ -395,8 +396,9 @@ class CkMinions(object):
             proto = 'ipv{0}'.format(tgt.version)
 
             minions = set(minions)
+            cached = fetch_minion_data(self.cache, cminions)
             for id_ in cminions:
-                mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
+                mdata = cached.get(id_)
                 if mdata is None:
                     if not greedy:
                         minions.remove(id_)
@@ -647,15 +649,7 @@ class CkMinions(object):
                 addrs.update(set(salt.utils.network.ip_addrs6(include_loopback=False)))
             if subset:
                 search = subset
-            for id_ in search:
-                try:
-                    mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
-                except SaltCacheError:
-                    # If a SaltCacheError is explicitly raised during the fetch operation,
-                    # permission was denied to open the cached data.p file. Continue on as
-                    # in the releases <= 2016.3. (An explicit error raise was added in PR
-                    # #35388. See issue #36867 for more information.
-                    continue
+            for id_, mdata in six.iteritems(fetch_minion_data(self.cache, search)):
                 if mdata is None:
                     continue
                 grains = mdata.get('grains', {})
@@ -1143,13 +1137,88 @@ class CkMinions(object):
         return False
 
 
+def fetch_minion_data(cache, minion_ids):
+    '''
+    Return the cached data of the minions, keyed by minion ID, reading it in a
+    single batch.
+
+    When the batch cannot be read the minions are read one by one, and those
+    whose data cannot be read are left out.
+    '''
+    minion_ids = list(minion_ids)
+    try:
+        fetched = cache.fetch_many(('minions/{0}'.format(id_), 'data')
+                                   for id_ in minion_ids)
+    except SaltCacheError:
+        ret = {}
+        for id_ in minion_ids:
+            try:
+                ret[id_] = cache.fetch('minions/{0}'.format(id_), 'data')
+            except SaltCacheError:
+                # If a SaltCacheError is explicitly raised during the fetch operation,
+                # permission was denied to open the cached data.p file. Continue on as
+                # in the releases <= 2016.3. (An explicit error raise was added in PR
+                # #35388. See issue #36867 for more information.
+                continue
+        return ret
+    return dict((bank[len('minions/'):], data)
+                for (bank, _), data in six.iteritems(fetched))
+
+
+def mine_bank(minion_id):
+    '''
+    Return the cache bank holding the mine data of a minion, with one key per
+    mine function
+    '''
+    return 'minions/{0}/mine'.format(minion_id)
+
+
+def fetch_mine(cache, minion_ids, functions=None):
+    '''
+    Return the cached mine data of the minions, keyed by minion ID and then by
+    mine function. When functions are passed, only their data is read.
+
+    The mine data of minions which have not sent it since the master was
+    upgraded to per-function mine storage is read from the whole mine of the
+    minion.
+    '''
+    minion_ids = list(minion_ids)
+    if functions is None:
+        bank_keys = []
+        for minion_id in minion_ids:
+            bank = mine_bank(minion_id)
+            bank_keys.extend((bank, fun) for fun in cache.list(bank))
+    else:
+        bank_keys = [(mine_bank(minion_id), fun)
+                     for minion_id in minion_ids
+                     for fun in functions]
+    ret = {}
+    minion_banks = dict((mine_bank(minion_id), minion_id) for minion_id in minion_ids)
+    for (bank, fun), data in six.iteritems(cache.fetch_many(bank_keys)):
+        # The drivers return an empty dict for missing keys, tell them from
+        # functions which returned an empty dict
+        if functions is None or data != {} or cache.contains(bank, fun):
+            ret.setdefault(minion_banks[bank], {})[fun] = data
+
+    legacy = [('minions/{0}'.format(minion_id), 'mine')
+              for minion_id in minion_ids if minion_id not in ret]
+    if legacy:
+        for (bank, _), data in six.iteritems(cache.fetch_many(legacy)):
+            if not isinstance(data, dict) or not data:
+                continue
+            if functions is not None:
+                data = dict((fun, data[fun]) for fun in functions if fun in data)
+            if data:
+                ret[bank[len('minions/'):]] = data
+    return ret
+
+
 def mine_get(tgt, fun, tgt_type='glob', opts=None):
     '''
     Gathers the data from the specified minions' mine, pass in the target,
     function to look up and the target type
     '''
     ret = {}
-    serial = salt.payload.Serial(opts)
     checker = CkMinions(opts)
     _res = checker.check_minions(
             tgt,
@@ -1166,14 +1235,9 @@ def mine_get(tgt, fun, tgt_type='glob', opts=None):
     else:
         return {}
 
-    for minion in minions:
-        mdata = cache.fetch('minions/{0}'.format(minion), 'mine')
-
-        if not isinstance(mdata, dict):
-            continue
-
+    for minion, mdata in six.iteritems(fetch_mine(cache, minions, functions)):
         if not _ret_dict and functions and functions[0] in mdata:
-            ret[minion] = mdata.get(functions)
+            ret[minion] = mdata.get(functions[0])
         elif _ret_dict:
             for fun in functions:
                 if fun in mdata:
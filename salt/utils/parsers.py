@@ -3068,6 +3068,23 @@ class SaltSSHOptionParser(six.with_metaclass(OptionParserMeta,
                  'the SSH client in the format used in the client configuration file. '
                  'Can be used multiple times.'
         )
+        ssh_group.add_option(
+            '--ssh-persist',
+            dest='ssh_persist',
+            default=False,
+            action='store_true',
+            help='Keep a master SSH connection open to each host, shared by '
+                 'all the SSH calls made to the host, and by the next salt-ssh '
+                 'runs until it is left unused for --ssh-persist-ttl seconds.'
+        )
+        ssh_group.add_option(
+            '--ssh-persist-ttl',
+            dest='ssh_persist_ttl',
+            default=60,
+            type=int,
+            help='How long, in seconds, the master SSH connections kept open by '
+                 '--ssh-persist stay open once unused. Default: %default.'
+        )
         self.add_option_group(ssh_group)
 
         auth_group = optparse.OptionGroup(
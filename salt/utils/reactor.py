@@ -7,9 +7,13 @@ Functions which implement running reactor jobs
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import collections
+import copy
+import datetime
 import fnmatch
 import glob
 import logging
+import os
+import re
 import time
 
 # Import salt libs
@@ -41,6 +45,13 @@ REACTOR_INTERNAL_KEYWORDS = frozenset([
     'state',
 ])
 
+# The comment line marking a reaction file whose render does not depend on
+# the event data, see the reactor_render_cache option
+REACTOR_RENDER_CACHE_MARKER = 'reactor_render_cache: True'
+# The number of renders kept by the reactor, the least recently used are
+# dropped first
+REACTOR_RENDER_CACHE_MAX = 1000
+
 
 class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.state.Compiler):
     '''
@@ -62,6 +73,11 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
         self.event = salt.utils.event.get_master_event(opts, opts['sock_dir'], listen=False)
         self.stats = collections.defaultdict(lambda: {'mean': 0, 'latency': 0, 'runs': 0})
         self.stat_clock = time.time()
+        self._matcher = None
+        # cache key -> [render time, rendered data], least recently used first
+        self._render_cache = collections.OrderedDict()
+        # reaction file -> (mtime, whether its renders can be cached)
+        self._cacheable = {}
 
     # We need __setstate__ and __getstate__ to avoid pickling errors since
     # 'self.rend' (from salt.state.Compiler) contains a function reference
@@ -90,10 +106,94 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
         end_time = time.time()
         if end_time - self.stat_clock > self.opts['master_stats_event_iter']:
             # Fire the event with the stats and wipe the tracker
-            self.event.fire_event({'time': end_time - self.stat_clock, 'worker': self.name, 'stats': stats}, tagify(self.name, 'stats'))
+            self.event.fire_event({'time': end_time - self.stat_clock,
+                                   'worker': self.name,
+                                   'backlog': self.wrap.pool.qsize(),
+                                   'stats': stats},
+                                  tagify(self.name, 'stats'))
             self.stats = collections.defaultdict(lambda: {'mean': 0, 'latency': 0, 'runs': 0})
             self.stat_clock = end_time
 
+    def _update_stats(self, key, start, data):
+        '''
+        Track the time it took to start reacting to an event and how long
+        the reaction took
+        '''
+        end_time = time.time()
+        try:
+            stamp = datetime.datetime.strptime(data['_stamp'], '%Y-%m-%dT%H:%M:%S.%f')
+            latency = start - (stamp - datetime.datetime(1970, 1, 1)).total_seconds()
+        except (KeyError, TypeError, ValueError):
+            latency = 0
+        stats = self.stats[key]
+        stats['runs'] += 1
+        stats['latency'] = (stats['latency'] * (stats['runs'] - 1) + latency) / stats['runs']
+        stats['mean'] = (stats['mean'] * (stats['runs'] - 1) + end_time - start) / stats['runs']
+        return self.stats
+
+    def _render_cache_key(self, fn_, tag):
+        '''
+        Return the key under which the rendered reaction file is cached, or
+        None if the file is not marked as independent of the event data.
+        '''
+        if not self.opts.get('reactor_render_cache', False):
+            return None
+        try:
+            mtime = os.path.getmtime(fn_)
+        except OSError:
+            return None
+        cacheable = self._cacheable.get(fn_)
+        if cacheable is None or cacheable[0] != mtime:
+            # Only read the file again when it was modified
+            cacheable = self._cacheable[fn_] = (mtime, self._is_cacheable(fn_))
+        if not cacheable[1]:
+            return None
+        return (fn_, mtime, tag)
+
+    def _get_cached_render(self, cache_key):
+        '''
+        Return the render cached under the key within the last
+        ``reactor_refresh_interval`` seconds, or None
+        '''
+        if cache_key is None:
+            return None
+        entry = self._render_cache.pop(cache_key, None)
+        if entry is None or time.time() - entry[0] > self.opts['reactor_refresh_interval']:
+            return None
+        # Most recently used
+        self._render_cache[cache_key] = entry
+        return entry[1]
+
+    def _cache_render(self, cache_key, res):
+        '''
+        Cache the render, dropping the least recently used ones beyond
+        REACTOR_RENDER_CACHE_MAX
+        '''
+        self._render_cache.pop(cache_key, None)
+        while len(self._render_cache) >= REACTOR_RENDER_CACHE_MAX:
+            self._render_cache.popitem(last=False)
+        self._render_cache[cache_key] = [time.time(), res]
+
+    @staticmethod
+    def _is_cacheable(fn_):
+        '''
+        Return True if the leading comments of the reaction file contain the
+        REACTOR_RENDER_CACHE_MARKER line
+        '''
+        try:
+            with salt.utils.files.fopen(fn_, 'r') as fp_:
+                for line in fp_:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    if not line.startswith('#'):
+                        break
+                    if line.lstrip('#').strip() == REACTOR_RENDER_CACHE_MARKER:
+                        return True
+        except (OSError, IOError):
+            pass
+        return False
+
     def render_reaction(self, glob_ref, tag, data):
         '''
         Execute the render system against a single reaction file and return
@@ -108,6 +208,12 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
             log.error('Can not render SLS %s for tag %s. File missing or not found.', glob_ref, tag)
         for fn_ in globbed_ref:
             try:
+                cache_key = self._render_cache_key(fn_, tag)
+                cached = self._get_cached_render(cache_key)
+                if cached is not None:
+                    log.trace('Using cached render of %s for tag %s', fn_, tag)
+                    react.update(copy.deepcopy(cached))
+                    continue
                 res = self.render_template(
                     fn_,
                     tag=tag,
@@ -118,40 +224,85 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
                 for name in res:
                     res[name]['__sls__'] = fn_
 
+                if cache_key is not None:
+                    self._cache_render(cache_key, copy.deepcopy(res))
                 react.update(res)
             except Exception:
                 log.exception('Failed to render "%s": ', fn_)
         return react
 
-    def list_reactors(self, tag):
+    def _read_react_map(self):
         '''
-        Take in the tag from an event and return a list of the reactors to
-        process
+        Return the reactor map, reading it from the reactor file if one is
+        configured
         '''
-        log.debug('Gathering reactors for tag %s', tag)
-        reactors = []
         if isinstance(self.opts['reactor'], six.string_types):
             try:
                 with salt.utils.files.fopen(self.opts['reactor']) as fp_:
-                    react_map = salt.utils.yaml.safe_load(fp_)
+                    return salt.utils.yaml.safe_load(fp_) or []
             except (OSError, IOError):
                 log.error('Failed to read reactor map: "%s"', self.opts['reactor'])
             except Exception:
                 log.error('Failed to parse YAML in reactor map: "%s"', self.opts['reactor'])
+            return []
+        return self.opts['reactor']
+
+    def _compile_reactors(self):
+        '''
+        Compile the tag globs of the reactor map. Returns a regex matching any
+        of the globs, used to quickly skip events nobody reacts to, and a list
+        of the individual compiled globs along with their reactor SLS files.
+
+        The compiled map is kept for ``reactor_refresh_interval`` seconds, or
+        until the reactor file changes.
+        '''
+        if isinstance(self.opts['reactor'], six.string_types):
+            try:
+                source = os.path.getmtime(self.opts['reactor'])
+            except OSError:
+                source = None
         else:
-            react_map = self.opts['reactor']
-        for ropt in react_map:
+            source = id(self.opts['reactor'])
+        if self._matcher is not None and source is not None:
+            matcher_source, compiled_at, combined, compiled = self._matcher
+            if matcher_source == source and \
+                    time.time() - compiled_at < self.opts['reactor_refresh_interval']:
+                return combined, compiled
+
+        compiled = []
+        for ropt in self._read_react_map():
             if not isinstance(ropt, dict):
                 continue
             if len(ropt) != 1:
                 continue
             key = next(six.iterkeys(ropt))
             val = ropt[key]
-            if fnmatch.fnmatch(tag, key):
-                if isinstance(val, six.string_types):
-                    reactors.append(val)
-                elif isinstance(val, list):
-                    reactors.extend(val)
+            if isinstance(val, six.string_types):
+                val = [val]
+            elif not isinstance(val, list):
+                continue
+            compiled.append((re.compile(fnmatch.translate(key)), val))
+        if compiled:
+            combined = re.compile('|'.join(
+                '(?:{0})'.format(regex.pattern) for regex, _ in compiled))
+        else:
+            combined = None
+        self._matcher = (source, time.time(), combined, compiled)
+        return combined, compiled
+
+    def list_reactors(self, tag):
+        '''
+        Take in the tag from an event and return a list of the reactors to
+        process
+        '''
+        log.debug('Gathering reactors for tag %s', tag)
+        reactors = []
+        combined, compiled = self._compile_reactors()
+        if combined is None or not combined.match(tag):
+            return reactors
+        for regex, val in compiled:
+            if regex.match(tag):
+                reactors.extend(val)
         return reactors
 
     def list_all(self):
@@ -186,6 +337,7 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
                 return {'status': False, 'comment': 'Reactor already exists.'}
 
         self.minion.opts['reactor'].append({tag: reaction})
+        self._matcher = None
         return {'status': True, 'comment': 'Reactor added.'}
 
     def delete_reactor(self, tag):
@@ -197,6 +349,7 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
             _tag = next(six.iterkeys(reactor))
             if _tag == tag:
                 self.minion.opts['reactor'].remove(reactor)
+                self._matcher = None
                 return {'status': True, 'comment': 'Reactor deleted.'}
 
         return {'status': False, 'comment': 'Reactor does not exists.'}
@@ -283,18 +436,16 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
                 reactors = self.list_reactors(data['tag'])
                 if not reactors:
                     continue
+                start = time.time()
                 chunks = self.reactions(data['tag'], data['data'], reactors)
                 if chunks:
-                    if self.opts['master_stats']:
-                        _data = data['data']
-                        start = time.time()
                     try:
                         self.call_reactions(chunks)
                     except SystemExit:
                         log.warning('Exit ignored by reactor')
 
                     if self.opts['master_stats']:
-                        stats = salt.utils.event.update_stats(self.stats, start, _data)
+                        stats = self._update_stats(','.join(reactors), start, data['data'])
                         self._post_stats(stats)
 
 
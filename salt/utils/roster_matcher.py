@@ -5,10 +5,13 @@ Roster matching by various criteria (glob, pcre, etc)
 from __future__ import absolute_import, print_function, unicode_literals
 
 # Import python libs
+import bisect
 import copy
 import fnmatch
 import functools
+import hashlib
 import logging
+import os
 import re
 
 # Try to import range from https://github.com/ytoolshed/range
@@ -21,6 +24,12 @@ except ImportError:
 # pylint: enable=import-error
 
 # Import Salt libs
+import salt.payload
+import salt.utils.atomicfile
+import salt.utils.data
+import salt.utils.files
+import salt.utils.path
+import salt.utils.stringutils
 from salt.ext import six
 
 
@@ -32,6 +41,173 @@ def targets(conditioned_raw, tgt, tgt_type, ipv='ipv4'):
     return rmatcher.targets()
 
 
+def _grain_match(data, tgt):
+    if not isinstance(data, dict) or not isinstance(data.get('grains'), dict):
+        return False
+    return salt.utils.data.subdict_match(data['grains'], tgt)
+
+
+class CompiledRoster(dict):
+    '''
+    Roster data, with the indexes used to match targets built the first time
+    they are needed
+    '''
+    def __init__(self, *args, **kwargs):
+        super(CompiledRoster, self).__init__(*args, **kwargs)
+        self._names = None
+        self._grains = None
+
+    def glob(self, tgt):
+        '''
+        Return the minions matching the glob, only the minions sharing the
+        literal prefix of the glob are matched against it
+        '''
+        prefix = re.split(r'[*?[]', tgt, 1)[0]
+        if prefix == tgt:
+            return [tgt] if tgt in self else []
+        if self._names is None:
+            self._names = sorted(self)
+        start = bisect.bisect_left(self._names, prefix)
+        candidates = []
+        for name in self._names[start:]:
+            if not name.startswith(prefix):
+                break
+            candidates.append(name)
+        return fnmatch.filter(candidates, tgt)
+
+    def grain(self, tgt):
+        '''
+        Return the minions whose roster grains match, ``key:value`` targets
+        on a top level grain with a literal value are looked up in an index
+        '''
+        key, _, value = tgt.partition(':')
+        if not value or ':' in value or re.search(r'[*?[]', value):
+            return [minion for minion in self if _grain_match(self[minion], tgt)]
+        if self._grains is None:
+            self._grains = {}
+            for minion, data in six.iteritems(self):
+                if not isinstance(data, dict) or not isinstance(data.get('grains'), dict):
+                    continue
+                for gkey, gval in six.iteritems(data['grains']):
+                    if isinstance(gval, list):
+                        vals = gval
+                    elif isinstance(gval, dict):
+                        vals = list(gval)
+                    else:
+                        vals = [gval]
+                    index = self._grains.setdefault(gkey, {})
+                    for val in vals:
+                        if not isinstance(val, (dict, list)):
+                            index.setdefault(six.text_type(val).lower(), set()).add(minion)
+        # subdict_match compares values case insensitively
+        return list(self._grains.get(key, {}).get(value.lower(), ()))
+
+
+def _compile(source, compile_fn):
+    data = compile_fn(source)
+    if not isinstance(data, dict):
+        # Nothing to index
+        return data
+    return CompiledRoster(data)
+
+
+def _source_files(source, depends):
+    '''
+    Return the source file followed by the files found in the ``depends``
+    files and directories
+    '''
+    files = [source]
+    for path in depends:
+        if os.path.isdir(path):
+            for root, dirs, names in salt.utils.path.os_walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+def _source_stamp(source, depends=()):
+    stamp = []
+    for path in _source_files(source, depends):
+        stat = os.stat(path)
+        stamp.append([path, stat.st_mtime, stat.st_size])
+    return stamp
+
+
+def _source_hash(source, depends=()):
+    digest = hashlib.sha256()
+    for path in _source_files(source, depends):
+        digest.update(salt.utils.stringutils.to_bytes(path))
+        with salt.utils.files.fopen(path, 'rb') as fp_:
+            digest.update(hashlib.sha256(fp_.read()).digest())
+    return digest.hexdigest()
+
+
+# source -> {'stamp': [mtime, size], 'hash': sha256, 'data': CompiledRoster}
+_COMPILED = {}
+
+
+def compile_roster(opts, source, compile_fn, depends=()):
+    '''
+    Return the roster data compiled by ``compile_fn(source)`` as a
+    :py:class:`CompiledRoster`.
+
+    When ``roster_cache`` is enabled, the compiled data is kept in memory and
+    in the master cachedir, and reused until the mtime and content of the
+    source file change. ``depends`` lists the other files and directories
+    read by ``compile_fn``, the compiled data is also compiled again when
+    they change.
+    '''
+    if not opts.get('roster_cache') or not os.path.isfile(source):
+        return _compile(source, compile_fn)
+    try:
+        stamp = _source_stamp(source, depends)
+    except OSError:
+        return _compile(source, compile_fn)
+    cached = _COMPILED.get(source)
+    cache_file = os.path.join(
+        opts['cachedir'], 'roster',
+        '{0}.p'.format(hashlib.sha1(salt.utils.stringutils.to_bytes(source)).hexdigest()))
+    serial = salt.payload.Serial(opts)
+    if cached is None and os.path.isfile(cache_file):
+        try:
+            with salt.utils.files.fopen(cache_file, 'rb') as fp_:
+                cached = serial.load(fp_)
+            cached['data'] = CompiledRoster(cached['data'])
+        except Exception as exc:
+            log.debug('Unable to read the roster cache %s: %s', cache_file, exc)
+            cached = None
+    if cached is not None:
+        if cached['stamp'] == stamp:
+            _COMPILED[source] = cached
+            return cached['data']
+        digest = _source_hash(source, depends)
+        if cached['hash'] == digest:
+            # Only touched
+            cached['stamp'] = stamp
+            _COMPILED[source] = cached
+            return cached['data']
+    else:
+        digest = _source_hash(source, depends)
+    log.debug('Compiling roster %s', source)
+    data = _compile(source, compile_fn)
+    if not isinstance(data, CompiledRoster):
+        return data
+    cached = {'stamp': stamp, 'hash': digest, 'data': data}
+    _COMPILED[source] = cached
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with salt.utils.atomicfile.atomic_open(cache_file, 'wb') as fp_:
+            serial.dump(
+                {'stamp': stamp, 'hash': digest, 'data': dict(cached['data'])}, fp_)
+    except (IOError, OSError) as exc:
+        log.debug('Unable to write the roster cache %s: %s', cache_file, exc)
+    return cached['data']
+
+
 def _tgt_set(tgt):
     '''
     Return the tgt as a set of literal names
@@ -53,6 +229,9 @@ class RosterMatcher(object):
         self.tgt_type = tgt_type
         self.raw = raw
         self.ipv = ipv
+        # This module is also loaded through the loader, under another name,
+        # so do not rely on isinstance
+        self.compiled = hasattr(raw, 'glob') and hasattr(raw, 'grain')
 
     def targets(self):
         '''
@@ -78,6 +257,8 @@ class RosterMatcher(object):
         '''
         Return minions that match via glob
         '''
+        if self.compiled:
+            return self._ret_minions(lambda raw: raw.glob(self.tgt))
         fnfilter = functools.partial(fnmatch.filter, pat=self.tgt)
         return self._ret_minions(fnfilter)
 
@@ -94,7 +275,7 @@ class RosterMatcher(object):
         Return minions that match via list
         '''
         tgt = _tgt_set(self.tgt)
-        return self._ret_minions(tgt.intersection)
+        return self._ret_minions(lambda raw: [minion for minion in tgt if minion in raw])
 
     def ret_nodegroup_minions(self):
         '''
@@ -103,7 +284,16 @@ class RosterMatcher(object):
         '''
         nodegroup = __opts__.get('ssh_list_nodegroups', {}).get(self.tgt, [])
         nodegroup = _tgt_set(nodegroup)
-        return self._ret_minions(nodegroup.intersection)
+        return self._ret_minions(lambda raw: [minion for minion in nodegroup if minion in raw])
+
+    def ret_grain_minions(self):
+        '''
+        Return minions whose roster grains match
+        '''
+        if self.compiled:
+            return self._ret_minions(lambda raw: raw.grain(self.tgt))
+        return self._ret_minions(lambda raw: [
+            minion for minion in raw if _grain_match(raw[minion], self.tgt)])
 
     def ret_range_minions(self):
         '''
@@ -125,7 +315,11 @@ class RosterMatcher(object):
             ret.update({'host': self.raw[minion]})
             return ret
         elif isinstance(self.raw[minion], dict):
-            ret.update(self.raw[minion])
+            if self.compiled:
+                # Do not let the caller change the cached roster
+                ret.update(copy.deepcopy(self.raw[minion]))
+            else:
+                ret.update(self.raw[minion])
             return ret
         return False
 
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+'''
+Share samples of the system statistics between the beacons and the execution
+modules of a minion
+
+The ``ps``, ``memusage``, ``diskusage``, ``network_info``, ``load`` and
+``service`` beacons each query the system on every beacon interval, and the
+``ps`` and ``status`` execution modules do the same again on every call. When
+``system_sample_period`` is set, each statistic is collected at most once per
+period by a process and every caller is handed the same sample. Job processes
+forked from the minion start out with the samples of the minion.
+
+Callers pass the function taking the sample along with a key naming it, every
+module sampling the same statistic must use the same key:
+
+.. code-block:: python
+
+    import salt.utils.sampling
+    usage = salt.utils.sampling.sample(__opts__, 'virtual_memory',
+                                       psutil.virtual_memory)
+
+Samples are shared, callers must not modify them.
+
+.. versionadded:: Neon
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+import threading
+import time
+
+# Import 3rd-party libs
+# pylint: disable=import-error
+try:
+    import salt.utils.psutil_compat as psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+# pylint: enable=import-error
+
+log = logging.getLogger(__name__)
+
+# key -> (sample time, value)
+_SAMPLES = {}
+# key -> lock held while the key is being sampled
+_LOCKS = {}
+_LOCK = threading.Lock()
+
+
+def sample(opts, key, func, *args, **kwargs):
+    '''
+    Return ``func(*args, **kwargs)``, reusing the value sampled under ``key``
+    within the last ``system_sample_period`` seconds
+
+    Concurrent callers asking for the same key wait for a single sample to be
+    taken. Exceptions raised by ``func`` are not cached.
+    '''
+    period = (opts or {}).get('system_sample_period', 0)
+    if not period or period <= 0:
+        return func(*args, **kwargs)
+    with _LOCK:
+        lock = _LOCKS.get(key)
+        if lock is None:
+            # Keys such as disk usage paths come and go, forget the ones
+            # which are no longer sampled before adding a new one
+            _prune(time.time(), period)
+            lock = _LOCKS[key] = threading.Lock()
+    with lock:
+        entry = _SAMPLES.get(key)
+        if entry is not None and 0 <= time.time() - entry[0] < period:
+            return entry[1]
+        value = func(*args, **kwargs)
+        _SAMPLES[key] = (time.time(), value)
+        return value
+
+
+def _prune(now, period):
+    '''
+    Drop the samples older than ``period``, and the locks of the keys which
+    are not sampled
+    '''
+    for key, entry in list(_SAMPLES.items()):
+        if not 0 <= now - entry[0] < period:
+            _SAMPLES.pop(key, None)
+    for key, lock in list(_LOCKS.items()):
+        if key not in _SAMPLES and not lock.locked():
+            _LOCKS.pop(key, None)
+
+
+def clear():
+    '''
+    Drop every sample taken so far
+    '''
+    with _LOCK:
+        _SAMPLES.clear()
+
+
+def _process_names():
+    names = set()
+    for proc in psutil.process_iter():
+        try:
+            names.add(proc.name())
+        except psutil.NoSuchProcess:
+            # The process exited while we were walking the list
+            continue
+    return frozenset(names)
+
+
+def process_names(opts):
+    '''
+    Return the set of the names of the running processes
+    '''
+    return sample(opts, 'process_names', _process_names)
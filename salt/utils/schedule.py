@@ -22,6 +22,7 @@ import itertools
 import threading
 import logging
 import errno
+import heapq
 import random
 import weakref
 
@@ -153,6 +154,13 @@ class Schedule(object):
         self.schedule_returner = self.option('schedule_returner')
         # Keep track of the lowest loop interval needed in this variable
         self.loop_interval = six.MAXSIZE
+        # Jobs which have nothing to do before their next fire time are parked
+        # in a heap of (next_fire_time, name) so eval() only touches due jobs
+        self._fire_heap = []
+        self._parked = {}
+        # Parsed "when" date strings
+        self._when_cache = {}
+        self._when_cache_date = None
         if not self.standalone:
             clean_proc_dir(opts)
         if cleanup:
@@ -197,9 +205,12 @@ class Schedule(object):
                         del schedule[job][item]
         return schedule
 
-    def _check_max_running(self, func, data, opts, now):
+    def _check_max_running(self, func, data, opts, now, current_jobs=None):
         '''
         Return the schedule data structure
+
+        ``current_jobs`` may be passed to reuse a listing of the running jobs
+        taken earlier in the same evaluation of the schedule.
         '''
         # Check to see if there are other jobs with this
         # signature running.  If there are more than maxrunning
@@ -213,10 +224,8 @@ class Schedule(object):
             return data
         if 'jid_include' not in data or data['jid_include']:
             jobcount = 0
-            if self.opts['__role'] == 'master':
-                current_jobs = salt.utils.master.get_running_jobs(self.opts)
-            else:
-                current_jobs = salt.utils.minion.running(self.opts)
+            if current_jobs is None:
+                current_jobs = self._get_running_jobs()
             for job in current_jobs:
                 if 'schedule' in job:
                     log.debug(
@@ -244,6 +253,55 @@ class Schedule(object):
                             return data
         return data
 
+    def _get_running_jobs(self):
+        '''
+        Return the jobs currently running on this master or minion
+        '''
+        if self.opts['__role'] == 'master':
+            return salt.utils.master.get_running_jobs(self.opts)
+        return salt.utils.minion.running(self.opts)
+
+    def _park(self, name, data, now):
+        '''
+        Park a job until its next fire time if nothing can change for it
+        before then. Jobs using splay, ``when`` or ``run_explicit`` are
+        re-evaluated on every loop.
+        '''
+        next_fire_time = data.get('_next_fire_time')
+        if not isinstance(next_fire_time, datetime.datetime) or \
+                next_fire_time <= now:
+            return
+        if data.get('_error') or data.get('_run_on_start') or \
+                data.get('splay') or data.get('_splay'):
+            return
+        if 'when' in data or 'run_explicit' in data:
+            return
+        if '_seconds' not in data and 'cron' not in data and 'once' not in data:
+            return
+        self._parked[name] = (next_fire_time, data)
+        heapq.heappush(self._fire_heap, (next_fire_time, name))
+
+    def _unpark(self, name=None):
+        '''
+        Make eval() look at a parked job, or every job, on its next run
+        '''
+        if name is None:
+            self._parked.clear()
+            del self._fire_heap[:]
+        else:
+            self._parked.pop(name, None)
+
+    def _unpark_due(self, now):
+        '''
+        Release the parked jobs whose next fire time has come
+        '''
+        while self._fire_heap and self._fire_heap[0][0] <= now:
+            next_fire_time, name = heapq.heappop(self._fire_heap)
+            parked = self._parked.get(name)
+            # Skip the entries left behind by jobs which were re-parked
+            if parked is not None and parked[0] == next_fire_time:
+                del self._parked[name]
+
     def persist(self):
         '''
         Persist the modified schedule into <<configdir>>/<<default_include>>/_schedule.conf
@@ -286,6 +344,7 @@ class Schedule(object):
         # ensure job exists, then delete it
         if name in self.opts['schedule']:
             del self.opts['schedule'][name]
+            self._unpark(name)
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot delete job %s, it's in the pillar!", name)
 
@@ -311,6 +370,7 @@ class Schedule(object):
         self.enabled = True
         self.splay = None
         self.opts['schedule'] = {}
+        self._unpark()
 
     def delete_job_prefix(self, name, persist=True):
         '''
@@ -320,6 +380,7 @@ class Schedule(object):
         for job in list(self.opts['schedule'].keys()):
             if job.startswith(name):
                 del self.opts['schedule'][job]
+                self._unpark(job)
         for job in self._get_schedule(include_opts=False):
             if job.startswith(name):
                 log.warning("Cannot delete job %s, it's in the pillar!", job)
@@ -366,6 +427,7 @@ class Schedule(object):
         elif new_job in self.opts['schedule']:
             log.info('Updating job settings for scheduled job: %s', new_job)
             self.opts['schedule'].update(data)
+            self._unpark(new_job)
 
         else:
             log.info('Added new job %s to scheduler', new_job)
@@ -387,6 +449,7 @@ class Schedule(object):
         # ensure job exists, then enable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = True
+            self._unpark(name)
             log.info('Enabling job %s in scheduler', name)
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -407,6 +470,7 @@ class Schedule(object):
         # ensure job exists, then disable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = False
+            self._unpark(name)
             log.info('Disabling job %s in scheduler', name)
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -503,6 +567,7 @@ class Schedule(object):
         if 'schedule' in schedule:
             schedule = schedule['schedule']
         self.opts.setdefault('schedule', {}).update(schedule)
+        self._unpark()
 
     def list(self, where):
         '''
@@ -551,6 +616,7 @@ class Schedule(object):
                 self.opts['schedule'][name]['run_explicit'] = []
             self.opts['schedule'][name]['run_explicit'].append({'time': new_time,
                                                                 'time_fmt': time_fmt})
+            self._unpark(name)
 
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -575,6 +641,7 @@ class Schedule(object):
                 self.opts['schedule'][name]['skip_explicit'] = []
             self.opts['schedule'][name]['skip_explicit'].append({'time': time,
                                                                  'time_fmt': time_fmt})
+            self._unpark(name)
 
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -590,12 +657,15 @@ class Schedule(object):
         Return the next fire time for the specified job
         '''
 
-        schedule = self._get_schedule()
         _next_fire_time = None
-        if schedule:
-            _next_fire_time = schedule.get(name, {}).get('_next_fire_time', None)
-            if _next_fire_time:
-                _next_fire_time = _next_fire_time.strftime(fmt)
+        if name in self._parked:
+            _next_fire_time = self._parked[name][0]
+        else:
+            schedule = self._get_schedule()
+            if schedule:
+                _next_fire_time = schedule.get(name, {}).get('_next_fire_time', None)
+        if _next_fire_time:
+            _next_fire_time = _next_fire_time.strftime(fmt)
 
         # Fire the complete event back along with updated list of schedule
         evt = salt.utils.event.get_event('minion', opts=self.opts, listen=False)
@@ -936,6 +1006,20 @@ class Schedule(object):
                 if once < now - loop_interval:
                     data['_continue'] = True
 
+        def _parse_when(when):
+            '''
+            Parse a "when" date string, reusing the result of earlier loops
+            '''
+            # Missing date fields are filled in from the current date, so
+            # results are only good for the day
+            today = datetime.date.today()
+            if self._when_cache_date != today:
+                self._when_cache = {}
+                self._when_cache_date = today
+            if when not in self._when_cache:
+                self._when_cache[when] = dateutil_parser.parse(when)
+            return self._when_cache[when]
+
         def _handle_when(data, loop_interval):
             '''
             Handle schedule item with when
@@ -973,7 +1057,7 @@ class Schedule(object):
 
                     if not isinstance(when_, datetime.datetime):
                         try:
-                            when_ = dateutil_parser.parse(when_)
+                            when_ = _parse_when(when_)
                         except ValueError:
                             data['_error'] = ('Invalid date string {0}. '
                                               'Ignoring job {1}.'.format(i, data['name']))
@@ -1050,7 +1134,7 @@ class Schedule(object):
 
                 if not isinstance(when, datetime.datetime):
                     try:
-                        when = dateutil_parser.parse(when)
+                        when = _parse_when(when)
                     except ValueError:
                         data['_error'] = ('Invalid date string. '
                                           'Ignoring job {0}.'.format(data['name']))
@@ -1093,7 +1177,7 @@ class Schedule(object):
                 # executed before or already executed in the past.
                 try:
                     data['_next_fire_time'] = croniter.croniter(data['cron'], now).get_next(datetime.datetime)
-                    data['_next_scheduled_fire_time'] = croniter.croniter(data['cron'], now).get_next(datetime.datetime)
+                    data['_next_scheduled_fire_time'] = data['_next_fire_time']
                 except (ValueError, KeyError):
                     data['_error'] = ('Invalid cron string. '
                                       'Ignoring job {0}.'.format(data['name']))
@@ -1368,12 +1452,44 @@ class Schedule(object):
                    'skip_function',
                    'skip_during_range',
                    'splay']
+
+        if not now:
+            now = datetime.datetime.now()
+
+        time_elements = ('seconds', 'minutes', 'hours', 'days')
+        scheduling_elements = ('when', 'cron', 'once')
+
+        invalid_sched_combos = [
+            set(i) for i in itertools.combinations(scheduling_elements, 2)
+        ]
+
+        invalid_time_combos = []
+        for item in scheduling_elements:
+            all_items = itertools.chain([item], time_elements)
+            invalid_time_combos.append(
+                set(itertools.combinations(all_items, 2)))
+
+        # The running jobs are only listed once per loop, and only if a job
+        # is due
+        running_jobs = None
+
+        self._unpark_due(now)
+        evaluated = []
         for job, data in six.iteritems(schedule):
 
             # Skip anything that is a global setting
             if job in _hidden:
                 continue
 
+            # Nothing to do for this job before its next fire time
+            parked = self._parked.get(job)
+            if parked is not None:
+                if parked[1] is data:
+                    continue
+                # The job was replaced
+                del self._parked[job]
+            evaluated.append((job, data))
+
             # Clear these out between runs
             for item in ['_continue',
                          '_error',
@@ -1419,20 +1535,10 @@ class Schedule(object):
                     '_run_on_start' not in data:
                 data['_run_on_start'] = True
 
-            if not now:
-                now = datetime.datetime.now()
-
             # Used for quick lookups when detecting invalid option
             # combinations.
             schedule_keys = set(data.keys())
 
-            time_elements = ('seconds', 'minutes', 'hours', 'days')
-            scheduling_elements = ('when', 'cron', 'once')
-
-            invalid_sched_combos = [
-                set(i) for i in itertools.combinations(scheduling_elements, 2)
-            ]
-
             if any(i <= schedule_keys for i in invalid_sched_combos):
                 log.error(
                     'Unable to use "%s" options together. Ignoring.',
@@ -1440,12 +1546,6 @@ class Schedule(object):
                 )
                 continue
 
-            invalid_time_combos = []
-            for item in scheduling_elements:
-                all_items = itertools.chain([item], time_elements)
-                invalid_time_combos.append(
-                    set(itertools.combinations(all_items, 2)))
-
             if any(set(x) <= schedule_keys for x in invalid_time_combos):
                 log.error(
                     'Unable to use "%s" with "%s" options. Ignoring',
@@ -1635,10 +1735,13 @@ class Schedule(object):
 
                     if not self.standalone:
                         data['run'] = run
+                        if running_jobs is None:
+                            running_jobs = self._get_running_jobs()
                         data = self._check_max_running(func,
                                                        data,
                                                        self.opts,
-                                                       now)
+                                                       now,
+                                                       current_jobs=running_jobs)
                         run = data['run']
 
                 # Check run again, just in case _check_max_running
@@ -1660,6 +1763,10 @@ class Schedule(object):
                     elif run:
                         data['_next_fire_time'] = now + datetime.timedelta(seconds=data['_seconds'])
 
+        for job, data in evaluated:
+            if isinstance(data, dict):
+                self._park(job, data, now)
+
     def _run_job(self, func, data):
         job_dry_run = data.get('dry_run', False)
         if job_dry_run:
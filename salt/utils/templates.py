@@ -287,6 +287,104 @@ def _get_jinja_error(trace, context=None):
     return line, out
 
 
+# (environment options, template checksum) -> compiled template code, shared
+# by the renders of this process when jinja_template_cache is enabled
+_JINJA_CODE = {}
+_JINJA_CODE_MAX = 1000
+
+# cache directory -> _JinjaBytecodeCache
+_JINJA_BYTECODE_CACHES = {}
+
+
+def _jinja_folds_calls(ast):
+    '''
+    Return whether the filters or tests of the parsed template may be called
+    when it is compiled. Jinja replaces the filters and tests applied to
+    constants by their results, compiled code reused by later renders would
+    keep the values of filters such as random_hash or strftime.
+    '''
+    for node in ast.find_all((jinja2.nodes.Filter, jinja2.nodes.Test)):
+        if node.node is not None and next(node.find_all(jinja2.nodes.Name), None) is None:
+            return True
+    return False
+
+
+class _JinjaBytecodeCache(jinja2.FileSystemBytecodeCache):
+    '''
+    Bytecode cache which does not keep the code of the templates calling
+    filters or tests at compile time
+    '''
+    def get_bucket(self, environment, name, filename, source):
+        bucket = super(_JinjaBytecodeCache, self).get_bucket(
+            environment, name, filename, source)
+        bucket.source = source
+        return bucket
+
+    def set_bucket(self, bucket):
+        folds = getattr(bucket, 'folds_calls', None)
+        if folds is None:
+            folds = _jinja_folds_calls(bucket.environment.parse(bucket.source))
+        if not folds:
+            super(_JinjaBytecodeCache, self).set_bucket(bucket)
+
+
+def _get_jinja_bytecode_cache(opts):
+    '''
+    Return the bytecode cache in the cachedir, when jinja_bytecode_cache is
+    enabled
+    '''
+    if not opts.get('jinja_bytecode_cache', False) or not opts.get('cachedir'):
+        return None
+    cache_dir = os.path.join(opts['cachedir'], 'jinja')
+    if cache_dir not in _JINJA_BYTECODE_CACHES:
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir, 0o700)
+        except OSError as exc:
+            log.warning('Unable to create the Jinja bytecode cache %s: %s', cache_dir, exc)
+            return None
+        _JINJA_BYTECODE_CACHES[cache_dir] = _JinjaBytecodeCache(cache_dir)
+    return _JINJA_BYTECODE_CACHES[cache_dir]
+
+
+def _jinja_template(jinja_env, tmplstr, env_key, keep_code=False):
+    '''
+    Return the template for tmplstr. The compiled code is looked up in the
+    bytecode cache of the environment when it has one and, with keep_code, in
+    the code compiled by this process for the same environment options.
+
+    Only the code of the templates whose filters and tests are all called
+    when rendering is cached.
+    '''
+    bcc = jinja_env.bytecode_cache
+    if not keep_code and bcc is None:
+        return jinja_env.from_string(tmplstr)
+    checksum = salt.utils.hashutils.sha256_digest(tmplstr)
+    key = (env_key, checksum)
+    code = _JINJA_CODE.get(key) if keep_code else None
+    if code is None:
+        bucket = None
+        if bcc is not None:
+            bucket = bcc.get_bucket(jinja_env, '{0}:{1}'.format(env_key, checksum), None, tmplstr)
+            code = bucket.code
+        if code is None:
+            ast = jinja_env.parse(tmplstr)
+            code = jinja_env.compile(ast)
+            if _jinja_folds_calls(ast):
+                return jinja_env.template_class.from_code(
+                    jinja_env, code, jinja_env.make_globals(None), None)
+            if bucket is not None:
+                bucket.code = code
+                bucket.folds_calls = False
+                bcc.set_bucket(bucket)
+        if keep_code:
+            if len(_JINJA_CODE) >= _JINJA_CODE_MAX:
+                _JINJA_CODE.clear()
+            _JINJA_CODE[key] = code
+    return jinja_env.template_class.from_code(
+        jinja_env, code, jinja_env.make_globals(None), None)
+
+
 def render_jinja_tmpl(tmplstr, context, tmplpath=None):
     opts = context['opts']
     saltenv = context['saltenv']
@@ -351,11 +449,15 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
     else:
         opt_jinja_env_helper(opt_jinja_env, 'jinja_env')
 
-    if opts.get('allow_undefined', False):
-        jinja_env = jinja2.Environment(**env_args)
-    else:
-        jinja_env = jinja2.Environment(undefined=jinja2.StrictUndefined,
-                                       **env_args)
+    if not opts.get('allow_undefined', False):
+        env_args['undefined'] = jinja2.StrictUndefined
+
+    # The options which the compiled code depends on
+    env_key = salt.utils.hashutils.sha256_digest(repr(sorted(
+        (key, value) for key, value in six.iteritems(env_args) if key != 'loader')))
+    keep_code = opts.get('jinja_template_cache', False)
+    env_args['bytecode_cache'] = _get_jinja_bytecode_cache(opts)
+    jinja_env = jinja2.Environment(**env_args)
 
     tojson_filter = jinja_env.filters.get('tojson')
     jinja_env.tests.update(JinjaTest.salt_jinja_tests)
@@ -387,7 +489,7 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
             decoded_context[key] = salt.utils.data.decode(value)
 
     try:
-        template = jinja_env.from_string(tmplstr)
+        template = _jinja_template(jinja_env, tmplstr, env_key, keep_code)
         template.globals.update(decoded_context)
         output = template.render(**decoded_context)
     except jinja2.exceptions.UndefinedError as exc:
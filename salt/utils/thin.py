@@ -69,6 +69,7 @@ except ImportError:
 
 # Import salt libs
 import salt
+import salt.utils.atomicfile
 import salt.utils.files
 import salt.utils.hashutils
 import salt.utils.json
@@ -556,7 +557,33 @@ def thin_sum(cachedir, form='sha1'):
     else:
         code_checksum = "'0'"
 
-    return code_checksum, salt.utils.hashutils.get_hash(thintar, form)
+    return code_checksum, _get_cached_hash(thintar, form)
+
+
+def _get_cached_hash(path, form):
+    '''
+    Return the hash of a file, which is kept next to it along with the mtime
+    and size of the file it was computed for, so that it is not computed
+    again for every salt-ssh target
+    '''
+    hash_path = '{0}.{1}'.format(path, form)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return salt.utils.hashutils.get_hash(path, form)
+    key = '{0} {1}'.format(stat.st_mtime, stat.st_size)
+    if os.path.isfile(hash_path):
+        with salt.utils.files.fopen(hash_path, 'r') as fh_:
+            cached = fh_.read().strip().rsplit(' ', 1)
+        if len(cached) == 2 and cached[0] == key:
+            return cached[1]
+    digest = salt.utils.hashutils.get_hash(path, form)
+    try:
+        with salt.utils.atomicfile.atomic_open(hash_path, 'w') as fh_:
+            fh_.write('{0} {1}\n'.format(key, digest))
+    except (IOError, OSError) as exc:
+        log.debug('Unable to cache the hash of %s: %s', path, exc)
+    return digest
 
 
 def gen_min(cachedir, extra_mods='', overwrite=False, so_mods='',
@@ -5,10 +5,11 @@ Custom YAML loading in Salt
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import gc
 import warnings
 
 import yaml  # pylint: disable=blacklisted-import
-from yaml.nodes import MappingNode, SequenceNode
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
 from yaml.constructor import ConstructorError
 try:
     yaml.Loader = yaml.CLoader
@@ -20,7 +21,7 @@ except Exception:
 
 import salt.utils.stringutils
 
-__all__ = ['SaltYamlSafeLoader', 'load', 'safe_load']
+__all__ = ['SaltYamlSafeLoader', 'SaltYamlFastLoader', 'load', 'safe_load']
 
 
 class DuplicateKeyWarning(RuntimeWarning):
@@ -165,6 +166,105 @@ class SaltYamlSafeLoader(yaml.SafeLoader):
             node.value = mergeable_items + node.value
 
 
+class SaltYamlFastLoader(SaltYamlSafeLoader):
+    '''
+    A faster variant of :py:class:`SaltYamlSafeLoader` for large documents
+
+    libyaml only scans and composes the document; resolving the tag of each
+    scalar and constructing the Python objects is done in Python, node by
+    node, through generator based constructors. This loader produces the same
+    data as :py:class:`SaltYamlSafeLoader`, but memoizes the tag resolution
+    and the construction of repeated scalars, and builds plain mappings and
+    sequences in a single recursive pass with the Salt checks (conflicting
+    IDs, unhashable keys) done inline. Nodes with any other tag go through the
+    regular constructors. The cyclic garbage collector is paused while a
+    document is loaded.
+    '''
+    def __init__(self, stream, dictclass=dict):
+        super(SaltYamlFastLoader, self).__init__(stream, dictclass=dictclass)
+        self._resolved = {}
+        self._scalars = {}
+
+    def get_single_data(self):
+        # The node tree and the data are only made of new objects, the
+        # cyclic garbage collector has nothing to collect while they are
+        # built but would repeatedly walk the whole, growing, tree
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return super(SaltYamlFastLoader, self).get_single_data()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def resolve(self, kind, value, implicit):
+        if self.yaml_path_resolvers:
+            return super(SaltYamlFastLoader, self).resolve(kind, value, implicit)
+        key = (kind, value, implicit)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            tag = self._resolved[key] = super(SaltYamlFastLoader, self).resolve(
+                kind, value, implicit)
+            return tag
+
+    def construct_document(self, node):
+        try:
+            return self.construct_fast(node)
+        finally:
+            self.constructed_objects = {}
+            self.recursive_objects = {}
+            self.deep_construct = False
+            self._scalars = {}
+
+    def construct_fast(self, node):
+        '''
+        Construct the Python object for node and everything below it
+        '''
+        if node in self.constructed_objects:
+            return self.constructed_objects[node]
+        if isinstance(node, ScalarNode):
+            if not node.tag.startswith('tag:yaml.org,2002:') \
+                    or node.tag not in self.yaml_constructors:
+                return self.construct_object(node, deep=True)
+            key = (node.tag, node.value)
+            try:
+                return self._scalars[key]
+            except KeyError:
+                # The standard scalar types are immutable, they can be shared
+                value = self._scalars[key] = \
+                    self.yaml_constructors[node.tag](self, node)
+                return value
+        if isinstance(node, MappingNode) and node.tag == 'tag:yaml.org,2002:map':
+            # Registered before it is filled, for aliases to an ancestor
+            data = self.constructed_objects[node] = self.dictclass()
+            self.flatten_mapping(node)
+            for key_node, value_node in node.value:
+                key = self.construct_fast(key_node)
+                try:
+                    conflict = key in data
+                except TypeError:
+                    raise ConstructorError(
+                        'while constructing a mapping',
+                        node.start_mark,
+                        'found unacceptable key {0}'.format(key_node.value),
+                        key_node.start_mark)
+                if conflict:
+                    raise ConstructorError(
+                        'while constructing a mapping',
+                        node.start_mark,
+                        "found conflicting ID '{0}'".format(key),
+                        key_node.start_mark)
+                data[key] = self.construct_fast(value_node)
+            return data
+        if isinstance(node, SequenceNode) and node.tag == 'tag:yaml.org,2002:seq':
+            data = self.constructed_objects[node] = []
+            for child in node.value:
+                data.append(self.construct_fast(child))
+            return data
+        return self.construct_object(node, deep=True)
+
+
 def load(stream, Loader=SaltYamlSafeLoader):
     return yaml.load(stream, Loader=Loader)
 
@@ -55,7 +55,7 @@ class DiskUsageBeaconTestCase(TestCase, LoaderModuleMockMixin):
     '''
 
     def setup_loader_modules(self):
-        return {}
+        return {diskusage: {}}
 
     def test_non_list_config(self):
         config = {}
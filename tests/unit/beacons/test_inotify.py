@@ -13,6 +13,7 @@ from salt.beacons import inotify
 # Salt testing libs
 from tests.support.unit import skipIf, TestCase
 from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.mock import MagicMock, patch
 # Third-party libs
 try:
     import pyinotify  # pylint: disable=unused-import
@@ -53,7 +54,7 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
         ret = inotify.beacon(config)
         self.assertEqual(ret, [])
 
-        with salt.utils.files.fopen(path, 'r') as f:
+        with salt.utils.files.fopen(path, 'r'):
             pass
         ret = inotify.beacon(config)
         self.assertEqual(len(ret), 1)
@@ -68,13 +69,13 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
         ret = inotify.beacon(config)
         self.assertEqual(ret, [])
         fp = os.path.join(self.tmpdir, 'tmpfile')
-        with salt.utils.files.fopen(fp, 'w') as f:
+        with salt.utils.files.fopen(fp, 'w'):
             pass
         ret = inotify.beacon(config)
         self.assertEqual(len(ret), 1)
         self.assertEqual(ret[0]['path'], fp)
         self.assertEqual(ret[0]['change'], 'IN_CREATE')
-        with salt.utils.files.fopen(fp, 'r') as f:
+        with salt.utils.files.fopen(fp, 'r'):
             pass
         ret = inotify.beacon(config)
         self.assertEqual(ret, [])
@@ -87,7 +88,7 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
         ret = inotify.beacon(config)
         self.assertEqual(ret, [])
         fp = os.path.join(self.tmpdir, 'tmpfile')
-        with salt.utils.files.fopen(fp, 'w') as f:
+        with salt.utils.files.fopen(fp, 'w'):
             pass
         ret = inotify.beacon(config)
         self.assertEqual(len(ret), 2)
@@ -95,7 +96,7 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
         self.assertEqual(ret[0]['change'], 'IN_CREATE')
         self.assertEqual(ret[1]['path'], fp)
         self.assertEqual(ret[1]['change'], 'IN_OPEN')
-        with salt.utils.files.fopen(fp, 'r') as f:
+        with salt.utils.files.fopen(fp, 'r'):
             pass
         ret = inotify.beacon(config)
         self.assertEqual(len(ret), 1)
@@ -108,7 +109,7 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
         dp2 = os.path.join(dp1, 'subdir2')
         os.mkdir(dp2)
         fp = os.path.join(dp2, 'tmpfile')
-        with salt.utils.files.fopen(fp, 'w') as f:
+        with salt.utils.files.fopen(fp, 'w'):
             pass
         config = [{'files': {self.tmpdir: {'mask': ['open'], 'recurse': True}}}]
         ret = inotify.validate(config)
@@ -116,7 +117,7 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
 
         ret = inotify.beacon(config)
         self.assertEqual(ret, [])
-        with salt.utils.files.fopen(fp) as f:
+        with salt.utils.files.fopen(fp):
             pass
         ret = inotify.beacon(config)
         self.assertEqual(len(ret), 3)
@@ -145,7 +146,7 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
         self.assertEqual(ret[0]['path'], dp2)
         self.assertEqual(ret[0]['change'], 'IN_CREATE|IN_ISDIR')
         fp = os.path.join(dp2, 'tmpfile')
-        with salt.utils.files.fopen(fp, 'w') as f:
+        with salt.utils.files.fopen(fp, 'w'):
             pass
         ret = inotify.beacon(config)
         self.assertEqual(len(ret), 1)
@@ -156,3 +157,95 @@ class INotifyBeaconTestCase(TestCase, LoaderModuleMockMixin):
         self.assertEqual(len(ret), 1)
         self.assertEqual(ret[0]['path'], fp)
         self.assertEqual(ret[0]['change'], 'IN_DELETE')
+
+    def test_coalesce_window(self):
+        config = [{'files': {self.tmpdir: {'mask': ['open']}}},
+                  {'coalesce_window': 5}]
+        ret = inotify.validate(config)
+        self.assertEqual(ret, (True, 'Valid beacon configuration'))
+
+        fp1 = os.path.join(self.tmpdir, 'tmpfile1')
+        fp2 = os.path.join(self.tmpdir, 'tmpfile2')
+        for fp in (fp1, fp2):
+            with salt.utils.files.fopen(fp, 'w'):
+                pass
+        with patch('time.time', MagicMock(return_value=100)):
+            ret = inotify.beacon(config)
+        self.assertEqual(ret, [])
+        # The kernel merges identical consecutive events itself
+        for _ in range(3):
+            for fp in (fp1, fp2):
+                with salt.utils.files.fopen(fp, 'r'):
+                    pass
+        with patch('time.time', MagicMock(return_value=101)):
+            ret = inotify.beacon(config)
+        self.assertEqual(ret, [])
+        with patch('time.time', MagicMock(return_value=106)):
+            ret = inotify.beacon(config)
+        self.assertEqual(ret, [
+            {'tag': self.tmpdir, 'path': fp1, 'change': 'IN_OPEN', 'count': 3},
+            {'tag': self.tmpdir, 'path': fp2, 'change': 'IN_OPEN', 'count': 3}])
+
+    def test_debounce(self):
+        config = [{'files': {self.tmpdir: {'mask': ['create'], 'debounce': 5}}}]
+        ret = inotify.validate(config)
+        self.assertEqual(ret, (True, 'Valid beacon configuration'))
+
+        with patch('time.time', MagicMock(return_value=100)):
+            ret = inotify.beacon(config)
+        self.assertEqual(ret, [])
+        for name in ('tmpfile1', 'tmpfile2'):
+            with salt.utils.files.fopen(os.path.join(self.tmpdir, name), 'w'):
+                pass
+        with patch('time.time', MagicMock(return_value=101)):
+            ret = inotify.beacon(config)
+        self.assertEqual(ret, [])
+        with patch('time.time', MagicMock(return_value=106)):
+            ret = inotify.beacon(config)
+        self.assertEqual(len(ret), 1)
+        self.assertEqual(ret[0]['path'], self.tmpdir)
+        self.assertEqual(ret[0]['change'], 'debounce')
+        self.assertEqual(ret[0]['count'], 2)
+        self.assertEqual(
+            [change['path'] for change in ret[0]['changes']],
+            [os.path.join(self.tmpdir, 'tmpfile1'), os.path.join(self.tmpdir, 'tmpfile2')])
+
+    def test_max_events(self):
+        config = [{'files': {self.tmpdir: {'mask': ['create']}}},
+                  {'max_events': 2}]
+        ret = inotify.beacon(config)
+        self.assertEqual(ret, [])
+        for idx in range(5):
+            with salt.utils.files.fopen(os.path.join(self.tmpdir, str(idx)), 'w'):
+                pass
+        ret = inotify.beacon(config)
+        self.assertEqual(len(ret), 3)
+        self.assertEqual(ret[2], {'tag': 'summary', 'count': 3,
+                                  'paths': {self.tmpdir: 3}})
+
+    def test_max_watches_scans_mtimes(self):
+        dp1 = os.path.join(self.tmpdir, 'subdir1')
+        os.mkdir(dp1)
+        fp = os.path.join(dp1, 'tmpfile')
+        with salt.utils.files.fopen(fp, 'w'):
+            pass
+        config = [{'files': {self.tmpdir: {'mask': ['create', 'modify', 'delete'],
+                                           'recurse': True}}},
+                  {'max_watches': 1}]
+        ret = inotify.beacon(config)
+        self.assertEqual(ret, [])
+        self.assertEqual(inotify.__context__['inotify.notifier']._watch_manager.watches, {})
+        self.assertIn(self.tmpdir, inotify.__context__['inotify.polled'])
+
+        fp2 = os.path.join(dp1, 'tmpfile2')
+        with salt.utils.files.fopen(fp2, 'w'):
+            pass
+        os.utime(fp, (0, 0))
+        ret = inotify.beacon(config)
+        self.assertEqual(ret, [
+            {'tag': self.tmpdir, 'path': dp1, 'change': 'IN_MODIFY|IN_ISDIR'},
+            {'tag': dp1, 'path': fp, 'change': 'IN_MODIFY'},
+            {'tag': dp1, 'path': fp2, 'change': 'IN_CREATE'}])
+        os.remove(fp2)
+        ret = inotify.beacon(config)
+        self.assertIn({'tag': dp1, 'path': fp2, 'change': 'IN_DELETE'}, ret)
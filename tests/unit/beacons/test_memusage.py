@@ -25,7 +25,7 @@ class MemUsageBeaconTestCase(TestCase, LoaderModuleMockMixin):
     '''
 
     def setup_loader_modules(self):
-        return {}
+        return {memusage: {}}
 
     def test_non_list_config(self):
         config = {}
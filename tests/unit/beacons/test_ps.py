@@ -31,7 +31,7 @@ class PSBeaconTestCase(TestCase, LoaderModuleMockMixin):
     '''
 
     def setup_loader_modules(self):
-        return {}
+        return {ps: {}}
 
     def test_non_list_config(self):
         config = {}
@@ -40,6 +40,30 @@ class CacheFunctionsTest(TestCase):
         ret = salt.cache.factory(self.opts)
         self.assertIsInstance(ret, salt.cache.MemCache)
 
+    def test_batch_fallbacks(self):
+        '''
+        The batch functions fall back to the single key functions of drivers
+        which do not implement them
+        '''
+        stored = {('bank', 'key'): 'data', ('bank', 'empty'): {}}
+        modules = {
+            'fake_driver.store': lambda bank, key, data: stored.__setitem__((bank, key), data),
+            'fake_driver.fetch': lambda bank, key: stored.get((bank, key), {}),
+            'fake_driver.list': lambda bank: ['key', 'empty', 'sub'],
+            'fake_driver.contains': lambda bank, key: (bank, key) in stored,
+        }
+        self.opts['cache'] = 'fake_driver'
+        with patch('salt.loader.cache', return_value=modules):
+            cache = salt.cache.Cache(self.opts)
+            cache.store_many({('bank', 'key2'): 'data2'})
+            self.assertEqual(stored[('bank', 'key2')], 'data2')
+            self.assertEqual(
+                cache.fetch_many([('bank', 'key'), ('bank', 'missing')]),
+                {('bank', 'key'): 'data', ('bank', 'missing'): {}})
+            # The sub-bank is not a key
+            self.assertEqual(cache.list_with_data('bank'),
+                             {'key': 'data', 'empty': {}})
+
 
 @skipIf(NO_MOCK, NO_MOCK_REASON)
 class MemCacheTest(TestCase):
@@ -49,6 +73,7 @@ class MemCacheTest(TestCase):
     @patch('salt.payload.Serial')
     def setUp(self, serial_mock):  # pylint: disable=W0221
         salt.cache.MemCache.data = {}
+        salt.cache.MemCache.stats = {}
         self.opts = {'cache': 'fake_driver',
                      'memcache_expire_seconds': 10,
                      'memcache_max_items': 3,
@@ -91,6 +116,24 @@ class MemCacheTest(TestCase):
         cache_fetch_mock.assert_called_once_with('bank', 'key')
         cache_fetch_mock.reset_mock()
 
+    @patch('salt.cache.Cache.store')
+    @patch('salt.cache.Cache.fetch_many', return_value={('bank', 'key2'): 'fake_data2'})
+    @patch('salt.loader.cache', return_value={})
+    def test_fetch_many(self, loader_mock, cache_fetch_many_mock, cache_store_mock):
+        with patch('time.time', return_value=0):
+            self.cache.store('bank', 'key', 'fake_data')
+        # Only the keys missing from memory are fetched from the driver
+        with patch('time.time', return_value=1):
+            ret = self.cache.fetch_many([('bank', 'key'), ('bank', 'key2')])
+        self.assertEqual(ret, {('bank', 'key'): 'fake_data',
+                               ('bank', 'key2'): 'fake_data2'})
+        cache_fetch_many_mock.assert_called_once_with([('bank', 'key2')])
+        self.assertDictEqual(salt.cache.MemCache.data, {
+            'fake_driver': {
+                ('bank', 'key'): [1, 'fake_data'],
+                ('bank', 'key2'): [1, 'fake_data2'],
+                }})
+
     @patch('salt.cache.Cache.store')
     @patch('salt.loader.cache', return_value={})
     def test_store(self, loader_mock, cache_store_mock):
@@ -191,6 +234,61 @@ class MemCacheTest(TestCase):
             ('bank2', 'key2'): [12, 'fake_data22'],
             })
 
+    @patch('salt.cache.Cache.store')
+    @patch('salt.loader.cache', return_value={})
+    def test_max_size(self, loader_mock, cache_store_mock):
+        self.opts['memcache_max_items'] = 100
+        self.opts['memcache_max_size'] = 250
+        self.cache = salt.cache.factory(self.opts)
+        self.cache.serial = salt.payload.Serial('msgpack')
+        with patch('time.time', return_value=0):
+            self.cache.store('bank', 'key1', 'x' * 100)
+            self.cache.store('bank', 'key2', 'x' * 100)
+            # Too large to be kept at all
+            self.cache.store('bank', 'key3', 'x' * 300)
+        self.assertEqual(list(salt.cache.MemCache.data['fake_driver']),
+                         [('bank', 'key1'), ('bank', 'key2')])
+        # key1 is used again, key2 is the least recently used one
+        with patch('time.time', return_value=1):
+            self.cache.fetch('bank', 'key1')
+            self.cache.store('bank', 'key4', 'x' * 100)
+        self.assertEqual(list(salt.cache.MemCache.data['fake_driver']),
+                         [('bank', 'key1'), ('bank', 'key4')])
+        self.assertLessEqual(salt.cache.MemCache.sizes['fake_driver'][0], 250)
+
+    @patch('salt.cache.Cache.store')
+    @patch('salt.cache.Cache.flush')
+    @patch('salt.loader.cache', return_value={})
+    def test_flush_bank(self, loader_mock, cache_flush_mock, cache_store_mock):
+        with patch('time.time', return_value=0):
+            self.cache.store('bank', 'key', 'fake_data')
+            self.cache.store('bank/sub', 'key', 'fake_data')
+            self.cache.store('bank2', 'key', 'fake_data')
+        self.cache.flush('bank')
+        self.assertEqual(list(salt.cache.MemCache.data['fake_driver']),
+                         [('bank2', 'key')])
+
+    @patch('salt.cache.Cache.fetch', return_value='fake_data')
+    @patch('salt.cache.Cache.fetch_many', return_value={('bank2', 'key'): 'fake_data'})
+    @patch('salt.loader.cache', return_value={})
+    def test_stats(self, loader_mock, cache_fetch_many_mock, cache_fetch_mock):
+        # Nothing is counted unless the master stats are enabled
+        with patch('time.time', return_value=0):
+            self.cache.fetch('bank1', 'key')
+        self.assertEqual(salt.cache.MemCache.pop_stats(), {})
+
+        self.opts['master_stats'] = True
+        self.cache = salt.cache.factory(self.opts)
+        with patch('time.time', return_value=0):
+            self.cache.fetch('bank1/sub1', 'key')
+            self.cache.fetch('bank1/sub1', 'key')
+            self.cache.fetch('bank1/sub2', 'key')
+            self.cache.fetch_many([('bank1/sub1', 'key'), ('bank2', 'key')])
+        self.assertEqual(salt.cache.MemCache.pop_stats(),
+                         {'bank1': {'hits': 2, 'misses': 2},
+                          'bank2': {'hits': 0, 'misses': 1}})
+        self.assertEqual(salt.cache.MemCache.pop_stats(), {})
+
     @patch('salt.cache.Cache.fetch', return_value='fake_data')
     @patch('salt.loader.cache', return_value={})
     def test_fetch_debug(self, loader_mock, cache_fetch_mock):
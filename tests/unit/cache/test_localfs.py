@@ -8,6 +8,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 import errno
 import shutil
 import tempfile
+import threading
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -140,6 +141,28 @@ class LocalFSTest(TestCase, LoaderModuleMockMixin):
             with patch.dict(localfs.__context__, {'serial': serializer}):
                 self.assertIn('payload data', localfs.fetch(bank='bank', key='key', cachedir=tmp_dir))
 
+    # 'fetch_many' function tests: 1
+
+    def test_fetch_many_threaded(self):
+        '''
+        Tests that fetch_many reads every key, including the missing ones, when
+        it reads them on several threads.
+        '''
+        tmp_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        serializer = salt.payload.Serial(self)
+        with patch.dict(localfs.__context__, {'serial': serializer}):
+            localfs.store_many(
+                dict((('bank', 'key{0}'.format(idx)), idx) for idx in range(100)),
+                cachedir=tmp_dir)
+            bank_keys = [('bank', 'key{0}'.format(idx)) for idx in range(101)]
+            with patch('threading.Thread', wraps=threading.Thread) as thread_mock:
+                ret = localfs.fetch_many(bank_keys, cachedir=tmp_dir)
+            self.assertEqual(thread_mock.call_count, 6)
+        expected = dict((('bank', 'key{0}'.format(idx)), idx) for idx in range(100))
+        expected[('bank', 'key100')] = {}
+        self.assertEqual(ret, expected)
+
     # 'updated' function tests: 3
 
     def test_updated_return_when_cache_file_does_not_exist(self):
@@ -248,6 +271,22 @@ class LocalFSTest(TestCase, LoaderModuleMockMixin):
         with patch.dict(localfs.__opts__, {'cachedir': tmp_dir}):
             self.assertEqual(localfs.list_(bank='bank', cachedir=tmp_dir), ['key'])
 
+    # 'list_with_data' function tests: 1
+
+    def test_list_with_data(self):
+        '''
+        Tests that list_with_data returns the data of the keys of the bank,
+        without its sub-banks.
+        '''
+        tmp_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        serializer = salt.payload.Serial(self)
+        self._create_tmp_cache_file(tmp_dir, serializer)
+        with patch.dict(localfs.__context__, {'serial': serializer}):
+            localfs.store(bank='bank/sub', key='key', data='sub data', cachedir=tmp_dir)
+            self.assertEqual(localfs.list_with_data(bank='bank', cachedir=tmp_dir),
+                             {'key': 'payload data'})
+            self.assertEqual(localfs.list_with_data(bank='nobank', cachedir=tmp_dir), {})
+
     # 'contains' function tests: 1
 
     def test_contains(self):
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+'''
+Tests for salt.client.multiplex
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import time
+
+# Import Salt Testing libs
+from tests.support.unit import skipIf
+from tests.support.mock import NO_MOCK, NO_MOCK_REASON, MagicMock
+
+# Import Salt libs
+import salt.client.multiplex
+import salt.payload
+import salt.utils.event
+import salt.utils.stringutils
+
+# Import 3rd-party libs
+import tornado.concurrent
+import tornado.gen
+from tornado.testing import AsyncTestCase, gen_test
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class MultiplexedLocalClientTestCase(AsyncTestCase):
+    def setUp(self):
+        super(MultiplexedLocalClientTestCase, self).setUp()
+        self.serial = salt.payload.Serial({'serial': 'msgpack'})
+        self.published = []
+        self.local = MagicMock()
+        self.local._get_timeout = lambda timeout: timeout or 5
+        self.local.event.unpack_tag = salt.utils.event.SaltEvent.unpack_tag
+        self.local.event.serial = self.serial
+        self.local.run_job_async.side_effect = self._run_job_async
+        self.client = salt.client.multiplex.MultiplexedLocalClient(
+            {'gather_job_timeout': 10, 'unique_jid': True},
+            io_loop=self.io_loop, local=self.local)
+        # Returns fired by minions while the job is being published
+        self.early_returns = []
+
+    def tearDown(self):
+        self.client.close()
+        super(MultiplexedLocalClientTestCase, self).tearDown()
+
+    def _run_job_async(self, tgt, fun, **kwargs):
+        self.published.append((tgt, fun))
+        jid = kwargs.get('jid') or '2019010100000000000{0}'.format(len(self.published))
+        for minion, data in self.early_returns:
+            self._fire('salt/job/{0}/ret/{1}'.format(jid, minion), data)
+        future = tornado.concurrent.Future()
+        future.set_result({'jid': jid,
+                           'minions': tgt if isinstance(tgt, list) else [tgt]})
+        return future
+
+    def _fire(self, tag, data):
+        raw = b''.join([
+            salt.utils.stringutils.to_bytes(tag),
+            salt.utils.stringutils.to_bytes(salt.utils.event.TAGEND),
+            self.serial.dumps(data, use_bin_type=True)])
+        self.client._handle_event(raw)
+
+    @gen_test
+    def test_returns_are_routed_per_jid(self):
+        jid1 = yield self.client.run_job(['a', 'b'], 'test.ping', tgt_type='list')
+        jid2 = yield self.client.run_job(['a'], 'test.ping', tgt_type='list')
+        self._fire('salt/job/{0}/ret/a'.format(jid1), {'id': 'a', 'return': True, 'retcode': 0})
+        self._fire('salt/job/{0}/ret/a'.format(jid2), {'id': 'a', 'return': False})
+        self._fire('salt/job/{0}/ret/b'.format(jid1), {'id': 'b', 'return': True})
+        ret1 = yield self.client.get_returns(jid1)
+        ret2 = yield self.client.get_returns(jid2)
+        self.assertEqual(ret1, {'a': {'ret': True, 'retcode': 0}, 'b': {'ret': True}})
+        self.assertEqual(ret2, {'a': {'ret': False}})
+        self.assertEqual(self.client.jobs, {})
+
+    @gen_test
+    def test_returns_before_publish_completes(self):
+        self.early_returns = [('a', {'id': 'a', 'return': True})]
+        jid = yield self.client.run_job(['a', 'b'], 'test.ping', tgt_type='list')
+        self.assertEqual(self.client.jobs[jid].returns, {'a': {'ret': True}})
+        self._fire('salt/job/{0}/ret/b'.format(jid), {'id': 'b', 'return': True})
+        ret = yield self.client.get_returns(jid)
+        self.assertEqual(ret, {'a': {'ret': True}, 'b': {'ret': True}})
+
+        # Every minion returned before the publish completed
+        self.early_returns = [('c', {'id': 'c', 'return': False})]
+        jid = yield self.client.run_job('c', 'test.ping')
+        self.assertNotIn(jid, self.client.jobs)
+        ret = yield self.client.get_returns(jid)
+        self.assertEqual(ret, {'c': {'ret': False}})
+
+    @gen_test
+    def test_iter_returns(self):
+        jid = yield self.client.run_job('a', 'test.ping', expect_minions=True)
+        job = self.client.jobs[jid]
+        returns = self.client.iter_returns(jid)
+        self._fire('salt/job/{0}/ret/a'.format(jid), {'id': 'a', 'return': True})
+        ret = yield returns.next()
+        self.assertEqual(ret, {'a': {'ret': True}})
+        ret = yield returns.next()
+        self.assertIsNone(ret)
+        self.assertTrue(job.future.done())
+
+    @gen_test
+    def test_liveness_check_is_batched(self):
+        jid1 = yield self.client.run_job(['a', 'b'], 'test.sleep', tgt_type='list',
+                                         expect_minions=True)
+        jid2 = yield self.client.run_job(['c'], 'test.sleep', tgt_type='list',
+                                         expect_minions=True)
+        for job in self.client.jobs.values():
+            job.timeout_at = 0
+        self.client._check_jobs()
+        yield tornado.gen.moment
+        yield tornado.gen.moment
+        # A single saltutil.running publish covers every timed out job
+        self.assertEqual(len(self.published), 3)
+        tgt, fun = self.published[-1]
+        self.assertEqual(fun, 'saltutil.running')
+        self.assertEqual(sorted(tgt), ['a', 'b', 'c'])
+
+        check_jid = self.client.check['jid']
+        self._fire('salt/job/{0}/ret/a'.format(check_jid),
+                   {'id': 'a', 'return': [{'jid': jid1}]})
+        self._fire('salt/job/{0}/ret/c'.format(check_jid),
+                   {'id': 'c', 'return': []})
+        self.client.check['timeout_at'] = 0
+        self.client._settle_check()
+
+        # jid1 is still running on a, jid2 is not running anywhere
+        self.assertIn(jid1, self.client.jobs)
+        self.assertGreater(self.client.jobs[jid1].timeout_at, time.time())
+        ret2 = yield self.client.get_returns(jid2)
+        self.assertEqual(ret2, {'c': {'failed': True}})
+
+    @gen_test
+    def test_liveness_check_returns_before_publish_completes(self):
+        jid = yield self.client.run_job(['a'], 'test.sleep', tgt_type='list',
+                                        expect_minions=True)
+        self.client.jobs[jid].timeout_at = 0
+        self.early_returns = [('a', {'id': 'a', 'return': [{'jid': jid}]})]
+        self.client._check_jobs()
+        yield tornado.gen.moment
+        yield tornado.gen.moment
+        self.assertEqual(self.published[-1], (['a'], 'saltutil.running'))
+        self.client.check['timeout_at'] = 0
+        self.client._settle_check()
+        # The job is still running on a
+        self.assertIn(jid, self.client.jobs)
+        self.assertGreater(self.client.jobs[jid].timeout_at, time.time())
@@ -7,7 +7,9 @@
 from __future__ import absolute_import, print_function, unicode_literals
 import os
 import shutil
+import tarfile
 import tempfile
+import time
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -16,10 +18,16 @@ from tests.support.case import ShellCase
 from tests.support.mock import NO_MOCK, NO_MOCK_REASON, patch, MagicMock
 
 # Import Salt libs
+import salt.client.ssh.shell
+import salt.client.ssh.state as ssh_state
 import salt.config
 import salt.roster
 import salt.utils.files
+import salt.utils.hashutils
+import salt.utils.json
 import salt.utils.path
+import salt.utils.platform
+import salt.utils.stringutils
 import salt.utils.thin
 import salt.utils.yaml
 
@@ -150,3 +158,222 @@ class SSHSingleTests(TestCase):
                          'PasswordAuthentication=yes -o ConnectTimeout=65 -o Port=22 '
                          '-o IdentityFile=/etc/salt/pki/master/ssh/salt-ssh.rsa '
                          '-o User=root  date +%s')
+
+
+class SSHShellPersistTests(TestCase):
+    def setUp(self):
+        self.tmp_cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.tmp_cachedir, ignore_errors=True)
+
+    def _shell(self, **opts):
+        opts.update({'cachedir': self.tmp_cachedir, '_ssh_version': (7, 4)})
+        return salt.client.ssh.shell.Shell(opts, 'login1', user='root',
+                                           priv='/etc/salt/pki/master/ssh/salt-ssh.rsa',
+                                           timeout=65)
+
+    def test_persist_disabled(self):
+        self.assertNotIn('Control', self._shell()._cmd_str('date'))
+
+    def test_persist(self):
+        shell = self._shell(ssh_persist=True, ssh_persist_ttl=300)
+        control_dir = os.path.join(self.tmp_cachedir, 'ssh_control')
+        persist_opts = ('-o ControlMaster=auto -o ControlPath={0} '
+                        '-o ControlPersist=300 ').format(os.path.join(control_dir, '%C'))
+        # ssh and scp calls share the master connection
+        self.assertIn(persist_opts, shell._cmd_str('date'))
+        self.assertIn(persist_opts, shell._cmd_str('/tmp/a login1:/tmp/a', ssh='scp'))
+        self.assertTrue(os.path.isdir(control_dir))
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+@skipIf(salt.utils.platform.is_windows(), 'Not supported on Windows')
+class SSHHandleTests(TestCase):
+    def setUp(self):
+        self.tmp_cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.tmp_cachedir, ignore_errors=True)
+        self.client = ssh.SSH.__new__(ssh.SSH)
+        self.client.opts = {'cachedir': self.tmp_cachedir,
+                            'argv': ['uptime'],
+                            'raw_shell': True,
+                            'ssh_raw_async': True,
+                            'ssh_max_procs': 2,
+                            'ssh_run_timeout': 0}
+        self.client.defaults = {'user': 'root', 'timeout': 60}
+        self.client.targets = {'host1': {}, 'host2': {}, 'host3': {}}
+
+    def _cmd_str(self, shell, cmd, ssh='ssh'):
+        self.assertIn('BatchMode=yes', shell.ssh_options)
+        return {'host1': 'echo one',
+                'host2': 'echo two >&2; exit 3',
+                'host3': 'sleep 10'}[shell.host]
+
+    def test_raw_async(self):
+        self.client.opts['ssh_run_timeout'] = 1
+        with patch('salt.client.ssh.shell.Shell._cmd_str', autospec=True,
+                   side_effect=self._cmd_str):
+            rets = {}
+            for ret in self.client.handle_ssh():
+                rets.update(ret)
+        self.assertEqual(rets['host1'], {'stdout': 'one\n', 'stderr': '', 'retcode': 0})
+        self.assertEqual(rets['host2'], {'stdout': '', 'stderr': 'two\n', 'retcode': 3})
+        self.assertIn('did not return within 1 seconds', rets['host3'])
+
+    def test_raw_async_not_capable(self):
+        # Password authentication needs a terminal, it is run in a routine
+        self.client.targets = {'host1': {}, 'host2': {'passwd': 'secret'}}
+
+        def handle_routines(hosts, mine=False):
+            for host in hosts:
+                yield {host: 'routine'}
+
+        with patch('salt.client.ssh.shell.Shell._cmd_str', autospec=True,
+                   side_effect=self._cmd_str), \
+                patch.object(self.client, '_handle_routines', handle_routines):
+            rets = list(self.client.handle_ssh())
+        self.assertEqual(len(rets), 2)
+        self.assertEqual(rets[0], {'host1': {'stdout': 'one\n', 'stderr': '', 'retcode': 0}})
+        self.assertEqual(rets[1], {'host2': 'routine'})
+
+    def test_routine_timeout(self):
+        self.client.opts.update({'raw_shell': False, 'ssh_run_timeout': 1})
+        self.client.targets = {'host1': {}, 'host2': {}}
+
+        def handle_routine(que, opts, host, target, mine=False):
+            if host == 'host2':
+                time.sleep(10)
+            que.put({'id': host, 'ret': 'done'})
+
+        with patch.object(self.client, 'handle_routine', handle_routine):
+            start = time.time()
+            rets = {}
+            for ret in self.client.handle_ssh():
+                rets.update(ret)
+        self.assertLess(time.time() - start, 8)
+        self.assertEqual(rets['host1'], 'done')
+        self.assertIn('did not return within 1 seconds', rets['host2'])
+
+
+class SSHExtModsTests(TestCase):
+    def setUp(self):
+        self.tmp_cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.tmp_cachedir, ignore_errors=True)
+        self.mods = {'version': 'ver', 'file': os.path.join(self.tmp_cachedir, 'ext_mods.ver.tgz'),
+                     'files': {}}
+        for rel, content in (('modules/a.py', 'a = 1'), ('modules/b.py', 'b = 1')):
+            path = os.path.join(self.tmp_cachedir, rel.replace('/', '_'))
+            with salt.utils.files.fopen(path, 'w') as fp_:
+                fp_.write(content)
+            self.mods['files'][rel] = [path, salt.utils.hashutils.get_hash(path)]
+
+    def test_ext_delta(self):
+        manifest = {'modules/a.py': self.mods['files']['modules/a.py'][1],
+                    'modules/b.py': 'old',
+                    'states/c.py': 'gone'}
+        delta = ssh.ext_delta(self.mods, manifest, self.tmp_cachedir)
+        with tarfile.open(delta) as tfp:
+            self.assertEqual(sorted(tfp.getnames()),
+                             ['ext_delete', 'ext_version', 'modules/b.py'])
+            self.assertEqual(tfp.extractfile('ext_delete').read(), b'states/c.py\n')
+            self.assertEqual(tfp.extractfile('ext_version').read(), b'ver')
+        # Targets with the same modules deployed share the archive
+        self.assertEqual(ssh.ext_delta(self.mods, dict(manifest), self.tmp_cachedir), delta)
+        self.assertNotEqual(ssh.ext_delta(self.mods, {}, self.tmp_cachedir), delta)
+
+    def test_old_ext_deltas_removed(self):
+        old_delta = ssh.ext_delta(self.mods, {}, self.tmp_cachedir)
+        fsclient = MagicMock()
+        fsclient.opts = {'cachedir': self.tmp_cachedir}
+        fsclient.envs.return_value = ['base']
+        fsclient.file_list.return_value = ['_modules/a.py']
+        fsclient.cache_file.return_value = self.mods['files']['modules/a.py'][0]
+        mods = ssh.mod_data(fsclient)
+        self.assertTrue(os.path.isfile(mods['file']))
+        self.assertFalse(os.path.isfile(old_delta))
+        # The deltas of the current version are kept
+        delta = ssh.ext_delta(mods, {}, self.tmp_cachedir)
+        os.remove(mods['file'])
+        ssh.mod_data(fsclient)
+        self.assertTrue(os.path.isfile(delta))
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class SSHTransTarTests(TestCase):
+    def setUp(self):
+        self.tmp_cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.tmp_cachedir, ignore_errors=True)
+        self.src = os.path.join(self.tmp_cachedir, 'motd')
+        with salt.utils.files.fopen(self.src, 'w') as fp_:
+            fp_.write('hello')
+        self.file_client = MagicMock()
+        self.file_client.opts = {'cachedir': self.tmp_cachedir, 'ssh_trans_tar_ttl': 60}
+        self.file_client.cache_file.side_effect = \
+            lambda name, saltenv, cachedir: self.src if name == 'salt://motd' else ''
+        self.file_client.cache_dir.return_value = []
+
+    def _read(self, trans_tar):
+        self.addCleanup(os.remove, trans_tar)
+        ret = {}
+        with tarfile.open(trans_tar, 'r:gz') as tfp:
+            for member in tfp.getmembers():
+                ret[member.name] = tfp.extractfile(member).read()
+        return ret
+
+    def test_shared_file_refs(self):
+        chunks = [{'state': 'file', 'fun': 'managed', 'source': 'salt://motd'}]
+        trans_tar = ssh_state.prep_trans_tar(
+            self.file_client, chunks, ssh_state.lowstate_file_refs(chunks),
+            {'role': 'web'}, 'host1')
+        self.assertEqual(self._read(trans_tar), {
+            'base/motd': b'hello',
+            'lowstate.json': salt.utils.stringutils.to_bytes(salt.utils.json.dumps(chunks)),
+            'pillar.json': b'{"role": "web"}'})
+        calls = self.file_client.cache_file.call_count
+
+        # Another target with the same file refs only gets its pillar packed
+        trans_tar = ssh_state.prep_trans_tar(
+            self.file_client, chunks, ssh_state.lowstate_file_refs(chunks),
+            {'role': 'db'}, 'host2')
+        contents = self._read(trans_tar)
+        self.assertEqual(contents['base/motd'], b'hello')
+        self.assertEqual(contents['pillar.json'], b'{"role": "db"}')
+        self.assertEqual(self.file_client.cache_file.call_count, calls)
+
+    def test_segment_purged_before_read(self):
+        '''
+        A segment removed by another target once it was found fresh is rebuilt
+        '''
+        chunks = [{'state': 'file', 'fun': 'managed', 'source': 'salt://motd'}]
+        file_refs = ssh_state.lowstate_file_refs(chunks)
+        ssh_state._file_refs_segment(self.file_client, file_refs, 60).close()
+        segdir = os.path.join(self.tmp_cachedir, 'salt-ssh', 'trans_tar')
+        segment = os.path.join(segdir, os.listdir(segdir)[0])
+
+        fopen = salt.utils.files.fopen
+
+        def _purged_fopen(path, *args, **kwargs):
+            if path == segment and os.path.exists(segment):
+                os.remove(segment)
+            return fopen(path, *args, **kwargs)
+
+        with patch('salt.utils.files.fopen', _purged_fopen):
+            trans_tar = ssh_state.prep_trans_tar(
+                self.file_client, chunks, file_refs, None, 'host1')
+        self.assertEqual(self._read(trans_tar)['base/motd'], b'hello')
+
+    def test_stale_temp_segments_purged(self):
+        '''
+        Segments left half written are purged with the expired segments
+        '''
+        segdir = os.path.join(self.tmp_cachedir, 'salt-ssh', 'trans_tar')
+        os.makedirs(segdir)
+        stale = os.path.join(segdir, ssh_state._SEGMENT_TMP_PREFIX + 'abc')
+        other = os.path.join(segdir, 'other')
+        for path in (stale, other):
+            with salt.utils.files.fopen(path, 'w') as fp_:
+                fp_.write('partial')
+            os.utime(path, (time.time() - 120, time.time() - 120))
+        ssh_state._file_refs_segment(self.file_client, [], 60).close()
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(other))
+        self.assertFalse([fn_ for fn_ in os.listdir(segdir)
+                          if fn_.startswith(ssh_state._SEGMENT_TMP_PREFIX)])
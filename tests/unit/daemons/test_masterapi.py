@@ -563,6 +563,21 @@ class FakeCache(object):
     def fetch(self, bank, key):
         return self.data[bank, key]
 
+    def fetch_many(self, bank_keys):
+        return dict(((bank, key), self.data.get((bank, key), {}))
+                    for bank, key in bank_keys)
+
+    def list(self, bank):
+        return [key for (kbank, key) in self.data if kbank == bank]
+
+    def contains(self, bank, key):
+        return (bank, key) in self.data
+
+    def flush(self, bank, key=None):
+        for bank_key in list(self.data):
+            if bank_key[0] == bank and key in (None, bank_key[1]):
+                del self.data[bank_key]
+
 
 class RemoteFuncsTestCase(TestCase):
     '''
@@ -658,3 +673,34 @@ class RemoteFuncsTestCase(TestCase):
                 }
             )
         self.assertDictEqual(ret, dict(ip_addr=dict(webserver='2001:db8::1:3'), ip4_addr=dict(webserver='127.0.0.1')))
+
+    def test_mine_stored_per_function(self):
+        '''
+        Asserts that the mine functions are stored under their own keys, and
+        that the mine stored as a whole is moved to them
+        '''
+        self.funcs.opts['minion_data_cache'] = True
+        self.funcs.cache.store('minions/webserver', 'mine',
+                               dict(ip_addr='2001:db8::1:3', ip4_addr='127.0.0.1'))
+        self.funcs._mine({'id': 'webserver', 'data': {'ip4_addr': '10.0.0.1'}})
+        self.assertEqual(self.funcs.cache.data, {
+            ('minions/webserver/mine', 'ip_addr'): '2001:db8::1:3',
+            ('minions/webserver/mine', 'ip4_addr'): '10.0.0.1'})
+
+        self.funcs._mine_delete({'id': 'webserver', 'fun': 'ip_addr'})
+        with patch('salt.utils.minions.CkMinions._check_compound_minions',
+                   MagicMock(return_value=(dict(
+                       minions=['webserver', 'dbserver'],
+                       missing=[])))):
+            ret = self.funcs._mine_get(
+                {
+                    'id': 'requester_minion',
+                    'tgt': 'G@roles:web',
+                    'fun': ['ip_addr', 'ip4_addr'],
+                    'tgt_type': 'compound',
+                }
+            )
+        self.assertDictEqual(ret, dict(ip4_addr=dict(webserver='10.0.0.1')))
+
+        self.funcs._mine_flush({'id': 'webserver'})
+        self.assertEqual(self.funcs.cache.data, {})
@@ -7,8 +7,11 @@
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
 import os
+import shutil
 import socket
+import tempfile
 import textwrap
+import threading
 
 # Import Salt Testing Libs
 try:
@@ -17,6 +20,7 @@ except ImportError as import_error:
     pytest = None
 
 from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.runtests import RUNTIME_VARS
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import (
     MagicMock,
@@ -868,6 +872,74 @@ class CoreGrainsTestCase(TestCase, LoaderModuleMockMixin):
             self.assertEqual(len(fqdns['fqdns']), len(ret['fqdns']))
             self.assertEqual(set(fqdns['fqdns']), set(ret['fqdns']))
 
+    @skipIf(not salt.utils.platform.is_linux(), 'System is not Linux')
+    @patch('salt.utils.network.ip_addrs', MagicMock(return_value=['1.2.3.4', '5.6.7.8']))
+    @patch('salt.utils.network.ip_addrs6', MagicMock(return_value=[]))
+    @patch('salt.utils.network.socket.getfqdn', MagicMock(side_effect=lambda v: v))
+    def test_fqdns_cache(self):
+        '''
+        test names and addresses without a name are cached
+        '''
+        cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, cachedir, ignore_errors=True)
+        opts = {'cachedir': cachedir,
+                'fqdns_cache_ttl': 60,
+                'fqdns_negative_cache_ttl': 60}
+
+        def _gethostbyaddr(ip):
+            if ip == '1.2.3.4':
+                return ('foo.bar.baz', [], [ip])
+            raise socket.herror(1, 'Unknown host')
+
+        gethostbyaddr = MagicMock(side_effect=_gethostbyaddr)
+        with patch.dict(core.__opts__, opts), \
+                patch.object(socket, 'gethostbyaddr', gethostbyaddr):
+            self.assertEqual(core.fqdns(), {'fqdns': ['foo.bar.baz']})
+            self.assertEqual(gethostbyaddr.call_count, 2)
+            self.assertEqual(core.fqdns(), {'fqdns': ['foo.bar.baz']})
+            self.assertEqual(gethostbyaddr.call_count, 2)
+
+    @patch('salt.utils.network.socket.getfqdn', MagicMock(side_effect=lambda v: v))
+    def test_fqdns_exclude_interfaces(self):
+        '''
+        test the addresses of excluded interfaces are not resolved
+        '''
+        interfaces = {
+            'eth0': {'inet': [{'address': '1.2.3.4'}]},
+            'docker0': {'inet': [{'address': '172.17.0.1'}]},
+        }
+        gethostbyaddr = MagicMock(return_value=('foo.bar.baz', [], ['1.2.3.4']))
+        with patch.dict(core.__opts__, {'fqdns_exclude_interfaces': ['docker*']}), \
+                patch.object(core, '_get_interfaces', MagicMock(return_value=interfaces)), \
+                patch.object(socket, 'gethostbyaddr', gethostbyaddr):
+            self.assertEqual(core.fqdns(), {'fqdns': ['foo.bar.baz']})
+        gethostbyaddr.assert_called_once_with('1.2.3.4')
+
+    def test_reverse_resolve_transient_error(self):
+        '''
+        test only addresses known to have no name are cacheable
+        '''
+        for errno, cacheable in ((0, True), (1, True), (2, False), (4, False)):
+            with patch.object(socket, 'gethostbyaddr',
+                              MagicMock(side_effect=socket.herror(errno, 'error'))):
+                self.assertEqual(core._reverse_resolve('1.2.3.4'), (None, cacheable))
+
+    def test_reverse_resolve_all_timeout(self):
+        '''
+        test addresses which are not resolved in time are given up on
+        '''
+        event = threading.Event()
+        self.addCleanup(event.set)
+
+        def _reverse_resolve(ip):
+            if ip == '5.6.7.8':
+                event.wait(5)
+            return ip, True
+
+        with patch.object(core, '_reverse_resolve', _reverse_resolve):
+            ret = core._reverse_resolve_all(['1.2.3.4', '5.6.7.8'], 2, 1)
+        self.assertEqual(ret, {'1.2.3.4': ('1.2.3.4', True)})
+
     def test_core_virtual(self):
         '''
         test virtual grain with cmd virt-what
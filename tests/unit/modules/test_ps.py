@@ -8,6 +8,7 @@ from __future__ import absolute_import, unicode_literals, print_function
 from collections import namedtuple
 
 # Import Salt Testing libs
+from tests.support.mixins import LoaderModuleMockMixin
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import MagicMock, patch, call, Mock
 
@@ -63,7 +64,10 @@ def _get_proc_pid(proc):
     return proc.pid
 
 
-class PsTestCase(TestCase):
+class PsTestCase(TestCase, LoaderModuleMockMixin):
+    def setup_loader_modules(self):
+        return {ps: {}}
+
     def setUp(self):
         self.mocked_proc = mocked_proc = MagicMock('salt.utils.psutil_compat.Process')
         if PSUTIL2:
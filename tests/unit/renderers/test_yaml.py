@@ -6,6 +6,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 # Import Salt Testing libs
 from tests.support.mixins import LoaderModuleMockMixin
 from tests.support.unit import TestCase
+from tests.support.mock import patch
 
 # Import Salt libs
 import salt.renderers.yaml as yaml
@@ -14,7 +15,7 @@ import salt.renderers.yaml as yaml
 class YAMLRendererTestCase(TestCase, LoaderModuleMockMixin):
 
     def setup_loader_modules(self):
-        return {yaml: {}}
+        return {yaml: {'__opts__': {}}}
 
     def test_yaml_render_string(self):
         data = 'string'
@@ -27,3 +28,14 @@ class YAMLRendererTestCase(TestCase, LoaderModuleMockMixin):
         result = yaml.render(data)
 
         self.assertEqual(result, u'python unicode string')
+
+    def test_yaml_fast_loader(self):
+        data = 'b: 1\na:\n  - c\n  - !!python/unicode d'
+        result = yaml.render(data)
+        with patch.dict(yaml.__opts__, {'yaml_fast_loader': True}), \
+                patch.object(yaml, 'SaltYamlSafeLoader') as safe_loader:
+            fast_result = yaml.render(data)
+            safe_loader.assert_not_called()
+
+        self.assertEqual(fast_result, result)
+        self.assertEqual(list(fast_result), ['b', 'a'])
@@ -4,6 +4,8 @@ unit tests for the Salt engines
 '''
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import threading
+import time
 
 # Import Salt Testing Libs
 from tests.support.mixins import LoaderModuleMockMixin
@@ -11,6 +13,7 @@ from tests.support.unit import skipIf, TestCase
 from tests.support.mock import (
     NO_MOCK,
     NO_MOCK_REASON,
+    MagicMock,
     patch)
 
 # Import Salt Libs
@@ -45,3 +48,51 @@ class BeaconsTestCase(TestCase, LoaderModuleMockMixin):
                           'data': {'id': u'minion', u'apache2': u'Stopped'},
                           'beacon_name': 'ps'}]
             self.assertEqual(ret, _expected)
+
+    def test_beacons_workers(self):
+        '''
+        Test a slow beacon running on the pool does not hold up the others
+        '''
+        event = threading.Event()
+        self.addCleanup(event.set)
+
+        def _slow(config):
+            event.wait(5)
+            return [{'slow': True}]
+
+        def _fast(config):
+            return [{'fast': True}]
+
+        opts = {'id': 'minion', 'loop_interval': 1, 'beacons_workers': 2}
+        config = {'slow': [{'beacon_timeout': 1}], 'fast': []}
+        loader = {'slow.beacon': _slow, 'fast.beacon': _fast}
+        self.addCleanup(beacons._RUNS.clear)
+        with patch('salt.loader.beacons', MagicMock(return_value=loader)):
+            beacon = salt.beacons.Beacon(opts, [])
+
+        def _process():
+            ret = []
+            for _ in range(50):
+                ret = beacon.process(config, {})
+                if ret:
+                    break
+                time.sleep(0.1)
+            return [event['tag'] for event in ret]
+
+        self.assertEqual(_process(), ['salt/beacon/minion/fast/'])
+        # The slow beacon is still running, it is skipped
+        self.assertIn('slow', beacon.running)
+        self.assertEqual(_process(), ['salt/beacon/minion/fast/'])
+
+        # The beacons are reloaded while the slow beacon is still running, it
+        # is not started again and its events are not lost
+        slow = MagicMock(side_effect=_slow)
+        loader['slow.beacon'] = slow
+        with patch('salt.loader.beacons', MagicMock(return_value=loader)):
+            beacon = salt.beacons.Beacon(opts, [])
+        self.assertIn('slow', beacon.running)
+        self.assertEqual(_process(), ['salt/beacon/minion/fast/'])
+        slow.assert_not_called()
+        event.set()
+        self.assertIn('salt/beacon/minion/slow/', _process())
+        self.assertNotIn('slow', beacon.running)
@@ -6,6 +6,9 @@
 # Import Python libs
 from __future__ import absolute_import
 import os
+import pickle
+import shutil
+import tempfile
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -20,6 +23,7 @@ from tests.support.mock import (
 # Import Salt libs
 import salt.cloud
 import salt.config
+from salt.exceptions import SaltCloudSystemExit
 
 EXAMPLE_PROVIDERS = {
  'nyc_vcenter': {'vmware': {'driver': 'vmware',
@@ -208,3 +212,167 @@ class MapConfTest(TestCase):
             # ie, the provider->profile->map inheritance works as expected
             map_data = cloud_map.map_data()
             self.assertEqual(map_data, merged_profile)
+
+
+class FakePool(object):
+    '''
+    Run the jobs as soon as they are submitted
+    '''
+    def __init__(self, *args, **kwargs):
+        self.terminated = False
+
+    def apply_async(self, func, args):
+        try:
+            return FakeResult(value=func(*args))
+        except Exception as exc:  # pylint: disable=broad-except
+            return FakeResult(error=exc)
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
+
+    def terminate(self):
+        self.terminated = True
+
+
+class FakeResult(object):
+    '''
+    The result of a job run by FakePool
+    '''
+    def __init__(self, value=None, error=None, ready=True):
+        self.value = value
+        self.error = error
+        self._ready = ready
+
+    def ready(self):
+        return self._ready
+
+    def wait(self, timeout=None):
+        pass
+
+    def get(self, timeout=None):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class MapRunTest(TestCase):
+    '''
+    Validate how salt-cloud maps are run
+    '''
+    def setUp(self):
+        self.mapper = salt.cloud.Map.__new__(salt.cloud.Map)
+        self.mapper.opts = {}
+
+    def test_create_parallel_requires(self):
+        '''
+        Ensure that VMs are created as soon as the VMs they require are
+        '''
+        dmap = {'create': {
+            'a': {},
+            'b': {'requires': ['a']},
+            'c': {'requires': ['a', 'existing']},
+            'd': {},
+        }}
+        parallel_data = [{'name': name} for name in ('b', 'c', 'a', 'd')]
+        created = []
+
+        def _create(data):
+            created.append(data['name'])
+            return {data['name']: {'created': data['name']}}
+
+        with patch('multiprocessing.Pool', FakePool), \
+                patch('salt.cloud.create_multiprocessing', _create):
+            output = self.mapper._create_parallel(parallel_data, dmap, 2)
+        self.assertEqual(created, ['a', 'd', 'b', 'c'])
+        self.assertEqual(output, [{name: {'created': name}} for name in created])
+
+    def test_create_parallel_lost_result(self):
+        '''
+        Ensure that a result which cannot be sent back fails the map
+        '''
+        dmap = {'create': {'a': {}, 'b': {'requires': ['a']}}}
+        parallel_data = [{'name': 'a'}, {'name': 'b'}]
+
+        def _create(data):
+            raise pickle.PicklingError('Can\'t pickle the result')
+
+        with patch('multiprocessing.Pool', FakePool), \
+                patch('salt.cloud.create_multiprocessing', _create):
+            with self.assertRaisesRegex(SaltCloudSystemExit, 'pickle'):
+                self.mapper._create_parallel(parallel_data, dmap, 2)
+
+    def test_create_parallel_timeout(self):
+        '''
+        Ensure that a worker which never returns does not hang the map
+        '''
+        self.mapper.opts['parallel_create_timeout'] = 0.1
+        dmap = {'create': {'a': {}}}
+        pools = []
+
+        class _HangingPool(FakePool):
+            def __init__(self, *args, **kwargs):
+                super(_HangingPool, self).__init__(*args, **kwargs)
+                pools.append(self)
+
+            def apply_async(self, func, args):
+                return FakeResult(ready=False)
+
+        with patch('multiprocessing.Pool', _HangingPool):
+            with self.assertRaisesRegex(SaltCloudSystemExit, 'did not finish'):
+                self.mapper._create_parallel([{'name': 'a'}], dmap, 1)
+        self.assertTrue(pools[0].terminated)
+
+    def test_query_cache_ttl(self):
+        '''
+        Ensure that provider queries are reused for query_cache_ttl seconds
+        '''
+        tmp_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.mapper.opts = salt.config.DEFAULT_MASTER_OPTS.copy()
+        self.mapper.opts.update({
+            'providers': {'prov': {'ec2': {}}, 'other': {'gce': {'query_cache_ttl': 0}}},
+            'query_cache_ttl': 30,
+            'cachedir': tmp_dir,
+        })
+        self.mapper.clouds = {'ec2.list_nodes': None, 'gce.list_nodes': None}
+        self.mapper.query_cache = None
+        self.mapper._Cloud__cached_provider_queries = {}
+
+        def _query(target, data, pool):
+            return [(item['alias'], item['driver'], {'vm1': {'state': 'running'}})
+                    for item in data]
+
+        def _queried(query):
+            return sorted(item['alias'] for item in query.call_args[0][1])
+
+        with patch('multiprocessing.Pool', MagicMock()), \
+                patch('salt.cloud.enter_mainloop', MagicMock(side_effect=_query)) as query:
+            expected = {'prov': {'ec2': {'vm1': {'state': 'running'}}},
+                        'other': {'gce': {'vm1': {'state': 'running'}}}}
+            self.assertEqual(self.mapper.map_providers_parallel(), expected)
+            self.assertEqual(_queried(query), ['other', 'prov'])
+            # The provider with a ttl of 0 is always queried
+            self.assertEqual(self.mapper.map_providers_parallel(), expected)
+            self.assertEqual(_queried(query), ['other'])
+            # Other processes read the cached query from the cloud cache
+            other = salt.cloud.Map.__new__(salt.cloud.Map)
+            other.opts = self.mapper.opts
+            other.clouds = self.mapper.clouds
+            other.query_cache = None
+            other._Cloud__cached_provider_queries = {}
+            self.assertEqual(other.map_providers_parallel(), expected)
+            self.assertEqual(_queried(query), ['other'])
+            self.mapper.map_providers_parallel(refresh=True)
+            self.assertEqual(_queried(query), ['other', 'prov'])
+            # Creating or destroying VMs drops the cache, the other processes
+            # see it at once
+            self.mapper.map_providers_parallel()
+            self.assertEqual(_queried(query), ['other'])
+            salt.cloud.clear_query_cache(other.opts)
+            self.mapper.map_providers_parallel()
+            self.assertEqual(_queried(query), ['other', 'prov'])
+            self.assertEqual(query.call_count, 6)
@@ -19,6 +19,7 @@ import shutil
 import sys
 import tempfile
 import textwrap
+import threading
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
@@ -308,6 +309,89 @@ class LazyLoaderGrainsBlacklistTest(TestCase):
         self.assertNotIn('ipv6', grains)
 
 
+class GrainsFuncsTest(TestCase):
+    '''
+    Test calling the grains functions in parallel and caching their results
+    '''
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.opts = {'cachedir': self.cachedir}
+
+    def tearDown(self):
+        shutil.rmtree(self.cachedir, ignore_errors=True)
+
+    def _calls(self, event):
+        def _fast():
+            return {'fast': True}
+
+        def _slow():
+            event.wait(5)
+            return {'slow': True}
+
+        def _broken():
+            raise ValueError('broken')
+
+        return [('custom.slow', _slow, {}),
+                ('custom.broken', _broken, {}),
+                ('custom.fast', _fast, {})]
+
+    def test_parallel(self):
+        event = threading.Event()
+        opts = dict(self.opts, grains_parallel=2)
+        func_cache = salt.loader._GrainsFuncCache(opts)
+        rets = list(salt.loader._call_grains_funcs(opts, self._calls(event), func_cache))
+        # The results come back in order
+        self.assertEqual([ret[0] for ret in rets],
+                         ['custom.slow', 'custom.broken', 'custom.fast'])
+        self.assertEqual(rets[0][1], {'slow': True})
+        self.assertIsInstance(rets[1][2][1], ValueError)
+        self.assertEqual(rets[2][1], {'fast': True})
+        self.assertEqual(sorted(func_cache.data['timings']),
+                         ['custom.broken', 'custom.fast', 'custom.slow'])
+
+    def test_parallel_timeout(self):
+        event = threading.Event()
+        opts = dict(self.opts, grains_parallel=3, grains_func_timeout=1)
+        func_cache = salt.loader._GrainsFuncCache(opts)
+        try:
+            rets = list(salt.loader._call_grains_funcs(opts, self._calls(event), func_cache))
+        finally:
+            event.set()
+        self.assertEqual(rets[0], ('custom.slow', None, None))
+        self.assertEqual(rets[2][1], {'fast': True})
+
+    def test_func_cache(self):
+        event = threading.Event()
+        event.set()
+        opts = dict(self.opts, grains_func_cache={'custom.s*': 60})
+        func_cache = salt.loader._GrainsFuncCache(opts)
+        list(salt.loader._call_grains_funcs(opts, self._calls(event), func_cache))
+        func_cache.write()
+        self.assertEqual(list(func_cache.data['funcs']), ['custom.slow'])
+
+        # The cached result is used, the other functions are called again
+        func_cache = salt.loader._GrainsFuncCache(opts)
+        calls = [('custom.slow', None, {}),
+                 ('custom.fast', lambda: {'fast': False}, {})]
+        rets = list(salt.loader._call_grains_funcs(opts, calls, func_cache))
+        self.assertEqual(rets, [('custom.slow', {'slow': True}, None),
+                                ('custom.fast', {'fast': False}, None)])
+
+
+    def test_func_cache_write(self):
+        cfn = os.path.join(self.cachedir, 'grains.funcs.p')
+        # Nothing is written with the default configuration
+        func_cache = salt.loader._GrainsFuncCache(self.opts)
+        func_cache.add('custom.fast', {'fast': True}, 0.1)
+        func_cache.write()
+        self.assertFalse(os.path.exists(cfn))
+
+        func_cache = salt.loader._GrainsFuncCache(dict(self.opts, grains_timings=True))
+        func_cache.add('custom.fast', {'fast': True}, 0.1)
+        func_cache.write()
+        self.assertTrue(os.path.exists(cfn))
+
+
 class LazyLoaderSingleItem(TestCase):
     '''
     Test loading a single item via the _load() function
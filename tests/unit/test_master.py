@@ -2,12 +2,26 @@
 
 # Import Python libs
 from __future__ import absolute_import
+import collections
+import copy
+import os
+import shutil
+import tempfile
 
 # Import Salt libs
 import salt.config
+import salt.crypt
 import salt.master
+import salt.payload
+import salt.pillar
+import salt.transport.frame
+import salt.transport.mixins.auth
+
+# Import 3rd-party libs
+from salt.ext import six
 
 # Import Salt Testing Libs
+from tests.support.runtests import RUNTIME_VARS
 from tests.support.unit import TestCase
 from tests.support.mock import (
     patch,
@@ -331,3 +345,108 @@ class ClearFuncsTestCase(TestCase):
                 patch('salt.utils.master.get_values_of_matching_keys', MagicMock(return_value=['test'])), \
                 patch('salt.utils.minions.CkMinions.auth_check', MagicMock(return_value=False)):
             self.assertEqual(mock_ret, self.clear_funcs.publish(load))
+
+
+class AESFuncsTestCase(TestCase):
+    '''
+    TestCase for salt.master.AESFuncs class
+    '''
+
+    def setUp(self):
+        self.cache = {}
+        self.aes_funcs = salt.master.AESFuncs.__new__(salt.master.AESFuncs)
+        self.aes_funcs.opts = {'pki_dir': '/', 'minion_data_cache': True}
+        self.aes_funcs.serial = salt.payload.Serial({})
+        self.aes_funcs.pillar_stats = collections.Counter()
+        self.aes_funcs.fs_ = MagicMock()
+        self.aes_funcs.masterapi = MagicMock()
+        self.aes_funcs.masterapi.cache.fetch.side_effect = \
+            lambda bank, key: self.cache.get((bank, key), {})
+        self.aes_funcs.masterapi.cache.store.side_effect = \
+            lambda bank, key, data: self.cache.__setitem__((bank, key), data)
+
+    def _pillar(self, load):
+        pillar = MagicMock()
+        pillar.compile_pillar.return_value = {'role': 'web'}
+        with patch('salt.pillar.get_pillar', MagicMock(return_value=pillar)) as get_pillar:
+            ret = self.aes_funcs._pillar(load)
+        return ret, get_pillar
+
+    def test_pillar_grains_delta(self):
+        store = self.aes_funcs.masterapi.cache.store
+        accepted = {'role': 'web', salt.pillar.GRAINS_DELTA_ACCEPTED: True}
+        ret, _ = self._pillar({'id': 'minion', 'grains': {'os': 'Linux'},
+                               'grains_version': 'v1'})
+        self.assertEqual(ret, accepted)
+        self.assertEqual(self.cache[('minions/minion', 'data')]['pillar'],
+                         {'role': 'web'})
+        self.assertEqual(store.call_count, 1)
+
+        # Nothing changed, nothing is written
+        self._pillar({'id': 'minion', 'grains': {'os': 'Linux'},
+                      'grains_version': 'v1'})
+        self.assertEqual(store.call_count, 1)
+        self.assertEqual(self.aes_funcs.pillar_stats['cache_writes_skipped'], 1)
+
+        ret, get_pillar = self._pillar({
+            'id': 'minion',
+            'grains_delta': {'base': 'v1', 'version': 'v2', 'changed': {'cpus': 4},
+                             'removed': [], 'size': 1000}})
+        self.assertEqual(ret, accepted)
+        self.assertEqual(get_pillar.call_args[0][1],
+                         {'os': 'Linux', 'cpus': 4, 'id': 'minion'})
+        self.assertEqual(store.call_count, 2)
+        data = self.cache[('minions/minion', 'data')]
+        self.assertEqual(data['grains'], {'os': 'Linux', 'cpus': 4, 'id': 'minion'})
+        self.assertEqual(data['grains_version'], 'v2')
+        self.assertGreater(self.aes_funcs.pillar_stats['grains_bytes_saved'], 0)
+
+        # A delta made against grains the master does not have
+        ret, _ = self._pillar({
+            'id': 'minion',
+            'grains_delta': {'base': 'v1', 'version': 'v3', 'changed': {},
+                             'removed': [], 'size': 1000}})
+        self.assertEqual(ret, salt.pillar.GRAINS_RESYNC)
+
+    def test_pillar_refresh_without_minion_data_cache(self):
+        '''
+        A minion syncing grains deltas with a master without the minion data
+        cache keeps its pillar, through the encryption of the reply
+        '''
+        pki_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, pki_dir, ignore_errors=True)
+        os.makedirs(os.path.join(pki_dir, 'minions'))
+        priv = salt.crypt.gen_keys(pki_dir, 'minion', 2048)
+        os.rename(os.path.join(pki_dir, 'minion.pub'),
+                  os.path.join(pki_dir, 'minions', 'minion'))
+        server = salt.transport.mixins.auth.AESReqServerMixin()
+        server.opts = {'pki_dir': pki_dir}
+        self.aes_funcs.opts['minion_data_cache'] = False
+        loads = []
+
+        def transfer(load, dictkey):
+            loads.append(copy.deepcopy(load))
+            ret, _ = self._pillar(load)
+            pret = server._encrypt_private(ret, dictkey, load['id'])
+            cipher = salt.transport.mixins.auth.PKCS1_OAEP.new(
+                salt.crypt.get_rsa_key(priv, None))
+            data = salt.crypt.Crypticle({}, cipher.decrypt(pret['key'])).loads(pret[dictkey])
+            if six.PY3:
+                data = salt.transport.frame.decode_embedded_strs(data)
+            return data
+
+        opts = {'renderer': 'json',
+                'pillarenv': None,
+                'grains_delta_sync': True,
+                'master_uri': 'tcp://127.0.0.1:4506'}
+        self.addCleanup(salt.pillar._GRAINS_SENT.clear)
+        channel = MagicMock(
+            crypted_transfer_decode_dictentry=MagicMock(side_effect=transfer))
+        with patch('salt.transport.Channel.factory', MagicMock(return_value=channel)):
+            pillar = salt.pillar.RemotePillar(opts, {'os': 'Linux'}, 'minion', 'base')
+        for cpus in (1, 2, 3):
+            pillar.grains = {'os': 'Linux', 'cpus': cpus}
+            self.assertEqual(pillar.compile_pillar(), {'role': 'web'})
+        # The whole grains are sent every time
+        self.assertEqual([load.get('grains') for load in loads],
+                         [{'os': 'Linux', 'cpus': cpus} for cpus in (1, 2, 3)])
@@ -9,6 +9,7 @@
 
 # Import python libs
 from __future__ import absolute_import
+import copy
 import shutil
 import tempfile
 
@@ -469,6 +470,46 @@ class PillarTestCase(TestCase):
                 ({'foo': 'bar', 'nested': {'level': {'foo': 'bar2'}}}, [])
             )
 
+    @patch('salt.fileclient.Client.list_states')
+    def test_render_pillar_merge(self, mock_list_states):
+        with patch('salt.pillar.compile_template') as compile_template:
+            opts = {
+                'optimization_order': [0, 1, 2],
+                'renderer': 'yaml',
+                'renderer_blacklist': [],
+                'renderer_whitelist': [],
+                'state_top': '',
+                'pillar_roots': [],
+                'file_roots': [],
+                'extension_modules': ''
+            }
+            mock_list_states.return_value = ['foo', 'bar']
+            pillar = salt.pillar.Pillar(opts, {}, 'mocked-minion', 'base')
+            pillar.client.get_state = MagicMock(
+                return_value={
+                    'dest': '/path/to/pillar/files/foo.sls',
+                    'source': 'salt://foo.sls'
+                }
+            )
+            foo = {'users': {'alice': {'uid': 1000}}, 'packages': {'vim': True}}
+            bar = {'users': {'bob': {'uid': 1001}}}
+            compile_template.side_effect = [
+                copy.deepcopy(foo),
+                copy.deepcopy(bar),
+            ]
+            with patch.object(salt.pillar.log, 'profile') as profile:
+                ret, errors = pillar.render_pillar({'base': ['foo', 'bar']})
+            self.assertEqual(errors, [])
+            self.assertEqual(ret, {
+                'users': {'alice': {'uid': 1000}, 'bob': {'uid': 1001}},
+                'packages': {'vim': True},
+            })
+            # The merge time of each sls is reported
+            self.assertEqual(
+                [call[0][1] for call in profile.call_args_list],
+                ['foo', 'bar'])
+            self.assertGreaterEqual(pillar.merge_time, 0)
+
     def test_includes_override_sls(self):
         opts = {
             'optimization_order': [0, 1, 2],
@@ -844,6 +885,80 @@ class RemotePillarTestCase(TestCase):
             dictkey='pillar')
 
 
+    def test_grains_delta_sync(self):
+        opts = {
+            'renderer': 'json',
+            'pillarenv': None,
+            'grains_delta_sync': True,
+            'master_uri': 'tcp://127.0.0.1:4506'}
+        loads = []
+        accepted = {salt.pillar.GRAINS_DELTA_ACCEPTED: True}
+        replies = [dict(accepted), dict(accepted), salt.pillar.GRAINS_RESYNC,
+                   dict(accepted)]
+
+        def transfer(load, dictkey):
+            loads.append(copy.deepcopy(load))
+            return replies.pop(0)
+
+        self.addCleanup(salt.pillar._GRAINS_SENT.clear)
+        mock_channel = MagicMock(
+            crypted_transfer_decode_dictentry=MagicMock(side_effect=transfer))
+        with patch('salt.transport.Channel.factory',
+                   MagicMock(return_value=mock_channel)):
+            pillar = salt.pillar.RemotePillar(opts, {'os': 'Linux', 'mounts': ['/']},
+                                              'mocked_minion', 'base')
+
+        # The whole grains are sent first
+        self.assertEqual(pillar.compile_pillar(), {})
+        self.assertEqual(loads[0]['grains'], {'os': 'Linux', 'mounts': ['/']})
+        self.assertIn('grains_version', loads[0])
+
+        # Then only the changes
+        pillar.grains = {'os': 'Linux', 'cpus': 4}
+        pillar.compile_pillar()
+        self.assertNotIn('grains', loads[1])
+        delta = loads[1]['grains_delta']
+        self.assertEqual(delta['base'], loads[0]['grains_version'])
+        self.assertEqual(delta['changed'], {'cpus': 4})
+        self.assertEqual(delta['removed'], ['mounts'])
+
+        # The whole grains are sent again when the master asks for them
+        pillar.grains = {'os': 'Linux', 'cpus': 8}
+        pillar.compile_pillar()
+        self.assertEqual(loads[2]['grains_delta']['changed'], {'cpus': 8})
+        self.assertEqual(loads[3]['grains'], {'os': 'Linux', 'cpus': 8})
+        self.assertEqual(loads[3]['grains_version'],
+                         loads[2]['grains_delta']['version'])
+
+    def test_grains_delta_sync_not_accepted(self):
+        opts = {
+            'renderer': 'json',
+            'pillarenv': None,
+            'grains_delta_sync': True,
+            'master_uri': 'tcp://127.0.0.1:4506'}
+        loads = []
+
+        def transfer(load, dictkey):
+            loads.append(copy.deepcopy(load))
+            return {'role': 'web'}
+
+        self.addCleanup(salt.pillar._GRAINS_SENT.clear)
+        mock_channel = MagicMock(
+            crypted_transfer_decode_dictentry=MagicMock(side_effect=transfer))
+        with patch('salt.transport.Channel.factory',
+                   MagicMock(return_value=mock_channel)):
+            pillar = salt.pillar.RemotePillar(opts, {'os': 'Linux'},
+                                              'mocked_minion', 'base')
+
+        # The master did not say it accepts grains deltas
+        self.assertEqual(pillar.compile_pillar(), {'role': 'web'})
+        pillar.grains = {'os': 'Linux', 'cpus': 4}
+        self.assertEqual(pillar.compile_pillar(), {'role': 'web'})
+        self.assertEqual(len(loads), 2)
+        self.assertEqual(loads[1]['grains'], {'os': 'Linux', 'cpus': 4})
+        self.assertNotIn('grains_delta', loads[1])
+
+
 @skipIf(NO_MOCK, NO_MOCK_REASON)
 @patch('salt.transport.client.AsyncReqChannel.factory', MagicMock())
 class AsyncRemotePillarTestCase(TestCase):
@@ -139,6 +139,40 @@ class UtilDictupdateTestCase(TestCase):
         self.assertEqual(res, mdict)
 
 
+    def test_update_shared(self):
+        '''
+        Test that update_shared returns what update returns on a copy, without
+        modifying its arguments, and shares what it did not change
+        '''
+        cases = [
+            ({'A': 'Z'}, False),
+            ({'A': [2, 3]}, True),
+            ({'C': {'D': ['c', 'd']}}, False),
+            ({'C': {'F': {'G': 'Z', 'K': {'L': 'M'}}}}, False),
+            ({'C': 'Z'}, False),
+            ({'Z': {'Y': {'X': 'W'}}}, False),
+        ]
+        for upd, merge_lists in cases:
+            dest = copy.deepcopy(self.dict1)
+            dest['A'] = [1, 2]
+            orig_dest, orig_upd = copy.deepcopy(dest), copy.deepcopy(upd)
+            res = dictupdate.update_shared(dest, upd, merge_lists=merge_lists)
+            self.assertEqual(
+                res,
+                dictupdate.update(copy.deepcopy(dest), upd,
+                                  merge_lists=merge_lists))
+            self.assertEqual(dest, orig_dest)
+            self.assertEqual(upd, orig_upd)
+            self.assertIsNot(res, dest)
+
+        dest = copy.deepcopy(self.dict1)
+        res = dictupdate.update_shared(dest, {'C': {'D': 'Z'}})
+        self.assertIsNot(res['C'], dest['C'])
+        self.assertIs(res['C']['F'], dest['C']['F'])
+
+        self.assertRaises(TypeError, dictupdate.update_shared, dest, ['A'])
+
+
 class UtilDictMergeTestCase(TestCase):
 
     dict1 = {'A': 'B', 'C': {'D': 'E', 'F': {'G': 'H', 'I': 'J'}}}
@@ -195,3 +229,17 @@ class UtilDictMergeTestCase(TestCase):
         mdict1['A'] = ['B']
         ret = dictupdate.merge_list(mdict1, {'A': ['b', 'c']})
         self.assertEqual({'A': [['B'], ['b', 'c']], 'C': {'D': 'E', 'F': {'I': 'J', 'G': 'H'}}}, ret)
+
+    def test_merge_share(self):
+        '''
+        Test that sharing gives the same result without copying obj_a
+        '''
+        upd = {'C': {'D': 'Z'}, 'X': 'Y'}
+        for strategy in ('recurse', 'overwrite', 'none'):
+            obj_a = copy.deepcopy(self.dict1)
+            expected = dictupdate.merge(copy.deepcopy(obj_a), upd, strategy)
+            ret = dictupdate.merge(obj_a, upd, strategy, share=True)
+            self.assertEqual(ret, expected)
+            if strategy != 'overwrite':
+                self.assertEqual(obj_a, self.dict1)
+                self.assertIs(ret['C']['F'], obj_a['C']['F'])
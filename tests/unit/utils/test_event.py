@@ -23,8 +23,10 @@ from multiprocessing import Process
 
 # Import Salt Testing libs
 from tests.support.unit import expectedFailure, skipIf, TestCase
+from tests.support.mock import MagicMock, patch, NO_MOCK, NO_MOCK_REASON
 
 # Import salt libs
+import salt.payload
 import salt.utils.event
 import salt.utils.stringutils
 import tests.integration as integration
@@ -133,6 +135,20 @@ class TestSaltEvent(TestCase):
             )
         )
 
+    def test_unpack_tag(self):
+        '''Test that the tag can be split off without decoding the payload'''
+        serial = salt.payload.Serial({'serial': 'msgpack'})
+        raw = b''.join([
+            b'salt/job/20190101/ret',
+            salt.utils.stringutils.to_bytes(salt.utils.event.TAGEND),
+            serial.dumps({'foo': 'bar'}, use_bin_type=True)])
+        mtag, mdata = salt.utils.event.SaltEvent.unpack_tag(raw)
+        self.assertEqual(mtag, 'salt/job/20190101/ret')
+        self.assertEqual(serial.loads(mdata, encoding='utf-8'), {'foo': 'bar'})
+        self.assertEqual(
+            salt.utils.event.SaltEvent.unpack(raw),
+            ('salt/job/20190101/ret', {'foo': 'bar'}))
+
     def test_minion_event_tcp_ipc_mode(self):
         opts = dict(id='foo', ipc_mode='tcp')
         me = salt.utils.event.MinionEvent(opts, listen=False)
@@ -366,3 +382,49 @@ class TestAsyncEventPublisher(AsyncTestCase):
         self.assertEqual(self.tag, 'evt1')
         self.data.pop('_stamp')  # drop the stamp
         self.assertEqual(self.data, {'data': 'foo1'})
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class TestEventReturn(TestCase):
+    def setUp(self):
+        self.opts = {
+            'event_return': 'mysql',
+            'event_return_queue': 2,
+            'event_return_whitelist': ['salt/job/*', 'salt/run/*/ret'],
+            'event_return_blacklist': ['salt/job/*/new'],
+        }
+        self.returner = MagicMock()
+        minion = MagicMock(returners={'mysql.event_return': self.returner})
+        with patch('salt.minion.MasterMinion', MagicMock(return_value=minion)):
+            self.event_return = salt.utils.event.EventReturn(self.opts)
+
+    def test_filter(self):
+        '''Test that the compiled white and black lists are honoured'''
+        _filter = self.event_return._filter
+        self.assertTrue(_filter({'tag': 'salt/job/123/ret/minion'}))
+        self.assertTrue(_filter({'tag': 'salt/run/123/ret'}))
+        self.assertFalse(_filter({'tag': 'salt/job/123/new'}))
+        self.assertFalse(_filter({'tag': 'salt/auth'}))
+
+    def test_flush_events_sync(self):
+        '''Test that a synchronous flush calls the returner directly'''
+        events = [{'tag': 'salt/job/1/ret/a', 'data': {}}]
+        self.event_return.event_queue.extend(events)
+        self.event_return.flush_events(sync=True)
+        self.returner.assert_called_once_with(events)
+        self.assertEqual(self.event_return.event_queue, [])
+        self.assertEqual(self.event_return.stats['mysql.event_return']['flushed'], 1)
+
+    def test_flush_events_drop(self):
+        '''Test that a batch is dropped when the returner falls behind'''
+        self.event_return.event_return_full_policy = 'drop'
+        pool = MagicMock()
+        pool.fire_async.return_value = False
+        self.event_return.pools['mysql.event_return'] = pool
+        self.event_return.event_queue.extend([{'tag': 'salt/job/1/ret/a', 'data': {}}])
+        self.event_return.flush_events()
+        stats = self.event_return.stats['mysql.event_return']
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['batches_queued'], 0)
+        self.assertEqual(self.event_return.event_queue, [])
+        self.returner.assert_not_called()
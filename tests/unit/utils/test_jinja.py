@@ -38,6 +38,7 @@ from salt.utils.jinja import (
     tojson
 )
 from salt.utils.odict import OrderedDict
+import salt.utils.templates
 from salt.utils.templates import JINJA, render_jinja_tmpl
 
 # dateutils is needed so that the strftime jinja filter is loaded
@@ -303,6 +304,77 @@ class TestGetTemplate(TestCase):
             self.assertEqual(out, 'Hey world !Hi Salt !' + os.linesep)
             self.assertEqual(fc.requests[0]['path'], 'salt://macro')
 
+    def test_compiled_template_cache(self):
+        '''
+        A template is compiled once per set of environment options, and its
+        code is kept in the bytecode cache when it is enabled
+        '''
+        self.addCleanup(salt.utils.templates._JINJA_CODE.clear)
+        salt.utils.templates._JINJA_CODE.clear()
+        template = '{{ a }} ## {{ b }}'
+        opts = dict(self.local_opts, jinja_template_cache=True,
+                    jinja_bytecode_cache=True)
+        with patch.object(Environment, 'compile', autospec=True,
+                          side_effect=Environment.compile) as compile_:
+            out = render_jinja_tmpl(template, dict(opts=opts, saltenv='test', a=1, b=2))
+            self.assertEqual(out, '1 ## 2')
+            out = render_jinja_tmpl(template, dict(opts=opts, saltenv='test', a=3, b=4))
+            self.assertEqual(out, '3 ## 4')
+            self.assertEqual(compile_.call_count, 1)
+
+            # Other environment options need another compilation
+            out = render_jinja_tmpl(template, dict(
+                opts=dict(opts, jinja_env={'line_comment_prefix': '##'}),
+                saltenv='test', a=1, b=2))
+            self.assertEqual(out, '1')
+            self.assertEqual(compile_.call_count, 2)
+
+            # Another process loads the code from the bytecode cache
+            salt.utils.templates._JINJA_CODE.clear()
+            out = render_jinja_tmpl(template, dict(opts=opts, saltenv='test', a=5, b=6))
+            self.assertEqual(out, '5 ## 6')
+            self.assertEqual(compile_.call_count, 2)
+        self.assertTrue(os.listdir(os.path.join(self.tempdir, 'jinja')))
+
+    def test_compiled_template_cache_volatile_filters(self):
+        '''
+        Filters applied to constants are not frozen in the cached code
+        '''
+        self.addCleanup(salt.utils.templates._JINJA_CODE.clear)
+        salt.utils.templates._JINJA_CODE.clear()
+        template = '{{ 100000000 | random_hash }}'
+        for opts in (dict(self.local_opts, jinja_template_cache=True),
+                     dict(self.local_opts, jinja_bytecode_cache=True)):
+            outs = set(render_jinja_tmpl(template, dict(opts=opts, saltenv='test'))
+                       for _ in range(3))
+            self.assertEqual(len(outs), 3)
+
+        # Nor in the bytecode of the included templates
+        opts = dict(self.local_opts, jinja_bytecode_cache=True)
+        outs = set()
+        for _ in range(3):
+            env = Environment(
+                loader=DictLoader({'included': template}),
+                bytecode_cache=salt.utils.templates._get_jinja_bytecode_cache(opts))
+            env.filters.update(JinjaFilter.salt_jinja_filters)
+            outs.add(env.from_string('{% include "included" %}').render())
+        self.assertEqual(len(outs), 3)
+        self.assertEqual(os.listdir(os.path.join(self.tempdir, 'jinja')), [])
+
+    def test_compiled_template_cache_disabled(self):
+        '''
+        Templates are compiled on every render by default
+        '''
+        template = '{{ a }}'
+        with patch.object(Environment, 'compile', autospec=True,
+                          side_effect=Environment.compile) as compile_:
+            for value in range(2):
+                out = render_jinja_tmpl(template, dict(opts=self.local_opts,
+                                                       saltenv='test', a=value))
+                self.assertEqual(out, str(value))
+            self.assertEqual(compile_.call_count, 2)
+        self.assertEqual(salt.utils.templates._JINJA_CODE, {})
+
     def test_macro_additional_log_for_generalexc(self):
         '''
         If we failed in a macro because of e.g. a TypeError, get
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+'''
+Tests for salt.utils.job
+'''
+
+# Import Python libs
+from __future__ import absolute_import, unicode_literals
+import calendar
+import time
+
+# Import Salt libs
+import salt.utils.jid
+import salt.utils.job
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import (
+    NO_MOCK,
+    NO_MOCK_REASON
+)
+
+
+class FakeCache(object):
+    def __init__(self):
+        self.data = {}
+
+    def store(self, bank, key, data):
+        self.data[(bank, key)] = data
+
+    def fetch(self, bank, key):
+        return self.data.get((bank, key), {})
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class JobStatusTestCase(TestCase):
+    def setUp(self):
+        self.opts = {'job_status_ttl': 60}
+        self.cache = FakeCache()
+
+    def test_store_running(self):
+        salt.utils.job.store_running(
+            self.opts, 'minion1',
+            [{'jid': '1', 'fun': 'test.sleep', 'pid': 123, 'ret': ''}, 'garbage'],
+            cache=self.cache)
+        data = self.cache.fetch('minions/minion1', 'running')
+        self.assertEqual(data['jobs'], [{'jid': '1', 'fun': 'test.sleep', 'pid': 123}])
+
+    def test_get_running(self):
+        salt.utils.job.store_running(self.opts, 'minion1', [{'jid': '1'}], cache=self.cache)
+        self.assertEqual(
+            salt.utils.job.get_running(self.opts, 'minion1', cache=self.cache),
+            [{'jid': '1'}])
+        # Unknown minion
+        self.assertIsNone(salt.utils.job.get_running(self.opts, 'minion2', cache=self.cache))
+        # Disabled
+        self.assertIsNone(
+            salt.utils.job.get_running({'job_status_ttl': 0}, 'minion1', cache=self.cache))
+        # Stale report
+        self.cache.data[('minions/minion1', 'running')]['time'] = time.time() - 61
+        self.assertIsNone(salt.utils.job.get_running(self.opts, 'minion1', cache=self.cache))
+
+    def test_get_running_since(self):
+        salt.utils.job.store_running(self.opts, 'minion1', [{'jid': '1'}], cache=self.cache)
+        stamp = self.cache.data[('minions/minion1', 'running')]['time']
+        self.assertEqual(
+            salt.utils.job.get_running(self.opts, 'minion1', cache=self.cache,
+                                       since=stamp - 1),
+            [{'jid': '1'}])
+        self.assertIsNone(
+            salt.utils.job.get_running(self.opts, 'minion1', cache=self.cache,
+                                       since=stamp))
+
+    def test_check_running(self):
+        jid = salt.utils.jid.gen_jid({})
+        salt.utils.job.store_running(self.opts, 'minion1', [{'jid': jid}], cache=self.cache)
+        salt.utils.job.store_running(self.opts, 'minion2', [{'jid': '2'}], cache=self.cache)
+        running, unknown = salt.utils.job.check_running(
+            self.opts, jid, ['minion1', 'minion2', 'minion3'], cache=self.cache)
+        self.assertEqual(running, set(['minion1']))
+        # minion2 may have reported before it received the job
+        self.assertEqual(unknown, set(['minion2', 'minion3']))
+
+    def test_check_running_report_before_job(self):
+        '''
+        A report sent before the job started can not tell the job is not
+        running
+        '''
+        salt.utils.job.store_running(self.opts, 'minion1', [], cache=self.cache)
+        self.cache.data[('minions/minion1', 'running')]['time'] -= 5
+        jid = salt.utils.jid.gen_jid({})
+        running, unknown = salt.utils.job.check_running(
+            self.opts, jid, ['minion1'], cache=self.cache)
+        self.assertEqual(running, set())
+        self.assertEqual(unknown, set(['minion1']))
+
+        # Nor a report listing the job sent before the jid was generated
+        salt.utils.job.store_running(self.opts, 'minion1', [{'jid': jid}], cache=self.cache)
+        self.cache.data[('minions/minion1', 'running')]['time'] -= 5
+        running, unknown = salt.utils.job.check_running(
+            self.opts, jid, ['minion1'], cache=self.cache)
+        self.assertEqual(unknown, set(['minion1']))
+
+        # Without a usable start time nothing is trusted
+        running, unknown = salt.utils.job.check_running(
+            self.opts, 'notajid', ['minion1'], cache=self.cache)
+        self.assertEqual(unknown, set(['minion1']))
+
+    def test_jid_time(self):
+        jid = '20190102030405123456'
+        local = salt.utils.job._jid_time(jid)
+        self.assertEqual(
+            local, time.mktime((2019, 1, 2, 3, 4, 5, 0, 0, -1)) + 0.123456)
+        self.assertEqual(salt.utils.job._jid_time(jid, utc=True),
+                         calendar.timegm((2019, 1, 2, 3, 4, 5, 0, 0, 0)) + 0.123456)
+        self.assertIsNone(salt.utils.job._jid_time('notajid'))
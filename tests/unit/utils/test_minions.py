@@ -42,6 +42,21 @@ class MinionsTestCase(TestCase):
             ret = salt.utils.minions.nodegroup_comp(nodegroup, NODEGROUPS)
             self.assertEqual(ret, expected)
 
+    def test_fetch_mine_empty_data(self):
+        '''
+        Test that mine functions which returned an empty dict are told from
+        the functions missing from the mine
+        '''
+        bank = salt.utils.minions.mine_bank('minion')
+        stored = {(bank, 'empty'): {}, (bank, 'full'): {'a': 1}}
+        cache = MagicMock()
+        cache.fetch_many.side_effect = lambda bank_keys: dict(
+            (bank_key, stored.get(bank_key, {})) for bank_key in bank_keys)
+        cache.contains.side_effect = lambda bank, key: (bank, key) in stored
+        ret = salt.utils.minions.fetch_mine(
+            cache, ['minion'], ['empty', 'full', 'missing'])
+        self.assertEqual(ret, {'minion': {'empty': {}, 'full': {'a': 1}}})
+
 
 class CkMinionsTestCase(TestCase):
     '''
@@ -5,6 +5,7 @@ import codecs
 import glob
 import logging
 import os
+import time
 import textwrap
 
 import salt.loader
@@ -12,7 +13,9 @@ import salt.utils.data
 import salt.utils.files
 import salt.utils.reactor as reactor
 import salt.utils.yaml
+from salt.ext import six
 
+from tests.support.runtests import RUNTIME_VARS
 from tests.support.unit import TestCase, skipIf
 from tests.support.mixins import AdaptedConfigurationTestCaseMixin
 from tests.support.mock import (
@@ -417,6 +420,85 @@ class TestReactor(TestCase, AdaptedConfigurationTestCaseMixin):
                     self.reaction_map[tag]
                 )
 
+    def test_list_reactors_glob(self):
+        '''
+        Ensure that globbed tags are matched, and that a tag matching no glob
+        returns no reactors.
+        '''
+        self.reactor.add_reactor('salt/minion/*/start', ['/srv/reactor/start.sls'])
+        try:
+            self.assertEqual(
+                self.reactor.list_reactors('salt/minion/foo/start'),
+                ['/srv/reactor/start.sls'])
+            self.assertEqual(self.reactor.list_reactors('salt/auth'), [])
+        finally:
+            self.reactor.delete_reactor('salt/minion/*/start')
+        self.assertEqual(self.reactor.list_reactors('salt/minion/foo/start'), [])
+
+    def test_render_cache_key(self):
+        '''
+        Ensure that only the reactor SLS files marked as not depending on the
+        event data are cached, per tag, and that they are only read again
+        once modified.
+        '''
+        contents = {
+            'marked': '#!jinja|yaml\n# reactor_render_cache: True\n'
+                      'foo:\n  local.test.ping:\n    - tgt: {{ tag }}\n',
+            'unmarked': 'foo:\n  local.test.ping:\n    - tgt: \'*\'\n',
+        }
+        paths = {}
+        for name, content in six.iteritems(contents):
+            paths[name] = os.path.join(RUNTIME_VARS.TMP, 'reactor_{0}.sls'.format(name))
+            with salt.utils.files.fopen(paths[name], 'w') as fp_:
+                fp_.write(content)
+            self.addCleanup(os.remove, paths[name])
+        self.addCleanup(self.reactor._cacheable.clear)
+
+        with patch.dict(self.reactor.opts, {'reactor_render_cache': False}):
+            self.assertIsNone(self.reactor._render_cache_key(paths['marked'], 'foo'))
+        with patch.dict(self.reactor.opts, {'reactor_render_cache': True}):
+            self.assertEqual(
+                self.reactor._render_cache_key(paths['marked'], 'foo'),
+                (paths['marked'], os.path.getmtime(paths['marked']), 'foo'))
+            self.assertIsNone(self.reactor._render_cache_key(paths['unmarked'], 'foo'))
+
+            with patch.object(self.reactor, '_is_cacheable') as is_cacheable:
+                self.reactor._render_cache_key(paths['marked'], 'bar')
+                is_cacheable.assert_not_called()
+                mtime = os.path.getmtime(paths['marked']) + 10
+                os.utime(paths['marked'], (mtime, mtime))
+                is_cacheable.return_value = False
+                self.assertIsNone(self.reactor._render_cache_key(paths['marked'], 'foo'))
+                is_cacheable.assert_called_once_with(paths['marked'])
+
+    def test_render_cache_size(self):
+        '''
+        Ensure that the renders cached for many distinct tags are bounded,
+        and expire
+        '''
+        path = os.path.join(RUNTIME_VARS.TMP, 'reactor_cached.sls')
+        with salt.utils.files.fopen(path, 'w') as fp_:
+            fp_.write('#!jinja|yaml\n# reactor_render_cache: True\n'
+                      'foo:\n  local.test.ping:\n    - tgt: \'*\'\n')
+        self.addCleanup(os.remove, path)
+        self.addCleanup(self.reactor._cacheable.clear)
+        self.addCleanup(self.reactor._render_cache.clear)
+
+        render = MagicMock(side_effect=lambda fn_, tag, data: {'foo': {'tag': tag}})
+        with patch.dict(self.reactor.opts, {'reactor_render_cache': True}), \
+                patch.object(reactor, 'REACTOR_RENDER_CACHE_MAX', 10), \
+                patch.object(self.reactor, 'render_template', render):
+            for idx in range(25):
+                self.reactor.render_reaction(path, 'salt/job/{0}'.format(idx), {})
+            self.assertEqual(len(self.reactor._render_cache), 10)
+            # The most recent renders are kept
+            self.reactor.render_reaction(path, 'salt/job/24', {})
+            self.assertEqual(render.call_count, 25)
+            with patch('time.time', MagicMock(
+                    return_value=time.time() + self.reactor.opts['reactor_refresh_interval'] + 1)):
+                self.reactor.render_reaction(path, 'salt/job/24', {})
+            self.assertEqual(render.call_count, 26)
+
     def test_reactions(self):
         '''
         Ensure that the correct reactions are built from the configured SLS
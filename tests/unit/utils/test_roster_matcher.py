@@ -7,9 +7,12 @@ Test generic roster matching utility.
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import os
+import shutil
+import tempfile
 
 # Import Salt Testing Libs
 from tests.support.mock import (
+    MagicMock,
     NO_MOCK,
     NO_MOCK_REASON,
 )
@@ -20,6 +23,7 @@ from tests.support.runtests import RUNTIME_VARS
 # Import Salt Libs
 import salt.config
 import salt.loader
+import salt.utils.files
 import salt.utils.roster_matcher
 
 EXPECTED = {
@@ -173,6 +177,116 @@ class RosterMatcherTestCase(TestCase, mixins.LoaderModuleMockMixin):
         with self.assertRaises(RuntimeError):
             salt.utils.roster_matcher.targets(EXPECTED, None, 'range')
 
+    def test_compiled_glob_minions(self):
+        """
+        Test that a compiled roster matches globs the same way.
+        """
+        compiled = salt.utils.roster_matcher.CompiledRoster(EXPECTED)
+        for tgt in ('*[245]', 'host[13]', 'host*', 'host2', 'ho?t1', 'nohost*', 'host6'):
+            self.assertEqual(
+                salt.utils.roster_matcher.targets(compiled, tgt, 'glob'),
+                salt.utils.roster_matcher.targets(EXPECTED, tgt, 'glob'))
+
+    def test_ret_grain_minions(self):
+        """
+        Test that we return minions matching their roster grains.
+        """
+        raw = {
+            'web1': {'host': 'web1', 'grains': {'role': 'web', 'roles': ['a', 'b']}},
+            'web2': {'host': 'web2', 'grains': {'role': 'Web'}},
+            'db1': {'host': 'db1', 'grains': {'role': 'db', 'nested': {'key': 'val'}}},
+            'bare': {'host': 'bare'},
+        }
+        compiled = salt.utils.roster_matcher.CompiledRoster(raw)
+        for tgt, expected in (('role:web', ['web1', 'web2']),
+                              ('role:w*', ['web1', 'web2']),
+                              ('roles:b', ['web1']),
+                              ('nested:key:val', ['db1']),
+                              ('role:none', [])):
+            for roster in (raw, compiled):
+                result = salt.utils.roster_matcher.targets(roster, tgt, 'grain')
+                self.assertEqual(sorted(result), expected)
+
+    def test_compile_roster_cache(self):
+        """
+        Test that the compiled roster is reused until its source changes.
+        """
+        tmp_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.addCleanup(salt.utils.roster_matcher._COMPILED.clear)
+        source = os.path.join(tmp_dir, 'roster.yml')
+        with salt.utils.files.fopen(source, 'w') as fp_:
+            fp_.write('host1')
+        opts = {'cachedir': tmp_dir, 'roster_cache': True}
+        compile_fn = MagicMock(side_effect=lambda src: {'host1': {'host': 'host1'}})
+
+        ret = salt.utils.roster_matcher.compile_roster(opts, source, compile_fn)
+        self.assertIsInstance(ret, salt.utils.roster_matcher.CompiledRoster)
+        self.assertEqual(ret, {'host1': {'host': 'host1'}})
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn)
+        self.assertEqual(compile_fn.call_count, 1)
+
+        # Another process reads the compiled roster from the cachedir
+        salt.utils.roster_matcher._COMPILED.clear()
+        ret = salt.utils.roster_matcher.compile_roster(opts, source, compile_fn)
+        self.assertEqual(ret, {'host1': {'host': 'host1'}})
+        self.assertEqual(compile_fn.call_count, 1)
+
+        # Touching the source does not compile it again, changing it does
+        os.utime(source, (0, 0))
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn)
+        self.assertEqual(compile_fn.call_count, 1)
+        with salt.utils.files.fopen(source, 'w') as fp_:
+            fp_.write('host2')
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn)
+        self.assertEqual(compile_fn.call_count, 2)
+
+        # Disabled
+        salt.utils.roster_matcher.compile_roster({}, source, compile_fn)
+        self.assertEqual(compile_fn.call_count, 3)
+
+    def test_compile_roster_cache_depends(self):
+        """
+        Test that the compiled roster is compiled again when the files it
+        depends on change.
+        """
+        tmp_dir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.addCleanup(salt.utils.roster_matcher._COMPILED.clear)
+        source = os.path.join(tmp_dir, 'hosts')
+        with salt.utils.files.fopen(source, 'w') as fp_:
+            fp_.write('host1')
+        group_vars = os.path.join(tmp_dir, 'group_vars')
+        host_vars = os.path.join(tmp_dir, 'host_vars')
+        os.makedirs(group_vars)
+        depends = [group_vars, host_vars]
+        opts = {'cachedir': tmp_dir, 'roster_cache': True}
+        compile_fn = MagicMock(side_effect=lambda src: {'host1': {'host': 'host1'}})
+
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn, depends)
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn, depends)
+        self.assertEqual(compile_fn.call_count, 1)
+        # A file is added, then edited
+        group_file = os.path.join(group_vars, 'all.yml')
+        with salt.utils.files.fopen(group_file, 'w') as fp_:
+            fp_.write('port: 22')
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn, depends)
+        self.assertEqual(compile_fn.call_count, 2)
+        with salt.utils.files.fopen(group_file, 'w') as fp_:
+            fp_.write('port: 23')
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn, depends)
+        self.assertEqual(compile_fn.call_count, 3)
+        # A directory is created
+        os.makedirs(host_vars)
+        with salt.utils.files.fopen(os.path.join(host_vars, 'host1.yml'), 'w') as fp_:
+            fp_.write('user: admin')
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn, depends)
+        self.assertEqual(compile_fn.call_count, 4)
+        # Touching a file does not compile it again
+        os.utime(group_file, (0, 0))
+        salt.utils.roster_matcher.compile_roster(opts, source, compile_fn, depends)
+        self.assertEqual(compile_fn.call_count, 4)
+
     @skipIf(not salt.utils.roster_matcher.HAS_RANGE, 'seco.range is not installed')
     def test_ret_range_minions(self):
         """
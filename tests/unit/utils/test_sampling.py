@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+'''
+Tests for salt.utils.sampling
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import NO_MOCK, NO_MOCK_REASON, MagicMock, patch
+
+# Import Salt libs
+import salt.utils.sampling
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class SamplingTestCase(TestCase):
+    def setUp(self):
+        salt.utils.sampling.clear()
+        self.addCleanup(salt.utils.sampling.clear)
+
+    def test_sample_without_period(self):
+        func = MagicMock(side_effect=[1, 2])
+        opts = {'system_sample_period': 0}
+        self.assertEqual(salt.utils.sampling.sample(opts, 'key', func), 1)
+        self.assertEqual(salt.utils.sampling.sample(opts, 'key', func), 2)
+
+    def test_sample_is_shared_within_period(self):
+        func = MagicMock(side_effect=[1, 2])
+        opts = {'system_sample_period': 10}
+        with patch('time.time', MagicMock(return_value=100)):
+            self.assertEqual(salt.utils.sampling.sample(opts, 'key', func), 1)
+            self.assertEqual(salt.utils.sampling.sample(opts, 'key', func), 1)
+        func.assert_called_once_with()
+        # Samples are taken again once the period is over
+        with patch('time.time', MagicMock(return_value=111)):
+            self.assertEqual(salt.utils.sampling.sample(opts, 'key', func), 2)
+
+    def test_sample_keys(self):
+        opts = {'system_sample_period': 10}
+        func = MagicMock(side_effect=lambda path: path)
+        self.assertEqual(
+            salt.utils.sampling.sample(opts, ('disk_usage', '/'), func, '/'), '/')
+        self.assertEqual(
+            salt.utils.sampling.sample(opts, ('disk_usage', '/var'), func, '/var'), '/var')
+        self.assertEqual(func.call_count, 2)
+
+    def test_errors_are_not_cached(self):
+        func = MagicMock(side_effect=[OSError, 1])
+        opts = {'system_sample_period': 10}
+        self.assertRaises(OSError, salt.utils.sampling.sample, opts, 'key', func)
+        self.assertEqual(salt.utils.sampling.sample(opts, 'key', func), 1)
+
+    def test_old_keys_are_dropped(self):
+        opts = {'system_sample_period': 10}
+        func = MagicMock(side_effect=lambda path: path)
+        with patch('time.time', MagicMock(return_value=100)):
+            salt.utils.sampling.sample(opts, ('disk_usage', '/'), func, '/')
+            salt.utils.sampling.sample(opts, ('disk_usage', '/mnt'), func, '/mnt')
+        with patch('time.time', MagicMock(return_value=111)):
+            salt.utils.sampling.sample(opts, ('disk_usage', '/var'), func, '/var')
+        self.assertEqual(list(salt.utils.sampling._SAMPLES), [('disk_usage', '/var')])
+        self.assertEqual(list(salt.utils.sampling._LOCKS), [('disk_usage', '/var')])
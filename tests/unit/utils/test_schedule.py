@@ -334,6 +334,51 @@ class ScheduleTestCase(TestCase):
         self.assertTrue(self.schedule.opts['schedule']['testjob']['_splay'] >
                         self.schedule.opts['schedule']['testjob']['_next_fire_time'])
 
+    def test_eval_parks_job_until_due(self):
+        '''
+        Tests eval only looks at a job again once its next fire time has come
+        '''
+        job = {'function': 'test.true', 'seconds': 60}
+        self.schedule.opts.update({'pillar': {'schedule': {}}})
+        self.schedule.opts.update({'schedule': {'testjob': job}})
+        now = datetime.datetime(2019, 1, 1, 12, 0, 0)
+        run_job = MagicMock()
+        with patch.object(self.schedule, '_run_job', run_job), \
+                patch.object(self.schedule, '_get_running_jobs', MagicMock(return_value=[])):
+            self.schedule.eval(now=now)
+            fire_time = now + datetime.timedelta(seconds=60)
+            self.assertEqual(self.schedule._parked['testjob'], (fire_time, job))
+            self.assertEqual(self.schedule._fire_heap[0], (fire_time, 'testjob'))
+
+            # Parked jobs are not looked at
+            job['_continue'] = True
+            self.schedule.eval(now=now + datetime.timedelta(seconds=30))
+            self.assertTrue(job['_continue'])
+            del job['_continue']
+
+            self.schedule.eval(now=fire_time)
+            run_job.assert_called_once_with('test.true', job)
+            self.assertEqual(self.schedule._parked['testjob'],
+                             (fire_time + datetime.timedelta(seconds=60), job))
+
+    def test_eval_replaced_job_is_unparked(self):
+        '''
+        Tests eval looks at a parked job again when it is replaced
+        '''
+        self.schedule.opts.update({'pillar': {'schedule': {}}})
+        self.schedule.opts.update({'schedule': {'testjob': {'function': 'test.true', 'seconds': 60}}})
+        now = datetime.datetime(2019, 1, 1, 12, 0, 0)
+        self.schedule.eval(now=now)
+        self.assertIn('testjob', self.schedule._parked)
+
+        self.schedule.opts['schedule']['testjob'] = {'function': 'test.true', 'seconds': 10}
+        self.schedule.eval(now=now + datetime.timedelta(seconds=1))
+        self.assertEqual(self.schedule._parked['testjob'][0],
+                         now + datetime.timedelta(seconds=11))
+
+        self.schedule.delete_job('testjob', persist=False)
+        self.assertNotIn('testjob', self.schedule._parked)
+
     def test_handle_func_schedule_minion_blackout(self):
         '''
         Tests eval if the schedule from pillar is not a dictionary
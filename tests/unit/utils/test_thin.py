@@ -5,7 +5,9 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 import os
+import shutil
 import sys
+import tempfile
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import (
     NO_MOCK,
@@ -14,6 +16,8 @@ from tests.support.mock import (
     patch)
 
 import salt.exceptions
+import salt.utils.files
+import salt.utils.hashutils
 from salt.utils import thin
 from salt.utils import json
 import salt.utils.stringutils
@@ -392,6 +396,29 @@ class SSHThinTestCase(TestCase):
         assert path == '/path/to/thin/thin.tgz'
         assert form == 'sha256'
 
+    def test_thin_sum_cached(self):
+        '''
+        Test thin.thin_sum function does not hash the same tarball twice.
+
+        :return:
+        '''
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        thintar = os.path.join(tmp_dir, 'thin.tgz')
+        with salt.utils.files.fopen(thintar, 'wb') as fh_:
+            fh_.write(b'thin')
+        expected = salt.utils.hashutils.get_hash(thintar, 'sha1')
+        with patch('salt.utils.thin.gen_thin', MagicMock(return_value=thintar)), \
+                patch('salt.utils.hashutils.get_hash', MagicMock(return_value=expected)) as get_hash:
+            assert thin.thin_sum(tmp_dir, form='sha1')[1] == expected
+            assert thin.thin_sum(tmp_dir, form='sha1')[1] == expected
+            assert get_hash.call_count == 1
+            # The tarball was regenerated
+            with salt.utils.files.fopen(thintar, 'wb') as fh_:
+                fh_.write(b'new thin')
+            thin.thin_sum(tmp_dir, form='sha1')
+            assert get_hash.call_count == 2
+
     @patch('salt.utils.thin.gen_min', MagicMock(return_value='/path/to/thin/min.tgz'))
     @patch('salt.utils.hashutils.get_hash', MagicMock(return_value=12345))
     def test_min_sum(self):
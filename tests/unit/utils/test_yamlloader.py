@@ -6,11 +6,13 @@
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import collections
+import gc
 import textwrap
 
 # Import Salt Libs
+import yaml
 from yaml.constructor import ConstructorError
-from salt.utils.yamlloader import SaltYamlSafeLoader
+from salt.utils.yamlloader import SaltYamlSafeLoader, SaltYamlFastLoader
 import salt.utils.files
 from salt.ext import six
 
@@ -149,3 +151,86 @@ class YamlLoaderTestCase(TestCase):
                   b: {foo: bar, one: 1, list: [1, two, 3]}''')),
             {'foo': {'b': {'foo': 'bar', 'one': 1, 'list': [1, 'two', 3]}}}
         )
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class YamlFastLoaderTestCase(YamlLoaderTestCase):
+    '''
+    Run the SaltYamlSafeLoader tests against SaltYamlFastLoader, and compare
+    the data both loaders produce
+    '''
+    @staticmethod
+    def render_yaml(data):
+        return SaltYamlFastLoader(data).get_single_data()
+
+    def assert_same(self, data):
+        expected = yaml.load(data, Loader=lambda stream: SaltYamlSafeLoader(
+            stream, dictclass=collections.OrderedDict))
+        ret = yaml.load(data, Loader=lambda stream: SaltYamlFastLoader(
+            stream, dictclass=collections.OrderedDict))
+        self.assertEqual(ret, expected)
+        self.assertEqual(repr(ret), repr(expected))
+        return ret
+
+    def test_same_data(self):
+        '''
+        Test the data of the scalar types, tags, anchors and merges
+        '''
+        ret = self.assert_same(textwrap.dedent('''\
+            z_first: 1
+            a_second:
+              mode: 0644
+              zero: 000
+              hex: 0x1f
+              float: 1.5
+              bools: [true, no, On]
+              nothing: ~
+              date: 2019-01-01
+              unicode: !!python/unicode text
+              binary: !!binary aGVsbG8=
+              omap: !!omap {b: 1, a: 2}
+              set: !!set {x, y}
+            base: &base
+              list: &list [a, b]
+              nested: {key: value}
+            derived:
+              <<: *base
+              list: *list
+              extra: [*list, *list]
+            '''))
+        self.assertEqual(list(ret), ['z_first', 'a_second', 'base', 'derived'])
+        self.assertEqual(ret['a_second']['mode'], 644)
+        self.assertEqual(ret['a_second']['date'], '2019-01-01')
+        # Aliased nodes are the same object, like with the regular loader
+        self.assertIs(ret['derived']['extra'][0], ret['base']['list'])
+
+    def test_unhashable_key(self):
+        '''
+        Test that unhashable keys throw an error
+        '''
+        with self.assertRaises(ConstructorError):
+            self.render_yaml('{[a, b]: c}')
+
+    def test_recursive_alias(self):
+        '''
+        Test a mapping which refers to itself
+        '''
+        ret = self.render_yaml('&top {self: *top}')
+        self.assertIs(ret['self'], ret)
+
+    def test_gc_restored(self):
+        '''
+        Test that the garbage collector is enabled again after loading
+        '''
+        self.assertTrue(gc.isenabled())
+        self.render_yaml('a: b')
+        self.assertTrue(gc.isenabled())
+        with self.assertRaises(ConstructorError):
+            self.render_yaml('a: b\na: c')
+        self.assertTrue(gc.isenabled())
+        gc.disable()
+        try:
+            self.render_yaml('a: b')
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Compare the time the YAML loaders of the yaml renderer take to load large
+pillar or SLS files
+
+    python tests/yamlbench.py --size 30
+    python tests/yamlbench.py /srv/pillar/users.sls /srv/pillar/hosts.sls
+'''
+# pylint: disable=resource-leakage
+# Import Python Libs
+from __future__ import absolute_import, print_function
+import optparse
+import random
+import time
+
+# Import salt libs
+import salt.utils.files
+import salt.utils.yamlloader
+from salt.utils.odict import OrderedDict
+
+# Import third party libs
+from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
+
+LOADERS = (
+    ('safe', salt.utils.yamlloader.SaltYamlSafeLoader),
+    ('fast', salt.utils.yamlloader.SaltYamlFastLoader),
+)
+
+
+def parse():
+    '''
+    Parse the command line options
+    '''
+    parser = optparse.OptionParser(usage='%prog [options] [file ...]')
+    parser.add_option(
+        '-s',
+        '--size',
+        dest='size',
+        default=10,
+        type='int',
+        help='The size in MB of the generated pillar when no files are given')
+    parser.add_option(
+        '-r',
+        '--repeat',
+        dest='repeat',
+        default=3,
+        type='int',
+        help='Keep the best time of this many loads')
+    return parser.parse_args()
+
+
+def generate(size):
+    '''
+    Return a YAML document of about size MB which looks like a users pillar
+    '''
+    rand = random.Random(0)
+    lines = ['users:']
+    length = 0
+    user = 0
+    while length < size * 1024 * 1024:
+        block = [
+            '  user{0}:'.format(user),
+            '    uid: {0}'.format(1000 + user),
+            '    fullname: "User number {0}"'.format(user),
+            '    shell: /bin/bash',
+            '    home: /home/user{0}'.format(user),
+            '    mode: 0750',
+            '    enabled: true',
+            '    groups:',
+        ]
+        block.extend('      - group{0}'.format(rand.randint(0, 100)) for _ in range(3))
+        block.extend([
+            '    ssh_keys:',
+            '      - ssh-rsa AAAAB3NzaC1yc2E{0:032x} user{1}'.format(
+                rand.getrandbits(128), user),
+            '    created: 2019-01-01',
+        ])
+        length += sum(len(line) + 1 for line in block)
+        lines.extend(block)
+        user += 1
+    return '\n'.join(lines) + '\n'
+
+
+def bench(name, data, repeat):
+    '''
+    Print the best time each loader takes to load data
+    '''
+    results = {}
+    for loader_name, loader in LOADERS:
+        best = None
+        for _ in range(repeat):
+            start = time.time()
+            ret = salt.utils.yamlloader.load(
+                data,
+                Loader=lambda stream: loader(stream, dictclass=OrderedDict))  # pylint: disable=cell-var-from-loop
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[loader_name] = ret
+        print('{0}: {1} loader {2:.3f}s'.format(name, loader_name, best))
+    if results['safe'] != results['fast']:
+        print('{0}: the loaders returned different data'.format(name))
+
+
+def main():
+    '''
+    Run the benchmark
+    '''
+    opts, args = parse()
+    if not args:
+        data = generate(opts.size)
+        bench('generated {0} MB'.format(opts.size), data, opts.repeat)
+    for path in args:
+        with salt.utils.files.fopen(path, 'r') as fp_:
+            bench(path, fp_.read(), opts.repeat)
+
+
+if __name__ == '__main__':
+    main()